@@ -2,12 +2,19 @@
 OpenAI GPT Integration Service for Food and Exercise Parsing
 """
 import os
-from openai import OpenAI
 import json
 from typing import List, Dict
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+# Created on first use; importing openai is a large share of app start-up time
+_client = None
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+    return _client
 
 
 def parse_food_with_ai(text: str) -> List[Dict]:
@@ -40,7 +47,7 @@ Return format:
 """
     
     try:
-        response = client.chat.completions.create(
+        response = _get_client().chat.completions.create(
             model="gpt-5-nano",
             messages=[
                 {"role": "system", "content": "You are a nutrition expert. Parse food descriptions into structured JSON data with accurate nutrition information."},
@@ -92,7 +99,7 @@ Return format:
 """
     
     try:
-        response = client.chat.completions.create(
+        response = _get_client().chat.completions.create(
             model="gpt-5-nano",
             messages=[
                 {"role": "system", "content": "You are a fitness expert. Parse workout descriptions into structured JSON data."},
@@ -129,7 +136,7 @@ Dietary restrictions: {dietary_restrictions or 'None'}
 Provide simple meal names only, one per line."""
     
     try:
-        response = client.chat.completions.create(
+        response = _get_client().chat.completions.create(
             model="gpt-5-nano",
             messages=[
                 {"role": "system", "content": "You are a nutrition expert providing healthy meal suggestions."},
@@ -0,0 +1,101 @@
+"""
+Bootstrap Payload
+GET /bootstrap returns what the SPA needs after login (user, profile,
+dashboard totals, recent body metrics and active goals) in one round trip
+and one authentication. The sections are independent, so each query runs
+on its own pooled session in the threadpool and they overlap; when the
+request session is pinned to a single connection (tests, SQLite) they run
+one after another on it instead.
+"""
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.dashboard import dashboard_summary
+from app.database import BodyMetric, Goal, GoalStatus, User, UserProfile
+from app.goals import goal_response
+from app.schemas import BodyMetricResponse, UserProfileResponse, UserResponse
+
+BOOTSTRAP_METRIC_DAYS = int(os.getenv("BOOTSTRAP_METRIC_DAYS", "30"))
+# Sessions (pooled connections) one bootstrap request may use at once; 1 disables
+BOOTSTRAP_CONCURRENCY = int(os.getenv("BOOTSTRAP_CONCURRENCY", "4"))
+
+
+def _profile(db: Session, user_id: int):
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    return UserProfileResponse.model_validate(profile) if profile else None
+
+
+def _body_metrics(db: Session, user_id: int):
+    since = date.today() - timedelta(days=BOOTSTRAP_METRIC_DAYS)
+    metrics = db.query(BodyMetric).filter(
+        BodyMetric.user_id == user_id,
+        BodyMetric.date >= since
+    ).order_by(BodyMetric.date.desc()).all()
+    return [BodyMetricResponse.model_validate(metric) for metric in metrics]
+
+
+def _goals(db: Session, user_id: int):
+    goals = db.query(Goal).filter(
+        Goal.user_id == user_id,
+        Goal.status == GoalStatus.ACTIVE
+    ).order_by(Goal.created_at.desc()).all()
+    return [goal_response(goal) for goal in goals]
+
+
+# Section loaders; each returns plain data so it can outlive its session
+LOADERS: Dict[str, Callable[[Session, int], object]] = {
+    "profile": _profile,
+    "dashboard": dashboard_summary,
+    "body_metrics": _body_metrics,
+    "goals": _goals,
+}
+SECTIONS = ("user",) + tuple(LOADERS)
+
+
+def parse_sections(fields: Optional[str]) -> List[str]:
+    """Sections named in a comma-separated `fields` value (all when empty)."""
+    if not fields:
+        return list(SECTIONS)
+    sections = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = sorted(set(sections) - set(SECTIONS))
+    if unknown:
+        raise ValueError(f"Unknown bootstrap fields: {', '.join(unknown)}. Choose from: {', '.join(SECTIONS)}")
+    return sections
+
+
+def _run_in_own_session(factory: sessionmaker, loader, user_id: int):
+    session = factory()
+    try:
+        return loader(session, user_id)
+    finally:
+        session.close()
+
+
+async def load_bootstrap(db: Session, user: User, sections: List[str]) -> dict:
+    """Assemble the requested sections for an authenticated user."""
+    payload = {}
+    if "user" in sections:
+        payload["user"] = UserResponse.model_validate(user)
+
+    names = [name for name in sections if name in LOADERS]
+    bind = db.get_bind()
+    if BOOTSTRAP_CONCURRENCY > 1 and len(names) > 1 and isinstance(bind, Engine):
+        factory = sessionmaker(bind=bind, autoflush=False)
+        limit = asyncio.Semaphore(BOOTSTRAP_CONCURRENCY)
+
+        async def load(name):
+            async with limit:
+                return await run_in_threadpool(_run_in_own_session, factory, LOADERS[name], user.id)
+
+        values = await asyncio.gather(*(load(name) for name in names))
+    else:
+        values = await run_in_threadpool(lambda: [LOADERS[name](db, user.id) for name in names])
+
+    payload.update(zip(names, values))
+    return payload
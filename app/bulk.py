@@ -0,0 +1,238 @@
+"""
+Bulk Loading Helpers
+Streams rows into tables in fixed-size batches using Postgres COPY
+(or executemany on other databases) with ON CONFLICT upserts
+"""
+import csv
+import enum
+import io
+import logging
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import Table, insert, text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Marker COPY uses for NULL values (CSV format)
+_COPY_NULL = "\\N"
+
+
+def _copy_value(value):
+    """Convert a Python value to its COPY (CSV) text representation."""
+    if value is None:
+        return _COPY_NULL
+    if isinstance(value, enum.Enum):
+        # SQLAlchemy Enum columns store the member name
+        return value.name
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class _TableBuffer:
+    """Pending rows and upsert settings for one table."""
+
+    def __init__(self, table: Table, conflict_columns: Optional[Sequence[str]], update_columns: Sequence[str]):
+        self.table = table
+        self.conflict_columns = tuple(conflict_columns) if conflict_columns else ()
+        self.update_columns = tuple(update_columns)
+        self.rows: List[Dict] = []
+        self.written = 0
+        # Upserts keep only the last row per conflict key in a batch, since
+        # Postgres refuses to update the same row twice in one statement
+        self._positions: Optional[Dict[tuple, int]] = {} if self.update_columns else None
+
+    def append(self, row: Dict):
+        if self._positions is None:
+            self.rows.append(row)
+            return
+        key = tuple(row[c] for c in self.conflict_columns)
+        position = self._positions.get(key)
+        if position is None:
+            self._positions[key] = len(self.rows)
+            self.rows.append(row)
+        else:
+            self.rows[position] = row
+
+    def clear(self):
+        self.written += len(self.rows)
+        self.rows = []
+        if self._positions is not None:
+            self._positions = {}
+
+
+class BulkWriter:
+    """
+    Buffer rows for several tables and write them in batches.
+
+    Tables are flushed in the order they were registered, so register parent
+    tables before their children to keep foreign keys satisfied. Rows conflicting
+    with existing ones are skipped (or updated when ``update_columns`` is given),
+    which makes repeated loads of the same data idempotent.
+    """
+
+    def __init__(self, engine, batch_size: int = DEFAULT_BATCH_SIZE,
+                 on_flush: Optional[Callable[[Dict[str, int]], None]] = None):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.on_flush = on_flush
+        self._buffers: Dict[str, _TableBuffer] = {}
+        self._use_copy = engine.dialect.name == "postgresql"
+        self._raw = None
+
+    def add_table(self, table: Table, conflict_columns: Optional[Sequence[str]] = None,
+                  update_columns: Sequence[str] = ()):
+        """
+        Register a table. With no ``conflict_columns`` any unique violation is
+        ignored; ``update_columns`` turns the insert into an upsert on them.
+        """
+        if update_columns and not conflict_columns:
+            raise ValueError("update_columns requires conflict_columns")
+        self._buffers[table.name] = _TableBuffer(table, conflict_columns, update_columns)
+
+    def add(self, table: Table, row: Dict):
+        """Queue one row, flushing every table once the batch is full."""
+        buffer = self._buffers[table.name]
+        buffer.append(row)
+        if len(buffer.rows) >= self.batch_size:
+            self.flush()
+
+    def add_many(self, table: Table, rows: Iterable[Dict]):
+        """Queue rows from an iterable without materializing it."""
+        for row in rows:
+            self.add(table, row)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """Rows written so far per table."""
+        return {name: buffer.written for name, buffer in self._buffers.items()}
+
+    def flush(self):
+        """Write all pending rows in registration order and commit."""
+        if not any(buffer.rows for buffer in self._buffers.values()):
+            return
+        if self._use_copy:
+            self._flush_copy()
+        else:
+            self._flush_executemany()
+        for buffer in self._buffers.values():
+            buffer.clear()
+        if self.on_flush:
+            self.on_flush(self.counts)
+
+    def close(self):
+        """Flush remaining rows and release the connection."""
+        try:
+            self.flush()
+        finally:
+            if self._raw is not None:
+                self._raw.close()
+                self._raw = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        elif self._raw is not None:
+            self._raw.rollback()
+            self._raw.close()
+            self._raw = None
+        return False
+
+    # ---- Postgres: COPY into a temp staging table, then INSERT ... ON CONFLICT ----
+
+    def _flush_copy(self):
+        if self._raw is None:
+            self._raw = self.engine.raw_connection()
+        cursor = self._raw.cursor()
+        try:
+            for buffer in self._buffers.values():
+                if buffer.rows:
+                    self._copy_buffer(cursor, buffer)
+            self._raw.commit()
+        except Exception:
+            self._raw.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def _copy_buffer(self, cursor, buffer: _TableBuffer):
+        table = buffer.table.name
+        stage = f"_stage_{table}"
+        columns = list(buffer.rows[0].keys())
+        column_list = ", ".join(f'"{c}"' for c in columns)
+
+        out = io.StringIO()
+        writer = csv.writer(out)
+        for row in buffer.rows:
+            writer.writerow([_copy_value(row[c]) for c in columns])
+        out.seek(0)
+
+        cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS "{stage}" (LIKE "{table}" INCLUDING DEFAULTS)')
+        cursor.copy_expert(
+            f"COPY \"{stage}\" ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            out,
+        )
+        cursor.execute(
+            f'INSERT INTO "{table}" ({column_list}) SELECT {column_list} FROM "{stage}" '
+            + _conflict_clause(buffer)
+        )
+        cursor.execute(f'TRUNCATE "{stage}"')
+
+    # ---- Other databases: executemany with the dialect's ON CONFLICT ----
+
+    def _flush_executemany(self):
+        with self.engine.begin() as conn:
+            for buffer in self._buffers.values():
+                if buffer.rows:
+                    conn.execute(_upsert_statement(self.engine.dialect.name, buffer), buffer.rows)
+
+
+def _conflict_clause(buffer: _TableBuffer) -> str:
+    """ON CONFLICT clause for the raw Postgres INSERT ... SELECT."""
+    target = ""
+    if buffer.conflict_columns:
+        target = "(" + ", ".join(f'"{c}"' for c in buffer.conflict_columns) + ") "
+    if not buffer.update_columns:
+        return f"ON CONFLICT {target}DO NOTHING"
+    assignments = ", ".join(f'"{c}" = EXCLUDED."{c}"' for c in buffer.update_columns)
+    return f"ON CONFLICT {target}DO UPDATE SET {assignments}"
+
+
+def _upsert_statement(dialect: str, buffer: _TableBuffer):
+    """Build an INSERT ... ON CONFLICT statement for executemany."""
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        logger.warning(f"No ON CONFLICT support for {dialect}; using a plain INSERT")
+        return insert(buffer.table)
+
+    stmt = dialect_insert(buffer.table)
+    index_elements = list(buffer.conflict_columns) or None
+    if not buffer.update_columns:
+        return stmt.on_conflict_do_nothing(index_elements=index_elements)
+    return stmt.on_conflict_do_update(
+        index_elements=index_elements,
+        set_={c: stmt.excluded[c] for c in buffer.update_columns},
+    )
+
+
+def reset_sequences(engine, tables: Iterable[Table]):
+    """Move Postgres id sequences past rows inserted with explicit ids."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in tables:
+            conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM \"{table.name}\"), 0) + 1, false)"
+            ))
@@ -0,0 +1,56 @@
+"""
+Dashboard Totals
+Today's nutrition and water totals, this week's workout count and the
+profile targets, shared by GET /dashboard and GET /bootstrap.
+"""
+from datetime import date, timedelta
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import MealLog, UserProfile, WaterIntake, WorkoutSession
+
+
+def dashboard_summary(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """Dashboard summary with today's stats."""
+    today = today or date.today()
+    week_ago = today - timedelta(days=7)
+    
+    # Sum today's cached meal totals
+    total_calories, total_protein, total_carbs, total_fats = db.query(
+        func.coalesce(func.sum(MealLog.total_calories), 0),
+        func.coalesce(func.sum(MealLog.total_protein_g), 0),
+        func.coalesce(func.sum(MealLog.total_carbs_g), 0),
+        func.coalesce(func.sum(MealLog.total_fats_g), 0)
+    ).filter(
+        MealLog.user_id == user_id,
+        MealLog.date == today
+    ).one()
+    
+    # Get today's water intake
+    total_water = db.query(func.coalesce(func.sum(WaterIntake.amount_ml), 0)).filter(
+        WaterIntake.user_id == user_id,
+        WaterIntake.date == today
+    ).scalar()
+    
+    # Get this week's workouts
+    workouts_this_week = db.query(WorkoutSession).filter(
+        WorkoutSession.user_id == user_id,
+        WorkoutSession.date >= week_ago
+    ).count()
+    
+    # Get current profile data
+    profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+    
+    return {
+        "total_calories_today": int(total_calories),
+        "total_protein_today": round(float(total_protein), 1),
+        "total_carbs_today": round(float(total_carbs), 1),
+        "total_fats_today": round(float(total_fats), 1),
+        "total_water_today": int(total_water),
+        "workouts_this_week": workouts_this_week,
+        "current_weight": profile.current_weight_kg if profile else None,
+        "goal_weight": profile.goal_weight_kg if profile else None,
+        "calories_target": profile.daily_calorie_target if profile else None
+    }
@@ -0,0 +1,129 @@
+"""
+Bulk Deletion
+Set-based deletes for a user's history, in bounded batches with a commit
+after each one, so no transaction holds row locks on more than
+DELETE_BATCH_SIZE parents (plus their children) at a time:
+
+    delete_history(db, user_id, start, end, kinds)   DELETE /history
+    delete_account(db, user_id)                      DELETE /users/me
+
+Each batch selects parent ids, deletes their children explicitly (bounded
+by the date range, so PostgreSQL only touches the matching partitions)
+and then the parents. The schema's ON DELETE CASCADE covers anything
+written concurrently. History deletes write sync tombstones for the rows
+they remove; account deletion drops the tombstones along with the user.
+A failed run can simply be repeated.
+"""
+import logging
+import os
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import (
+    BodyMetric, ExerciseSet, Goal, HistoryArchive, MealFood, MealLog, SyncTombstone, User, UserProfile,
+    UserStreak, VerificationToken, WaterIntake, WorkoutExercise, WorkoutSession
+)
+from app.partitioning import date_range
+from app.sync import ENTITY_NAMES
+
+logger = logging.getLogger(__name__)
+
+DELETE_BATCH_SIZE = int(os.getenv("DELETE_BATCH_SIZE", "1000"))
+
+
+def _meal_children(ids: List[int], start: Optional[date], end: Optional[date]) -> list:
+    return [delete(MealFood).where(MealFood.meal_id.in_(ids), *date_range(MealFood.date, start, end))]
+
+
+def _workout_children(ids: List[int], start: Optional[date], end: Optional[date]) -> list:
+    exercises = select(WorkoutExercise.id).where(WorkoutExercise.session_id.in_(ids))
+    return [
+        delete(ExerciseSet).where(
+            ExerciseSet.workout_exercise_id.in_(exercises), *date_range(ExerciseSet.date, start, end)
+        ),
+        delete(WorkoutExercise).where(WorkoutExercise.session_id.in_(ids)),
+    ]
+
+
+# Date-ranged history kinds: model and the statements removing its children
+HISTORY_KINDS: Dict[str, tuple] = {
+    "meals": (MealLog, _meal_children),
+    "workouts": (WorkoutSession, _workout_children),
+    "water": (WaterIntake, None),
+    "body_metrics": (BodyMetric, None),
+}
+
+
+def parse_kinds(kinds: Optional[str]) -> List[str]:
+    """History kinds named in a comma-separated value (all when empty)."""
+    if not kinds:
+        return list(HISTORY_KINDS)
+    names = [kind.strip() for kind in kinds.split(",") if kind.strip()]
+    unknown = sorted(set(names) - set(HISTORY_KINDS))
+    if unknown:
+        raise ValueError(f"Unknown kinds: {', '.join(unknown)}. Choose from: {', '.join(HISTORY_KINDS)}")
+    return names
+
+
+def _delete_in_batches(db: Session, model, criteria: Iterable, children: Optional[Callable] = None,
+                       start: Optional[date] = None, end: Optional[date] = None,
+                       tombstones: bool = False, batch_size: int = DELETE_BATCH_SIZE) -> int:
+    """Delete rows matching `criteria`, `batch_size` at a time; returns the count."""
+    criteria = list(criteria)
+    total = 0
+    while True:
+        rows = db.execute(
+            select(model.id, model.user_id).where(*criteria).order_by(model.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        ids = [row.id for row in rows]
+        for statement in children(ids, start, end) if children else []:
+            db.execute(statement)
+        if tombstones:
+            now = datetime.utcnow()
+            db.execute(insert(SyncTombstone), [
+                {"user_id": row.user_id, "entity": ENTITY_NAMES[model], "entity_id": row.id, "deleted_at": now}
+                for row in rows
+            ])
+        db.execute(delete(model).where(model.id.in_(ids)))
+        db.commit()
+        total += len(ids)
+
+
+def delete_history(db: Session, user_id: int, start: date, end: date, kinds: Iterable[str],
+                   batch_size: int = DELETE_BATCH_SIZE) -> Dict[str, int]:
+    """Delete the user's rows of each kind dated start..end (inclusive); returns counts per kind."""
+    counts = {}
+    for kind in kinds:
+        model, children = HISTORY_KINDS[kind]
+        counts[kind] = _delete_in_batches(
+            db, model, [model.user_id == user_id, *date_range(model.date, start, end)],
+            children, start, end, tombstones=True, batch_size=batch_size
+        )
+    return counts
+
+
+def delete_account(db: Session, user_id: int, batch_size: int = DELETE_BATCH_SIZE) -> Dict[str, int]:
+    """Delete a user and everything they own; returns row counts per table."""
+    counts = {
+        "workout_sessions": _delete_in_batches(db, WorkoutSession, [WorkoutSession.user_id == user_id],
+                                               _workout_children, batch_size=batch_size),
+        "meal_logs": _delete_in_batches(db, MealLog, [MealLog.user_id == user_id],
+                                        _meal_children, batch_size=batch_size),
+    }
+    for model in (WaterIntake, BodyMetric, Goal, HistoryArchive, SyncTombstone):
+        counts[model.__tablename__] = _delete_in_batches(db, model, [model.user_id == user_id],
+                                                         batch_size=batch_size)
+
+    # One row each at most; the user row goes last so a failed run can be repeated
+    for model in (UserStreak, UserProfile):
+        db.execute(delete(model).where(model.user_id == user_id))
+    db.execute(delete(VerificationToken).where(VerificationToken.user_id == str(user_id)))
+    db.execute(delete(User).where(User.id == user_id))
+    db.commit()
+    logger.info(f"Deleted account {user_id}: {counts}")
+    return counts
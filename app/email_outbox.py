@@ -0,0 +1,156 @@
+"""
+Email Outbox
+Outbound email is written to the email_outbox table inside the request and
+delivered by a background worker, so request latency never depends on the
+email provider. The worker leases due messages in a short SKIP LOCKED
+transaction (safe with many workers), sends outside of any transaction,
+batches identical messages into one provider call and retries failures with
+exponential backoff.
+
+Run a dedicated worker with:
+    python -m app.email_outbox
+"""
+import asyncio
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.database import EmailOutbox, OutboxStatus, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EMAIL_WORKER_ENABLED = os.getenv("EMAIL_WORKER_ENABLED", "true").lower() == "true"
+EMAIL_WORKER_POLL_SECONDS = float(os.getenv("EMAIL_WORKER_POLL_SECONDS", "1"))
+EMAIL_WORKER_BATCH_SIZE = int(os.getenv("EMAIL_WORKER_BATCH_SIZE", "100"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "3600"))
+# How long a claimed message is reserved for the worker sending it
+EMAIL_CLAIM_LEASE_SECONDS = float(os.getenv("EMAIL_CLAIM_LEASE_SECONDS", "300"))
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, html_content: str,
+                  text_content: Optional[str] = None) -> EmailOutbox:
+    """Store an email for background delivery and commit it."""
+    message = EmailOutbox(to_email=to_email, subject=subject, html_content=html_content,
+                          text_content=text_content)
+    db.add(message)
+    db.commit()
+    return message
+
+
+def retry_delay(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of failed attempts."""
+    delay = min(EMAIL_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), EMAIL_RETRY_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claim_due(db: Session, batch_size: int, lease_seconds: float) -> List[Dict]:
+    """
+    Lease due messages to this worker and commit, so no row lock or pooled
+    connection is held while the provider is called. A claim counts as an
+    attempt and pushes next_attempt_at past the lease; if the worker dies,
+    the messages come due again once it lapses.
+    """
+    now = datetime.utcnow()
+    query = db.query(EmailOutbox).filter(
+        EmailOutbox.status == OutboxStatus.PENDING,
+        EmailOutbox.next_attempt_at <= now
+    ).order_by(EmailOutbox.id).limit(batch_size)
+    if db.bind.dialect.name == "postgresql":
+        # Locked only until the claim commits; other workers skip them meanwhile
+        query = query.with_for_update(skip_locked=True)
+
+    claimed = []
+    for message in query.all():
+        message.attempts += 1
+        message.next_attempt_at = now + timedelta(seconds=lease_seconds)
+        # Plain copies: the rows expire on commit and reloading them would open a transaction
+        claimed.append({
+            "id": message.id, "attempts": message.attempts, "to_email": message.to_email,
+            "subject": message.subject, "html_content": message.html_content,
+            "text_content": message.text_content,
+        })
+    db.commit()
+    return claimed
+
+
+def _record_result(db: Session, claimed: List[Dict], error: Optional[str]) -> int:
+    """Store one provider call's outcome in a short transaction. Returns how many were sent."""
+    attempts = {message["id"]: message["attempts"] for message in claimed}
+    now = datetime.utcnow()
+    sent = 0
+    for message in db.query(EmailOutbox).filter(
+        EmailOutbox.id.in_(attempts), EmailOutbox.status == OutboxStatus.PENDING
+    ):
+        if message.attempts != attempts[message.id]:
+            continue  # the lease lapsed and another worker claimed it again
+        if error is None:
+            message.status = OutboxStatus.SENT
+            message.sent_at = now
+            message.last_error = None
+            sent += 1
+        elif message.attempts >= EMAIL_MAX_ATTEMPTS:
+            message.status = OutboxStatus.FAILED
+            message.last_error = error
+            logger.error(f"Giving up on email {message.id} to {message.to_email}: {error}")
+        else:
+            message.last_error = error
+            message.next_attempt_at = now + timedelta(seconds=retry_delay(message.attempts))
+    db.commit()
+    return sent
+
+
+def drain_outbox(session_factory=SessionLocal, batch_size: int = EMAIL_WORKER_BATCH_SIZE,
+                 lease_seconds: float = EMAIL_CLAIM_LEASE_SECONDS) -> int:
+    """Deliver one batch of due messages. Returns how many were sent."""
+    from app.email_service import send_batch
+
+    db = session_factory()
+    try:
+        messages = _claim_due(db, batch_size, lease_seconds)
+        if not messages:
+            return 0
+
+        # Identical messages go out in one provider call
+        groups: Dict[Tuple[str, str, Optional[str]], List[Dict]] = {}
+        for message in messages:
+            key = (message["subject"], message["html_content"], message["text_content"])
+            groups.setdefault(key, []).append(message)
+
+        sent = 0
+        for (subject, html_content, text_content), group in groups.items():
+            try:
+                ok = send_batch([m["to_email"] for m in group], subject, html_content, text_content)
+                error = None if ok else "Provider rejected the message"
+            except Exception as e:
+                error = str(e)
+            sent += _record_result(db, group, error)
+        return sent
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def run_worker(session_factory=SessionLocal, poll_seconds: float = EMAIL_WORKER_POLL_SECONDS):
+    """Drain the outbox forever, sleeping only when it is empty."""
+    logger.info("Email outbox worker started")
+    while True:
+        try:
+            sent = await asyncio.to_thread(drain_outbox, session_factory)
+        except Exception as e:
+            logger.error(f"Email outbox worker error: {e}")
+            sent = 0
+        if not sent:
+            await asyncio.sleep(poll_seconds)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run_worker())
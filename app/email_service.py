@@ -3,11 +3,12 @@ Email Service for User Verification
 Supports both real email (SendGrid/Mailgun) and mock mode for development
 """
 import os
-import secrets
-from datetime import datetime, timedelta
-from typing import Optional
+import json
+from typing import List, Optional
 import logging
 
+from app.email_templates import RenderedEmail, render_email
+
 logger = logging.getLogger(__name__)
 
 # Email configuration
@@ -15,124 +16,105 @@ EMAIL_ENABLED = os.getenv("EMAIL_ENABLED", "false").lower() == "true"
 EMAIL_PROVIDER = os.getenv("EMAIL_PROVIDER", "mock")  # "sendgrid", "mailgun", or "mock"
 FROM_EMAIL = os.getenv("FROM_EMAIL", "noreply@fittrack.app")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "http://localhost:8000")
+MAILGUN_API_BASE = os.getenv("MAILGUN_API_BASE", "https://api.mailgun.net/v3")
+EMAIL_HTTP_TIMEOUT = float(os.getenv("EMAIL_HTTP_TIMEOUT", "10"))
 
-# Verification token storage (in-memory for demo, use Redis in production)
-_verification_tokens = {}
+# Provider clients are created once and reused (pooled connections)
+_sendgrid_client = None
+_http_client = None
 
 
 def generate_verification_token(user_id: str) -> str:
     """Generate a secure verification token for user."""
-    token = secrets.token_urlsafe(32)
-    expires_at = datetime.utcnow() + timedelta(hours=24)
-    
-    _verification_tokens[token] = {
-        "user_id": user_id,
-        "expires_at": expires_at,
-        "used": False
-    }
-    
-    return token
+    from app.token_store import get_token_store
+    return get_token_store().issue(user_id)
 
 
 def verify_token(token: str) -> Optional[str]:
-    """Verify a token and return user_id if valid."""
-    token_data = _verification_tokens.get(token)
-    
-    if not token_data:
-        return None
-    
-    if token_data["used"]:
-        logger.warning(f"Token already used: {token}")
-        return None
-    
-    if datetime.utcnow() > token_data["expires_at"]:
-        logger.warning(f"Token expired: {token}")
-        return None
-    
-    # Mark token as used
-    token_data["used"] = True
-    
-    return token_data["user_id"]
+    """Verify a token and return user_id if valid (each token works once)."""
+    from app.token_store import get_token_store
+    return get_token_store().consume(token)
 
 
-def send_verification_email(email: str, username: str, token: str) -> bool:
-    """Send verification email to user."""
+def send_verification_email(email: str, username: str, token: str, db=None) -> bool:
+    """Send verification email to user (queued in the outbox when db is given)."""
     verification_url = f"{FRONTEND_URL}/verify?token={token}"
-    
-    subject = "Verify your FitTrack account"
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
-            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 8px 8px; }}
-            .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #6b7280; font-size: 14px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🏋️ Welcome to FitTrack!</h1>
-            </div>
-            <div class="content">
-                <p>Hi <strong>{username}</strong>,</p>
-                <p>Thanks for signing up! Please verify your email address to activate your account.</p>
-                <p style="text-align: center;">
-                    <a href="{verification_url}" class="button">Verify Email Address</a>
-                </p>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; background: white; padding: 10px; border-radius: 5px;">{verification_url}</p>
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                <p>If you didn't create an account with FitTrack, you can safely ignore this email.</p>
-            </div>
-            <div class="footer">
-                <p>FitTrack - AI-Powered Fitness & Nutrition Tracker</p>
-                <p>© 2025 FitTrack. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    message = render_email("verification", username=username, url=verification_url)
     
     if not EMAIL_ENABLED or EMAIL_PROVIDER == "mock":
         # Mock mode - just log the email
         logger.info(f"📧 [MOCK EMAIL] To: {email}")
-        logger.info(f"Subject: {subject}")
+        logger.info(f"Subject: {message.subject}")
         logger.info(f"Verification URL: {verification_url}")
         logger.info("Email sending is in MOCK mode. Set EMAIL_ENABLED=true to send real emails.")
         return True
     
+    return _deliver(email, message, db)
+
+
+def _deliver(to_email: str, message: RenderedEmail, db=None) -> bool:
+    """Queue the email in the outbox when a session is given, otherwise send it now."""
+    if db is not None:
+        from app.email_outbox import enqueue_email
+        enqueue_email(db, to_email, message.subject, message.html, message.text)
+        return True
+    return send_batch([to_email], message.subject, message.html, message.text)
+
+
+def send_batch(recipients: List[str], subject: str, html_content: str,
+               text_content: Optional[str] = None) -> bool:
+    """Send one message to several recipients in a single provider call."""
+    if not EMAIL_ENABLED or EMAIL_PROVIDER == "mock":
+        logger.info(f"📧 [MOCK EMAIL] To: {', '.join(recipients)}")
+        logger.info(f"Subject: {subject}")
+        return True
+    
     elif EMAIL_PROVIDER == "sendgrid":
-        return _send_via_sendgrid(email, subject, html_content)
+        return _send_via_sendgrid(recipients, subject, html_content, text_content)
     
     elif EMAIL_PROVIDER == "mailgun":
-        return _send_via_mailgun(email, subject, html_content)
+        return _send_via_mailgun(recipients, subject, html_content, text_content)
     
     else:
         logger.error(f"Unknown email provider: {EMAIL_PROVIDER}")
         return False
 
 
-def _send_via_sendgrid(to_email: str, subject: str, html_content: str) -> bool:
-    """Send email via SendGrid."""
-    try:
+def _get_sendgrid_client():
+    global _sendgrid_client
+    if _sendgrid_client is None:
         import sendgrid
+        _sendgrid_client = sendgrid.SendGridAPIClient(api_key=os.getenv("SENDGRID_API_KEY"))
+    return _sendgrid_client
+
+
+def _get_http_client():
+    global _http_client
+    if _http_client is None:
+        import httpx
+        _http_client = httpx.Client(
+            timeout=EMAIL_HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10)
+        )
+    return _http_client
+
+
+def _send_via_sendgrid(recipients: List[str], subject: str, html_content: str,
+                       text_content: Optional[str] = None) -> bool:
+    """Send email via SendGrid (one personalization per recipient)."""
+    try:
         from sendgrid.helpers.mail import Mail, Email, To, Content
         
-        sg = sendgrid.SendGridAPIClient(api_key=os.getenv("SENDGRID_API_KEY"))
-        
         message = Mail(
             from_email=Email(FROM_EMAIL),
-            to_emails=To(to_email),
+            to_emails=[To(to_email) for to_email in recipients],
             subject=subject,
-            html_content=Content("text/html", html_content)
+            plain_text_content=Content("text/plain", text_content) if text_content else None,
+            html_content=Content("text/html", html_content),
+            is_multiple=True
         )
         
-        response = sg.send(message)
+        response = _get_sendgrid_client().send(message)
         logger.info(f"Email sent via SendGrid: {response.status_code}")
         return response.status_code == 202
         
@@ -141,23 +123,28 @@ def _send_via_sendgrid(to_email: str, subject: str, html_content: str) -> bool:
         return False
 
 
-def _send_via_mailgun(to_email: str, subject: str, html_content: str) -> bool:
-    """Send email via Mailgun."""
+def _send_via_mailgun(recipients: List[str], subject: str, html_content: str,
+                      text_content: Optional[str] = None) -> bool:
+    """Send email via Mailgun (batch send; recipients don't see each other)."""
     try:
-        import requests
-        
         domain = os.getenv("MAILGUN_DOMAIN")
-        api_key = os.getenv("MAILGUN_API_KEY")
+        api_key = os.getenv("MAILGUN_API_KEY", "")
         
-        response = requests.post(
-            f"https://api.mailgun.net/v3/{domain}/messages",
+        data = {
+            "from": FROM_EMAIL,
+            "to": recipients,
+            "subject": subject,
+            "html": html_content
+        }
+        if text_content:
+            data["text"] = text_content
+        if len(recipients) > 1:
+            data["recipient-variables"] = json.dumps({to_email: {} for to_email in recipients})
+        
+        response = _get_http_client().post(
+            f"{MAILGUN_API_BASE}/{domain}/messages",
             auth=("api", api_key),
-            data={
-                "from": FROM_EMAIL,
-                "to": to_email,
-                "subject": subject,
-                "html": html_content
-            }
+            data=data
         )
         
         logger.info(f"Email sent via Mailgun: {response.status_code}")
@@ -168,58 +155,14 @@ def _send_via_mailgun(to_email: str, subject: str, html_content: str) -> bool:
         return False
 
 
-def send_password_reset_email(email: str, username: str, token: str) -> bool:
-    """Send password reset email to user."""
+def send_password_reset_email(email: str, username: str, token: str, db=None) -> bool:
+    """Send password reset email to user (queued in the outbox when db is given)."""
     reset_url = f"{FRONTEND_URL}/reset-password?token={token}"
-    
-    subject = "Reset your FitTrack password"
-    html_content = f"""
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <style>
-            body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .header {{ background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }}
-            .content {{ background: #f8f9fa; padding: 30px; border-radius: 0 0 8px 8px; }}
-            .button {{ display: inline-block; background: #6366f1; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-            .footer {{ text-align: center; margin-top: 20px; color: #6b7280; font-size: 14px; }}
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🔐 Password Reset Request</h1>
-            </div>
-            <div class="content">
-                <p>Hi <strong>{username}</strong>,</p>
-                <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                <p style="text-align: center;">
-                    <a href="{reset_url}" class="button">Reset Password</a>
-                </p>
-                <p>Or copy and paste this link into your browser:</p>
-                <p style="word-break: break-all; background: white; padding: 10px; border-radius: 5px;">{reset_url}</p>
-                <p><strong>This link will expire in 24 hours.</strong></p>
-                <p>If you didn't request a password reset, you can safely ignore this email.</p>
-            </div>
-            <div class="footer">
-                <p>FitTrack - AI-Powered Fitness & Nutrition Tracker</p>
-                <p>© 2025 FitTrack. All rights reserved.</p>
-            </div>
-        </div>
-    </body>
-    </html>
-    """
+    message = render_email("password_reset", username=username, url=reset_url)
     
     if not EMAIL_ENABLED or EMAIL_PROVIDER == "mock":
         logger.info(f"📧 [MOCK EMAIL] Password Reset To: {email}")
         logger.info(f"Reset URL: {reset_url}")
         return True
     
-    elif EMAIL_PROVIDER == "sendgrid":
-        return _send_via_sendgrid(email, subject, html_content)
-    
-    elif EMAIL_PROVIDER == "mailgun":
-        return _send_via_mailgun(email, subject, html_content)
-    
-    return False
+    return _deliver(email, message, db)
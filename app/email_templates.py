@@ -0,0 +1,166 @@
+"""
+Email Templates
+Every message shares one HTML layout (with the CSS inlined once) and one
+plain-text layout. Layouts and message bodies are merged and compiled when
+this module is imported; rendering only fills in per-recipient values, so
+bulk campaigns cost a list join per message.
+"""
+import html
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple
+
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# Campaigns repeat many values (dashboard URL, small counts); escape each once
+_escape = lru_cache(maxsize=4096)(html.escape)
+
+
+class CompiledTemplate:
+    """A template pre-split into literal chunks and field names."""
+
+    __slots__ = ("_literals", "_fields")
+
+    def __init__(self, source: str):
+        pieces = _PLACEHOLDER.split(source)
+        self._literals: List[str] = pieces[0::2]
+        self._fields: List[str] = pieces[1::2]
+
+    @property
+    def fields(self) -> List[str]:
+        return list(self._fields)
+
+    def render(self, values: Dict[str, str]) -> str:
+        literals = self._literals
+        out = [literals[0]]
+        for field, literal in zip(self._fields, literals[1:]):
+            out.append(values[field])
+            out.append(literal)
+        return "".join(out)
+
+
+class RenderedEmail(NamedTuple):
+    subject: str
+    html: str
+    text: str
+
+
+HTML_LAYOUT = """<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #6366f1 0%, #8b5cf6 100%); color: white; padding: 30px; text-align: center; border-radius: 8px 8px 0 0; }
+        .content { background: #f8f9fa; padding: 30px; border-radius: 0 0 8px 8px; }
+        .button { display: inline-block; background: #6366f1; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+        .link { word-break: break-all; background: white; padding: 10px; border-radius: 5px; }
+        .footer { text-align: center; margin-top: 20px; color: #6b7280; font-size: 14px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>[[heading]]</h1>
+        </div>
+        <div class="content">
+            <p>Hi <strong>{{ username }}</strong>,</p>
+[[body]]
+        </div>
+        <div class="footer">
+            <p>FitTrack - AI-Powered Fitness &amp; Nutrition Tracker</p>
+            <p>&copy; 2025 FitTrack. All rights reserved.</p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
+TEXT_LAYOUT = """Hi {{ username }},
+
+[[body]]
+
+--
+FitTrack - AI-Powered Fitness & Nutrition Tracker
+"""
+
+# name -> subject, HTML heading, HTML body, text body
+MESSAGES = {
+    "verification": (
+        "Verify your FitTrack account",
+        "🏋️ Welcome to FitTrack!",
+        """            <p>Thanks for signing up! Please verify your email address to activate your account.</p>
+            <p style="text-align: center;">
+                <a href="{{ url }}" class="button">Verify Email Address</a>
+            </p>
+            <p>Or copy and paste this link into your browser:</p>
+            <p class="link">{{ url }}</p>
+            <p><strong>This link will expire in 24 hours.</strong></p>
+            <p>If you didn't create an account with FitTrack, you can safely ignore this email.</p>""",
+        """Thanks for signing up! Please verify your email address to activate your account:
+
+{{ url }}
+
+This link will expire in 24 hours.
+If you didn't create an account with FitTrack, you can safely ignore this email.""",
+    ),
+    "password_reset": (
+        "Reset your FitTrack password",
+        "🔐 Password Reset Request",
+        """            <p>We received a request to reset your password. Click the button below to create a new password:</p>
+            <p style="text-align: center;">
+                <a href="{{ url }}" class="button">Reset Password</a>
+            </p>
+            <p>Or copy and paste this link into your browser:</p>
+            <p class="link">{{ url }}</p>
+            <p><strong>This link will expire in 24 hours.</strong></p>
+            <p>If you didn't request a password reset, you can safely ignore this email.</p>""",
+        """We received a request to reset your password. Open this link to create a new password:
+
+{{ url }}
+
+This link will expire in 24 hours.
+If you didn't request a password reset, you can safely ignore this email.""",
+    ),
+    "weekly_summary": (
+        "Your FitTrack week in review",
+        "📊 Your Week in Review",
+        """            <p>Here's how your week went:</p>
+            <ul>
+                <li><strong>{{ meals }}</strong> meals logged ({{ calories }} kcal)</li>
+                <li><strong>{{ workouts }}</strong> workouts completed</li>
+                <li><strong>{{ water_liters }} L</strong> of water</li>
+            </ul>
+            <p style="text-align: center;">
+                <a href="{{ url }}" class="button">Open Dashboard</a>
+            </p>""",
+        """Here's how your week went:
+
+- {{ meals }} meals logged ({{ calories }} kcal)
+- {{ workouts }} workouts completed
+- {{ water_liters }} L of water
+
+Open your dashboard: {{ url }}""",
+    ),
+}
+
+
+def _compile_messages():
+    compiled = {}
+    for name, (subject, heading, html_body, text_body) in MESSAGES.items():
+        html_source = HTML_LAYOUT.replace("[[heading]]", heading).replace("[[body]]", html_body)
+        text_source = TEXT_LAYOUT.replace("[[body]]", text_body)
+        compiled[name] = (subject, CompiledTemplate(html_source), CompiledTemplate(text_source))
+    return compiled
+
+
+# Compiled once at import
+TEMPLATES = _compile_messages()
+
+
+def render_email(name: str, **values) -> RenderedEmail:
+    """Render the HTML and plain-text parts of a message."""
+    subject, html_template, text_template = TEMPLATES[name]
+    text_values = {key: str(value) for key, value in values.items()}
+    html_values = {key: _escape(value) for key, value in text_values.items()}
+    return RenderedEmail(subject, html_template.render(html_values), text_template.render(text_values))
@@ -0,0 +1,124 @@
+"""
+Sparse Fieldsets
+`fields=` trims meal and workout rows to the named attributes, and
+`normalize=true` moves the referenced foods or exercises into an
+`included` side table so rows carry only their ids. A long history then
+lists each food once instead of once per entry. Rows are built as plain
+dicts rather than validated per row through the response models, which is
+most of the serialization cost of long lists.
+"""
+from datetime import date, datetime
+from enum import Enum
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.orm import selectinload
+
+from app.database import ExerciseSet, MealFood, MealLog, WorkoutExercise, WorkoutSession
+from app.partitioning import date_range
+from app.schemas import (
+    ExerciseLibraryResponse, ExerciseSetResponse, FoodDatabaseResponse, MealFoodResponse,
+    MealLogResponse, WorkoutExerciseResponse, WorkoutSessionResponse,
+)
+
+MEAL_FIELDS = tuple(MealLogResponse.model_fields)
+MEAL_FOOD_FIELDS = tuple(name for name in MealFoodResponse.model_fields if name != "food")
+FOOD_FIELDS = tuple(FoodDatabaseResponse.model_fields)
+
+WORKOUT_FIELDS = tuple(WorkoutSessionResponse.model_fields)
+WORKOUT_EXERCISE_FIELDS = tuple(
+    name for name in WorkoutExerciseResponse.model_fields if name not in ("exercise", "sets")
+)
+SET_FIELDS = tuple(ExerciseSetResponse.model_fields)
+EXERCISE_FIELDS = tuple(ExerciseLibraryResponse.model_fields)
+
+
+def parse_fields(fields: Optional[str], allowed: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Validate a comma-separated field list; `id` is always included."""
+    if not fields:
+        return allowed
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - set(allowed))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Choose from: {', '.join(allowed)}")
+    return tuple(name for name in allowed if name == "id" or name in names)
+
+
+def _value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _row(obj, names: Iterable[str]) -> dict:
+    return {name: _value(getattr(obj, name)) for name in names}
+
+
+def meal_load_options(fields: Tuple[str, ...], start_date: Optional[date] = None,
+                      end_date: Optional[date] = None) -> list:
+    """
+    Eager-load meal entries and foods only when the response needs them.
+    The meals' date range is repeated on the entries so PostgreSQL only
+    scans the matching meal_foods partitions.
+    """
+    if "foods" not in fields:
+        return []
+    foods = MealLog.foods.and_(*date_range(MealFood.date, start_date, end_date))
+    return [selectinload(foods).selectinload(MealFood.food)]
+
+
+def workout_load_options(fields: Tuple[str, ...], start_date: Optional[date] = None,
+                         end_date: Optional[date] = None) -> list:
+    if "exercises" not in fields:
+        return []
+    sets = WorkoutExercise.sets.and_(*date_range(ExerciseSet.date, start_date, end_date))
+    return [
+        selectinload(WorkoutSession.exercises).selectinload(WorkoutExercise.exercise),
+        selectinload(WorkoutSession.exercises).selectinload(sets),
+    ]
+
+
+def serialize_meals(meals, fields: Tuple[str, ...], normalize: bool = False):
+    """Meal rows as dicts; with `normalize`, foods go to `included` once each."""
+    foods = {}
+    rows = []
+    for meal in meals:
+        row = _row(meal, (name for name in fields if name != "foods"))
+        if "foods" in fields:
+            entries = []
+            for entry in meal.foods:
+                item = _row(entry, MEAL_FOOD_FIELDS)
+                if not normalize:
+                    item["food"] = _row(entry.food, FOOD_FIELDS)
+                elif entry.food_id not in foods:
+                    foods[entry.food_id] = _row(entry.food, FOOD_FIELDS)
+                entries.append(item)
+            row["foods"] = entries
+        rows.append(row)
+    if normalize:
+        return {"data": rows, "included": {"foods": list(foods.values())}}
+    return rows
+
+
+def serialize_workouts(workouts, fields: Tuple[str, ...], normalize: bool = False):
+    """Workout rows as dicts; with `normalize`, exercises go to `included` once each."""
+    exercises = {}
+    rows = []
+    for workout in workouts:
+        row = _row(workout, (name for name in fields if name != "exercises"))
+        if "exercises" in fields:
+            entries = []
+            for entry in workout.exercises:
+                item = _row(entry, WORKOUT_EXERCISE_FIELDS)
+                item["sets"] = [_row(exercise_set, SET_FIELDS) for exercise_set in entry.sets]
+                if not normalize:
+                    item["exercise"] = _row(entry.exercise, EXERCISE_FIELDS)
+                elif entry.exercise_id not in exercises:
+                    exercises[entry.exercise_id] = _row(entry.exercise, EXERCISE_FIELDS)
+                entries.append(item)
+            row["exercises"] = entries
+        rows.append(row)
+    if normalize:
+        return {"data": rows, "included": {"exercises": list(exercises.values())}}
+    return rows
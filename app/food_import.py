@@ -0,0 +1,262 @@
+"""
+Food Catalogue Import Pipeline
+Streams large CSV/JSONL nutrition dumps into the food database with unit
+normalization, dedupe on (name, brand, serving) and batched upserts.
+Progress is saved to a checkpoint file after every committed batch so an
+interrupted import can resume where it stopped.
+"""
+import csv
+import gzip
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, Optional
+
+from app.bulk import BulkWriter, DEFAULT_BATCH_SIZE
+from app.database import FoodDatabase
+from app.units import UNIT_COLUMNS, clean_unit, food_units, lookup_unit
+
+logger = logging.getLogger(__name__)
+
+# A queued/running import whose checkpoint hasn't changed for this long has lost its worker
+IMPORT_STALE_SECONDS = float(os.getenv("FOOD_IMPORT_STALE_SECONDS", "600"))
+
+# Source column names accepted for each food field (first match wins)
+FIELD_ALIASES = {
+    "name": ("name", "description", "product_name", "food_name"),
+    "brand": ("brand", "brands", "brand_owner", "brand_name"),
+    "serving_size": ("serving_size", "serving_quantity", "serving_amount"),
+    "serving_unit": ("serving_unit", "serving_size_unit", "unit"),
+    "calories": ("calories", "energy_kcal", "kcal", "energy-kcal_100g"),
+    "energy_kj": ("energy_kj", "energy-kj_100g", "kj"),
+    "protein_g": ("protein_g", "protein", "proteins_100g"),
+    "carbs_g": ("carbs_g", "carbohydrates", "carbohydrate", "carbohydrates_100g"),
+    "fats_g": ("fats_g", "fat", "total_fat", "fat_100g"),
+    "fiber_g": ("fiber_g", "fiber", "fibre", "fiber_100g"),
+}
+
+# Columns refreshed when an imported food already exists
+UPSERT_COLUMNS = (
+    "name", "brand", "serving_size", "serving_unit", "calories",
+    "protein_g", "carbs_g", "fats_g", "fiber_g", *UNIT_COLUMNS,
+)
+
+KJ_PER_KCAL = 4.184
+_WHITESPACE = re.compile(r"\s+")
+
+
+class FoodImportError(Exception):
+    """Raised when an import file cannot be read."""
+
+
+def normalize_unit(serving_size: float, serving_unit: str):
+    """Map a serving to a canonical unit, converting mass and volume to g/ml."""
+    unit = clean_unit(serving_unit)
+    alias = lookup_unit(unit)
+    if alias is None:
+        return serving_size, unit or "serving"
+    canonical, factor = alias
+    return round(serving_size * factor, 3), canonical
+
+
+def dedupe_key(name: str, brand: Optional[str], serving_size: float, serving_unit: str) -> str:
+    """Build the normalized key foods are deduplicated on."""
+    parts = [name, brand or "", f"{serving_size:g}", serving_unit]
+    return "|".join(_WHITESPACE.sub(" ", part.strip().casefold()) for part in parts)
+
+
+def _pick(record: Dict, field: str):
+    for alias in FIELD_ALIASES[field]:
+        value = record.get(alias)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _number(value, default=0.0) -> float:
+    if value in (None, ""):
+        return default
+    number = float(value)
+    if number < 0:
+        raise ValueError("negative value")
+    return number
+
+
+def normalize_food(record: Dict) -> Optional[Dict]:
+    """Turn one source record into a food_database row, or None if unusable."""
+    name = _pick(record, "name")
+    if not name:
+        return None
+    try:
+        calories = _pick(record, "calories")
+        if calories in (None, ""):
+            energy_kj = _pick(record, "energy_kj")
+            if energy_kj in (None, ""):
+                return None
+            calories = _number(energy_kj) / KJ_PER_KCAL
+        # Nutrition dumps are per 100 g unless a serving is given
+        serving_size, serving_unit = normalize_unit(
+            _number(_pick(record, "serving_size"), 100.0),
+            str(_pick(record, "serving_unit") or "g"),
+        )
+        if serving_size <= 0:
+            return None
+        row = {
+            "name": _WHITESPACE.sub(" ", str(name).strip())[:200],
+            "brand": (_WHITESPACE.sub(" ", str(_pick(record, "brand")).strip())[:100]
+                      if _pick(record, "brand") else None),
+            "serving_size": serving_size,
+            "serving_unit": serving_unit,
+            "calories": int(round(_number(calories))),
+            "protein_g": round(_number(_pick(record, "protein_g")), 2),
+            "carbs_g": round(_number(_pick(record, "carbs_g")), 2),
+            "fats_g": round(_number(_pick(record, "fats_g")), 2),
+            "fiber_g": round(_number(_pick(record, "fiber_g")), 2),
+            "is_custom": False,
+        }
+    except (TypeError, ValueError):
+        return None
+    row["dedupe_key"] = dedupe_key(row["name"], row["brand"], row["serving_size"], row["serving_unit"])
+    # Set here rather than by the column defaults, which COPY doesn't run
+    row.update(food_units(row))
+    return row
+
+
+def detect_format(path: str) -> str:
+    """Return "csv" or "jsonl" based on the file extension (.gz allowed)."""
+    name = path[:-3] if path.endswith(".gz") else path
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise FoodImportError(f"Unsupported file type: {path}")
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Dict]:
+    """Stream raw records from a CSV or JSONL file one at a time."""
+    fmt = fmt or detect_format(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            for record in csv.DictReader(handle):
+                yield {key.strip().lower(): value for key, value in record.items() if key}
+        else:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield {}
+                    continue
+                yield {str(key).lower(): value for key, value in record.items()} if isinstance(record, dict) else {}
+
+
+def load_checkpoint(checkpoint_path: str) -> Optional[Dict]:
+    """Read a saved checkpoint, if any."""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path) as handle:
+        return json.load(handle)
+
+
+def save_checkpoint(checkpoint_path: str, state: Dict):
+    """Atomically write the checkpoint file."""
+    if not checkpoint_path:
+        return
+    state["updated_at"] = datetime.utcnow().isoformat()
+    tmp_path = f"{checkpoint_path}.tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(state, handle)
+    os.replace(tmp_path, checkpoint_path)
+
+
+def new_import_state(path: str, status: str = "queued") -> Dict:
+    """Initial progress state for an import of ``path``."""
+    return {
+        "source": path,
+        "status": status,
+        "rows_read": 0,
+        "rows_imported": 0,
+        "rows_rejected": 0,
+        "error": None,
+        "started_at": datetime.utcnow().isoformat(),
+    }
+
+
+def import_in_progress(state: Dict, stale_seconds: float = IMPORT_STALE_SECONDS) -> bool:
+    """
+    Whether a worker still owns the import: it is queued or running and its
+    checkpoint (rewritten after every batch) changed within stale_seconds.
+    """
+    if state.get("status") not in ("queued", "running") or not state.get("updated_at"):
+        return False
+    age = datetime.utcnow() - datetime.fromisoformat(state["updated_at"])
+    return age < timedelta(seconds=stale_seconds)
+
+
+def import_foods(
+    engine,
+    path: str,
+    checkpoint_path: Optional[str] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    fmt: Optional[str] = None,
+    resume: bool = True,
+    on_progress: Optional[Callable[[Dict], None]] = None,
+) -> Dict:
+    """
+    Import foods from a CSV/JSONL file and return the final progress state.
+
+    Rows are upserted on their dedupe key, so re-importing a file (or resuming
+    after a crash) never creates duplicates. Only one batch is held in memory.
+    """
+    state = load_checkpoint(checkpoint_path) if resume else None
+    if state and state.get("status") == "completed":
+        logger.info(f"Import of {path} already completed")
+        return state
+    if not state:
+        state = new_import_state(path)
+    state.update(status="running", error=None)
+    skip = state["rows_read"]
+    save_checkpoint(checkpoint_path, state)
+
+    # Counters for rows read since the last committed batch
+    pending = {"read": 0, "imported": 0, "rejected": 0}
+
+    def commit_progress(_counts=None):
+        state["rows_read"] += pending["read"]
+        state["rows_imported"] += pending["imported"]
+        state["rows_rejected"] += pending["rejected"]
+        pending.update(read=0, imported=0, rejected=0)
+        save_checkpoint(checkpoint_path, state)
+        if on_progress:
+            on_progress(state)
+
+    table = FoodDatabase.__table__
+    try:
+        with BulkWriter(engine, batch_size=batch_size, on_flush=commit_progress) as writer:
+            writer.add_table(table, conflict_columns=["dedupe_key"], update_columns=UPSERT_COLUMNS)
+            for index, record in enumerate(iter_records(path, fmt)):
+                if index < skip:
+                    continue
+                pending["read"] += 1
+                row = normalize_food(record)
+                if row is None:
+                    pending["rejected"] += 1
+                    continue
+                pending["imported"] += 1
+                writer.add(table, row)
+        # Rejected rows after the last batch still need recording
+        commit_progress()
+    except Exception as e:
+        state.update(status="failed", error=str(e))
+        save_checkpoint(checkpoint_path, state)
+        logger.error(f"Food import failed: {e}")
+        raise
+
+    state["status"] = "completed"
+    save_checkpoint(checkpoint_path, state)
+    return state
@@ -0,0 +1,176 @@
+"""
+Goal Progress
+Tracked goal types derive `current_value` from logged data instead of a
+number the user types in:
+
+    weight_target    latest body-metric weight since the goal started
+    weekly_workouts  workout sessions this week (Monday to Sunday)
+    daily_protein    protein logged today (g)
+    water_streak     consecutive days with at least `threshold_value` ml
+
+Progress is refreshed from the write paths: each write calls
+refresh_goals() for its source table, which re-evaluates only that user's
+active goals fed by that table, each with one indexed aggregate over a
+bounded range (latest row, this week, today, or the last `target_value`
+days). Listing goals never rescans history. Recurring goals remember the
+period their value belongs to, so a new day or week reads as zero until
+something is logged in it; streaks remember their last qualifying day and
+read as zero once a whole day passes without one.
+
+Any other goal_type is a manual goal and keeps the value the user enters.
+"""
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.database import BodyMetric, Goal, GoalStatus, MealLog, UserProfile, WaterIntake, WorkoutSession
+from app.schemas import GoalResponse
+
+DEFAULT_WATER_STREAK_ML = 2000
+
+
+def _latest_weight(db: Session, goal: Goal, today: date) -> Optional[float]:
+    return db.query(BodyMetric.weight_kg).filter(
+        BodyMetric.user_id == goal.user_id,
+        BodyMetric.date >= goal.start_date
+    ).order_by(BodyMetric.date.desc(), BodyMetric.id.desc()).limit(1).scalar()
+
+
+def _workouts_this_week(db: Session, goal: Goal, today: date) -> float:
+    week_start = _week_start(today)
+    return db.query(func.count(WorkoutSession.id)).filter(
+        WorkoutSession.user_id == goal.user_id,
+        WorkoutSession.date >= week_start,
+        WorkoutSession.date <= week_start + timedelta(days=6)
+    ).scalar()
+
+
+def _protein_today(db: Session, goal: Goal, today: date) -> float:
+    return round(float(db.query(func.coalesce(func.sum(MealLog.total_protein_g), 0)).filter(
+        MealLog.user_id == goal.user_id,
+        MealLog.date == today
+    ).scalar()), 1)
+
+
+def _water_streak(db: Session, goal: Goal, today: date) -> Tuple[float, Optional[date]]:
+    """
+    Consecutive qualifying days ending today (or yesterday, if today isn't
+    done yet), and the last of them.
+    """
+    days = max(int(goal.target_value), 1)
+    threshold = goal.threshold_value or DEFAULT_WATER_STREAK_ML
+    qualifying = {
+        day for (day,) in db.query(WaterIntake.date).filter(
+            WaterIntake.user_id == goal.user_id,
+            WaterIntake.date >= max(goal.start_date, today - timedelta(days=days)),
+            WaterIntake.date <= today
+        ).group_by(WaterIntake.date).having(func.sum(WaterIntake.amount_ml) >= threshold)
+    }
+    last_day = today if today in qualifying else today - timedelta(days=1)
+    day, streak = last_day, 0
+    while day in qualifying:
+        streak += 1
+        day -= timedelta(days=1)
+    return streak, last_day if streak else None
+
+
+def _week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+class GoalDefinition(NamedTuple):
+    source: str                            # table whose writes change the value
+    evaluate: Callable[[Session, Goal, date], Optional[float]]
+    period: Optional[Callable[[date], date]] = None   # recurring goals reset each period
+    streak: bool = False                   # evaluate returns (length, last day)
+
+
+GOAL_DEFINITIONS: Dict[str, GoalDefinition] = {
+    "weight_target": GoalDefinition("body_metrics", _latest_weight),
+    "weekly_workouts": GoalDefinition("workouts", _workouts_this_week, _week_start),
+    "daily_protein": GoalDefinition("meals", _protein_today, lambda day: day),
+    "water_streak": GoalDefinition("water", _water_streak, streak=True),
+}
+
+
+def is_achieved(goal: Goal, current_value: Optional[float]) -> bool:
+    if current_value is None:
+        return False
+    if goal.goal_type == "weight_target" and goal.baseline_value is not None:
+        # Losing weight when the target is below where the goal started
+        if goal.target_value <= goal.baseline_value:
+            return current_value <= goal.target_value
+    return current_value >= goal.target_value
+
+
+def evaluate_goal(db: Session, goal: Goal, today: Optional[date] = None):
+    """Recompute one tracked goal's value and mark one-off goals completed."""
+    definition = GOAL_DEFINITIONS.get(goal.goal_type)
+    if definition is None:
+        return
+    today = today or date.today()
+    value = definition.evaluate(db, goal, today)
+    if definition.streak:
+        value, goal.progress_period = value
+    if value is not None:
+        goal.current_value = value
+        if goal.goal_type == "weight_target" and goal.baseline_value is None:
+            goal.baseline_value = value
+    if definition.period:
+        goal.progress_period = definition.period(today)
+    elif is_achieved(goal, value) and goal.status == GoalStatus.ACTIVE:
+        goal.status = GoalStatus.COMPLETED
+        goal.achieved_at = datetime.utcnow()
+
+
+def start_goal(db: Session, goal: Goal):
+    """Set a new tracked goal's baseline and initial progress."""
+    if goal.goal_type == "weight_target" and goal.baseline_value is None:
+        latest = db.query(BodyMetric.weight_kg).filter(
+            BodyMetric.user_id == goal.user_id
+        ).order_by(BodyMetric.date.desc(), BodyMetric.id.desc()).limit(1).scalar()
+        if latest is None:
+            latest = db.query(UserProfile.current_weight_kg).filter(UserProfile.user_id == goal.user_id).scalar()
+        goal.baseline_value = latest
+    evaluate_goal(db, goal)
+
+
+def refresh_goals(db: Session, user_id: int, source: str, day: Optional[date] = None):
+    """
+    Re-evaluate the user's active goals fed by `source` after a write to it.
+    `day` is the logged date; writes outside a recurring goal's current
+    period leave it alone.
+    """
+    goal_types = [name for name, definition in GOAL_DEFINITIONS.items() if definition.source == source]
+    goals = db.query(Goal).filter(
+        Goal.user_id == user_id,
+        Goal.status == GoalStatus.ACTIVE,
+        Goal.goal_type.in_(goal_types)
+    ).all()
+    today = date.today()
+    for goal in goals:
+        definition = GOAL_DEFINITIONS[goal.goal_type]
+        if day and definition.period and definition.period(day) != definition.period(today):
+            continue
+        evaluate_goal(db, goal, today)
+
+
+def goal_progress(goal: Goal, today: Optional[date] = None) -> dict:
+    """Value and achievement as of today, without touching the database."""
+    definition = GOAL_DEFINITIONS.get(goal.goal_type)
+    current_value = goal.current_value
+    today = today or date.today()
+    if definition and definition.period and goal.progress_period != definition.period(today):
+        current_value = 0  # nothing logged yet in this day / week
+    if definition and definition.streak and (
+        goal.progress_period is None or goal.progress_period < today - timedelta(days=1)
+    ):
+        current_value = 0  # a full day passed without a qualifying one
+    achieved = goal.status == GoalStatus.COMPLETED or is_achieved(goal, current_value)
+    return {"current_value": current_value, "is_achieved": achieved, "is_tracked": definition is not None}
+
+
+def goal_response(goal: Goal) -> GoalResponse:
+    return GoalResponse.model_validate(goal).model_copy(update=goal_progress(goal))
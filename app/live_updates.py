@@ -0,0 +1,205 @@
+"""
+Live Dashboard Updates
+Meal, water and workout writes publish small deltas (calories added, water
+added, workouts logged) after they commit. Clients subscribe per user over
+Server-Sent Events at GET /events/dashboard and update the dashboard tiles
+in place instead of re-fetching /dashboard after every change.
+
+Delivery is in-process by default. With LIVE_UPDATES_BACKEND=postgres each
+worker LISTENs on one channel and publishes with NOTIFY, so a write handled
+by one worker reaches clients connected to any other.
+"""
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+LIVE_UPDATES_ENABLED = os.getenv("LIVE_UPDATES_ENABLED", "true").lower() == "true"
+# "memory" (single worker) or "postgres" (LISTEN/NOTIFY fan-out across workers)
+LIVE_UPDATES_BACKEND = os.getenv("LIVE_UPDATES_BACKEND", "memory").lower()
+LIVE_UPDATES_CHANNEL = os.getenv("LIVE_UPDATES_CHANNEL", "dashboard_updates")
+LIVE_UPDATES_QUEUE_SIZE = int(os.getenv("LIVE_UPDATES_QUEUE_SIZE", "100"))
+LIVE_UPDATES_KEEPALIVE_SECONDS = float(os.getenv("LIVE_UPDATES_KEEPALIVE_SECONDS", "15"))
+LIVE_UPDATES_RECONNECT_SECONDS = float(os.getenv("LIVE_UPDATES_RECONNECT_SECONDS", "5"))
+
+RESYNC = {"type": "resync"}
+
+
+class LiveUpdateBroker:
+    """In-process pub/sub: one bounded queue per open connection, keyed by user."""
+
+    def __init__(self, queue_size: int = LIVE_UPDATES_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def subscribe(self, user_id: int) -> asyncio.Queue:
+        self._loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[user_id].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: int, queue: asyncio.Queue):
+        with self._lock:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+    def subscriber_count(self, user_id: Optional[int] = None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._subscribers.get(user_id, ()))
+            return sum(len(queues) for queues in self._subscribers.values())
+
+    def publish(self, user_id: int, event: dict):
+        """Deliver to this process's subscribers; safe to call from worker threads."""
+        with self._lock:
+            queues = list(self._subscribers.get(user_id, ()))
+        if not queues or self._loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._deliver(queues, event)
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._deliver, queues, event)
+
+    @staticmethod
+    def _deliver(queues, event: dict):
+        for queue in queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow client missed deltas; tell it to reload the dashboard
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RESYNC)
+
+
+broker = LiveUpdateBroker()
+
+
+class PostgresFanout:
+    """LISTENs on a channel from the event loop and feeds NOTIFY payloads to the broker."""
+
+    def __init__(self, engine, broker: LiveUpdateBroker, channel: str = LIVE_UPDATES_CHANNEL):
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", channel):
+            raise ValueError(f"Invalid LISTEN channel name: {channel!r}")
+        self.engine = engine
+        self.broker = broker
+        self.channel = channel
+        self._conn = None
+        self._loop = None
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        try:
+            raw = self.engine.raw_connection()
+            raw.detach()  # held for the process lifetime, keep it out of the pool
+            self._conn = raw.driver_connection
+            self._conn.autocommit = True
+            with self._conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {self.channel}")
+            self._loop.add_reader(self._conn.fileno(), self._on_readable)
+            logger.info(f"Listening for live updates on {self.channel}")
+        except Exception as e:
+            logger.error(f"Live update LISTEN failed: {e}")
+            self._reconnect_later()
+
+    def stop(self):
+        if self._conn is not None:
+            try:
+                self._loop.remove_reader(self._conn.fileno())
+                self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+    def _reconnect_later(self):
+        self.stop()
+        self._loop.call_later(LIVE_UPDATES_RECONNECT_SECONDS, self.start)
+
+    def _on_readable(self):
+        try:
+            self._conn.poll()
+        except Exception as e:
+            logger.error(f"Live update connection lost: {e}")
+            self._reconnect_later()
+            return
+        while self._conn.notifies:
+            notify = self._conn.notifies.pop(0)
+            try:
+                message = json.loads(notify.payload)
+                self.broker.publish(message["user_id"], message["event"])
+            except (ValueError, KeyError) as e:
+                logger.warning(f"Ignoring malformed live update: {e}")
+
+
+def _notify(user_id: int, event: dict):
+    from app.database import engine
+
+    payload = json.dumps({"user_id": user_id, "event": event}, separators=(",", ":"))
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_notify(:channel, :payload)"),
+                     {"channel": LIVE_UPDATES_CHANNEL, "payload": payload})
+
+
+def publish_dashboard_delta(user_id: int, source: str, day: date, **delta):
+    """
+    Publish a change to a user's dashboard totals. Call after the write has
+    committed; `delta` holds signed amounts (calories, protein_g, carbs_g,
+    fats_g, water_ml, workouts) and `day` lets clients ignore other dates.
+    """
+    _publish(user_id, {"type": "delta", "source": source, "date": day.isoformat(), "delta": delta})
+
+
+def publish_resync(user_id: int):
+    """Tell a user's dashboards to reload, for changes too broad to send as a delta."""
+    _publish(user_id, RESYNC)
+
+
+def _publish(user_id: int, event: dict):
+    if not LIVE_UPDATES_ENABLED:
+        return
+    if LIVE_UPDATES_BACKEND == "postgres":
+        try:
+            _notify(user_id, event)
+            return
+        except Exception as e:
+            logger.error(f"Live update NOTIFY failed, delivering locally: {e}")
+    broker.publish(user_id, event)
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(request, user_id: int):
+    """Server-Sent Events for one connection, with keepalive comments while idle."""
+    queue = broker.subscribe(user_id)
+    try:
+        yield f"retry: {int(LIVE_UPDATES_RECONNECT_SECONDS * 1000)}\n\n"
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), LIVE_UPDATES_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(user_id, queue)
@@ -1,26 +1,27 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, UploadFile, File, BackgroundTasks
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, FileResponse, JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from pydantic import EmailStr
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+import asyncio
 import os
+import secrets
+import shutil
+import tempfile
 import traceback
 
-from app.database import get_db, create_tables, User
+from app.database import get_db, engine, User
 from app.schemas import UserCreate, UserResponse, Token
 from app.auth import (
     get_password_hash, authenticate_user, create_access_token,
-    get_current_user, get_user_by_username, get_user_by_email,
+    get_current_user, get_current_admin_user, get_user_by_username, get_user_by_email,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
-
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+from app.rate_limit import limiter, user_or_ip_key, AI_RATE_LIMIT
 
 # Create FastAPI app
 app = FastAPI(title="Application API", version="1.0.0")
@@ -49,18 +50,52 @@ async def global_exception_handler(request: Request, exc: Exception):
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Create database tables on startup
+# Verify the schema revision on startup (migrations run via `python migrate.py`)
 @app.on_event("startup")
 def startup_event():
+    from app.schema_version import check_schema_revision
+    
     try:
-        print("Creating database tables...")
-        create_tables()
-        print("Database tables created successfully!")
+        check_schema_revision(engine)
     except Exception as e:
-        print(f"Error creating database tables: {str(e)}")
+        print(f"Database schema check failed: {str(e)}")
         raise
 
 
+# Deliver queued emails in the background (or run `python -m app.email_outbox`)
+@app.on_event("startup")
+async def start_email_worker():
+    from app.email_outbox import EMAIL_WORKER_ENABLED, run_worker
+    from app.email_service import EMAIL_ENABLED, EMAIL_PROVIDER
+    
+    if EMAIL_WORKER_ENABLED and EMAIL_ENABLED and EMAIL_PROVIDER != "mock":
+        app.state.email_worker = asyncio.create_task(run_worker())
+
+
+@app.on_event("shutdown")
+async def stop_email_worker():
+    worker = getattr(app.state, "email_worker", None)
+    if worker:
+        worker.cancel()
+
+
+# Fan live dashboard updates out across workers with LISTEN/NOTIFY
+@app.on_event("startup")
+async def start_live_updates():
+    from app.live_updates import LIVE_UPDATES_BACKEND, LIVE_UPDATES_ENABLED, PostgresFanout, broker
+    
+    if LIVE_UPDATES_ENABLED and LIVE_UPDATES_BACKEND == "postgres":
+        app.state.live_fanout = PostgresFanout(engine, broker)
+        app.state.live_fanout.start()
+
+
+@app.on_event("shutdown")
+async def stop_live_updates():
+    fanout = getattr(app.state, "live_fanout", None)
+    if fanout:
+        fanout.stop()
+
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
@@ -110,9 +145,9 @@ def register(request: Request, user: UserCreate, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(db_user)
     
-    # Generate verification token and send email
+    # Generate verification token and queue the email
     verification_token = generate_verification_token(str(db_user.id))
-    send_verification_email(db_user.email, db_user.username, verification_token)
+    send_verification_email(db_user.email, db_user.username, verification_token, db=db)
     
     return db_user
 
@@ -144,6 +179,16 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
+@app.delete("/users/me", status_code=status.HTTP_204_NO_CONTENT)
+def delete_current_user(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Delete the account and all of its history."""
+    delete_account(db, current_user.id)
+    return None
+
+
 # Email Verification
 @app.get("/verify")
 def verify_email(token: str, db: Session = Depends(get_db)):
@@ -191,9 +236,9 @@ def resend_verification(email: EmailStr, db: Session = Depends(get_db)):
             detail="Email already verified"
         )
     
-    # Generate new token and send email
+    # Generate new token and queue the email
     verification_token = generate_verification_token(str(db_user.id))
-    send_verification_email(db_user.email, db_user.username, verification_token)
+    send_verification_email(db_user.email, db_user.username, verification_token, db=db)
     
     return {"message": "Verification email sent successfully!"}
 
@@ -203,22 +248,36 @@ def resend_verification(email: EmailStr, db: Session = Depends(get_db)):
 from app.schemas import (
     UserProfileCreate, UserProfileUpdate, UserProfileResponse,
     BodyMetricCreate, BodyMetricResponse,
-    FoodDatabaseCreate, FoodDatabaseResponse,
+    FoodDatabaseCreate, FoodDatabaseResponse, FoodImportStatus,
     MealLogCreate, MealLogResponse,
     ExerciseLibraryCreate, ExerciseLibraryResponse,
     WorkoutSessionCreate, WorkoutSessionResponse,
     WaterIntakeCreate, WaterIntakeResponse,
     GoalCreate, GoalResponse,
     AIParseFoodRequest, AIParseFoodResponse,
-    AIParseWorkoutRequest, DashboardSummary
+    AIParseWorkoutRequest, DashboardSummary, SyncResponse, BootstrapResponse,
+    StreakSummary
 )
 from app.database import (
     UserProfile, BodyMetric, FoodDatabase, MealLog, MealFood,
     ExerciseLibrary, WorkoutSession, WorkoutExercise, ExerciseSet,
-    WaterIntake, Goal, MealType
+    WaterIntake, Goal, GoalStatus, MealType
 )
 from app.ai_service import parse_food_with_ai, parse_workout_with_ai, get_meal_suggestions
-from typing import List, Optional
+from app.nutrition import snapshot_nutrition, refresh_meal_totals
+from app.units import food_units
+from app.live_updates import event_stream, publish_dashboard_delta, publish_resync
+from app.dashboard import dashboard_summary
+from app.goals import goal_response, refresh_goals, start_goal
+from app.streaks import calorie_target_changed, recompute_user, record_write, streak_summary
+from app.deletion import delete_account, delete_history, parse_kinds
+from app.bootstrap import load_bootstrap, parse_sections
+from app.fieldsets import (
+    MEAL_FIELDS, WORKOUT_FIELDS, meal_load_options, parse_fields,
+    serialize_meals, serialize_workouts, workout_load_options
+)
+from app.sync import SYNC_PAGE_SIZE, SyncTokenExpired, collect_changes
+from typing import Dict, List, Optional
 from datetime import date as date_type, datetime, timedelta
 
 
@@ -237,6 +296,9 @@ def create_user_profile(
     
     profile = UserProfile(user_id=current_user.id, **profile_data.dict())
     db.add(profile)
+    db.flush()
+    if profile.daily_calorie_target is not None:
+        calorie_target_changed(db, current_user.id)
     db.commit()
     db.refresh(profile)
     return profile
@@ -265,8 +327,12 @@ def update_user_profile(
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found. Create one first.")
     
+    previous_target = profile.daily_calorie_target
     for key, value in profile_data.dict(exclude_unset=True).items():
         setattr(profile, key, value)
+    db.flush()
+    if profile.daily_calorie_target != previous_target:
+        calorie_target_changed(db, current_user.id)
     
     db.commit()
     db.refresh(profile)
@@ -283,6 +349,8 @@ def create_body_metric(
     """Log body metrics (weight, body fat %)."""
     db_metric = BodyMetric(user_id=current_user.id, **metric.dict())
     db.add(db_metric)
+    db.flush()
+    refresh_goals(db, current_user.id, "body_metrics", db_metric.date)
     db.commit()
     db.refresh(db_metric)
     return db_metric
@@ -339,35 +407,129 @@ def search_foods(
     return query.limit(limit).all()
 
 
+# ==== ADMIN FOOD IMPORT ENDPOINTS ====
+from app.food_import import (
+    FoodImportError, detect_format, import_foods, import_in_progress, load_checkpoint, new_import_state,
+    save_checkpoint
+)
+
+FOOD_IMPORT_DIR = os.getenv("FOOD_IMPORT_DIR", os.path.join(tempfile.gettempdir(), "food_imports"))
+
+
+def _food_import_checkpoint(import_id: str) -> str:
+    if not import_id.isalnum():
+        raise HTTPException(status_code=404, detail="Import not found")
+    return os.path.join(FOOD_IMPORT_DIR, f"{import_id}.json")
+
+
+def _run_food_import(import_id: str):
+    """Background task running (or resuming) an uploaded import."""
+    checkpoint = _food_import_checkpoint(import_id)
+    state = load_checkpoint(checkpoint)
+    try:
+        import_foods(engine, state["source"], checkpoint_path=checkpoint)
+    except Exception as e:
+        print(f"Food import {import_id} failed: {str(e)}")
+
+
+def _food_import_status(import_id: str) -> dict:
+    state = load_checkpoint(_food_import_checkpoint(import_id))
+    if not state:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return {"import_id": import_id, **state}
+
+
+@app.post("/admin/foods/import", response_model=FoodImportStatus, status_code=status.HTTP_202_ACCEPTED)
+def start_food_import(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Upload a CSV/JSONL food dataset (optionally gzipped) and import it in the background."""
+    filename = (file.filename or "").lower()
+    try:
+        fmt = detect_format(filename)
+    except FoodImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    import_id = secrets.token_hex(8)
+    os.makedirs(FOOD_IMPORT_DIR, exist_ok=True)
+    source = os.path.join(FOOD_IMPORT_DIR, f"{import_id}.{fmt}" + (".gz" if filename.endswith(".gz") else ""))
+    with open(source, "wb") as out:
+        shutil.copyfileobj(file.file, out, length=1024 * 1024)
+    
+    save_checkpoint(_food_import_checkpoint(import_id), new_import_state(source))
+    background_tasks.add_task(_run_food_import, import_id)
+    return _food_import_status(import_id)
+
+
+@app.get("/admin/foods/import/{import_id}", response_model=FoodImportStatus)
+def get_food_import(
+    import_id: str,
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Get progress of a food import."""
+    return _food_import_status(import_id)
+
+
+@app.post("/admin/foods/import/{import_id}/resume", response_model=FoodImportStatus, status_code=status.HTTP_202_ACCEPTED)
+def resume_food_import(
+    import_id: str,
+    background_tasks: BackgroundTasks,
+    admin_user: User = Depends(get_current_admin_user)
+):
+    """Resume a failed or interrupted food import from its last checkpoint."""
+    checkpoint = _food_import_checkpoint(import_id)
+    state = load_checkpoint(checkpoint)
+    if not state:
+        raise HTTPException(status_code=404, detail="Import not found")
+    if state["status"] == "completed":
+        raise HTTPException(status_code=400, detail="Import already completed")
+    if import_in_progress(state):
+        raise HTTPException(status_code=409, detail="Import is already running")
+    
+    # Queued again right away, so a repeated resume is refused until this run stalls
+    state.update(status="queued", error=None)
+    save_checkpoint(checkpoint, state)
+    background_tasks.add_task(_run_food_import, import_id)
+    return {"import_id": import_id, **state}
+
+
 # ==== AI PARSING ENDPOINTS ====
 @app.post("/ai/parse-food", response_model=AIParseFoodResponse)
+@limiter.limit(AI_RATE_LIMIT, key_func=user_or_ip_key)
 def ai_parse_food(
-    request: AIParseFoodRequest,
+    request: Request,
+    parse_request: AIParseFoodRequest,
     current_user: User = Depends(get_current_user)
 ):
     """Parse natural language food description with AI."""
     try:
-        food_items = parse_food_with_ai(request.text)
+        food_items = [{**item, **food_units(item)} for item in parse_food_with_ai(parse_request.text)]
         return {"food_items": food_items}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI parsing error: {str(e)}")
 
 
 @app.post("/ai/parse-workout")
+@limiter.limit(AI_RATE_LIMIT, key_func=user_or_ip_key)
 def ai_parse_workout(
-    request: AIParseWorkoutRequest,
+    request: Request,
+    parse_request: AIParseWorkoutRequest,
     current_user: User = Depends(get_current_user)
 ):
     """Parse natural language workout description with AI."""
     try:
-        exercises = parse_workout_with_ai(request.text)
+        exercises = parse_workout_with_ai(parse_request.text)
         return {"exercises": exercises}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI parsing error: {str(e)}")
 
 
 @app.get("/ai/meal-suggestions")
+@limiter.limit(AI_RATE_LIMIT, key_func=user_or_ip_key)
 def get_ai_meal_suggestions(
+    request: Request,
     preferences: Optional[str] = None,
     dietary_restrictions: Optional[str] = None,
     current_user: User = Depends(get_current_user)
@@ -397,17 +559,43 @@ def create_meal_log(
     db.add(db_meal)
     db.flush()
     
+    # Load all referenced foods in one query for the nutrition snapshots
+    food_ids = {food_item.food_id for food_item in meal.foods}
+    foods = {food.id: food for food in db.query(FoodDatabase).filter(FoodDatabase.id.in_(food_ids))}
+    missing = food_ids - foods.keys()
+    if missing:
+        db.rollback()
+        raise HTTPException(status_code=404, detail=f"Food not found: {sorted(missing)[0]}")
+    
     # Add foods to meal
+    meal_foods = []
     for food_item in meal.foods:
         meal_food = MealFood(
             meal_id=db_meal.id,
+            date=db_meal.date,
             food_id=food_item.food_id,
-            servings=food_item.servings
+            servings=food_item.servings,
+            amount=food_item.amount
         )
+        try:
+            snapshot_nutrition(meal_food, foods[food_item.food_id])
+        except ValueError as e:
+            db.rollback()
+            raise HTTPException(status_code=400, detail=str(e))
+        meal_foods.append(meal_food)
         db.add(meal_food)
+    refresh_meal_totals(db_meal, meal_foods)
+    db.flush()
+    refresh_goals(db, current_user.id, "meals", db_meal.date)
+    record_write(db, current_user.id, "meals", db_meal.date)
     
     db.commit()
     db.refresh(db_meal)
+    publish_dashboard_delta(
+        current_user.id, "meal", db_meal.date,
+        calories=db_meal.total_calories, protein_g=db_meal.total_protein_g,
+        carbs_g=db_meal.total_carbs_g, fats_g=db_meal.total_fats_g
+    )
     return db_meal
 
 
@@ -416,10 +604,21 @@ def get_meal_logs(
     start_date: Optional[date_type] = None,
     end_date: Optional[date_type] = None,
     meal_type: Optional[MealType] = None,
+    fields: Optional[str] = None,
+    normalize: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get meal history."""
+    """
+    Get meal history. `fields` (comma-separated) limits each row to those
+    attributes; `normalize=true` returns {"data", "included"} with each food
+    listed once and entries carrying only food_id.
+    """
+    try:
+        selected = parse_fields(fields, MEAL_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     query = db.query(MealLog).filter(MealLog.user_id == current_user.id)
     
     if start_date:
@@ -429,7 +628,10 @@ def get_meal_logs(
     if meal_type:
         query = query.filter(MealLog.meal_type == meal_type)
     
-    return query.order_by(MealLog.date.desc()).all()
+    meals = query.options(*meal_load_options(selected, start_date, end_date)).order_by(MealLog.date.desc()).all()
+    if fields or normalize:
+        return JSONResponse(serialize_meals(meals, selected, normalize))
+    return meals
 
 
 @app.delete("/meals/{meal_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -447,8 +649,17 @@ def delete_meal(
     if not meal:
         raise HTTPException(status_code=404, detail="Meal not found")
     
+    delta = dict(
+        calories=-(meal.total_calories or 0), protein_g=-(meal.total_protein_g or 0),
+        carbs_g=-(meal.total_carbs_g or 0), fats_g=-(meal.total_fats_g or 0)
+    )
+    meal_date = meal.date
     db.delete(meal)
+    db.flush()
+    refresh_goals(db, current_user.id, "meals", meal_date)
+    record_write(db, current_user.id, "meals", meal_date, deleted=True)
     db.commit()
+    publish_dashboard_delta(current_user.id, "meal", meal_date, **delta)
     return None
 
 
@@ -520,12 +731,17 @@ def create_workout_session(
         for set_data in exercise_data.sets:
             exercise_set = ExerciseSet(
                 workout_exercise_id=workout_exercise.id,
+                date=db_workout.date,
                 **set_data.dict()
             )
             db.add(exercise_set)
     
+    db.flush()
+    refresh_goals(db, current_user.id, "workouts", db_workout.date)
+    record_write(db, current_user.id, "workouts", db_workout.date)
     db.commit()
     db.refresh(db_workout)
+    publish_dashboard_delta(current_user.id, "workout", db_workout.date, workouts=1)
     return db_workout
 
 
@@ -533,10 +749,20 @@ def create_workout_session(
 def get_workout_sessions(
     start_date: Optional[date_type] = None,
     end_date: Optional[date_type] = None,
+    fields: Optional[str] = None,
+    normalize: bool = False,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get workout history."""
+    """
+    Get workout history. `fields` and `normalize` work as for GET /meals,
+    with exercises moved to the `included` side table.
+    """
+    try:
+        selected = parse_fields(fields, WORKOUT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     query = db.query(WorkoutSession).filter(WorkoutSession.user_id == current_user.id)
     
     if start_date:
@@ -544,7 +770,10 @@ def get_workout_sessions(
     if end_date:
         query = query.filter(WorkoutSession.date <= end_date)
     
-    return query.order_by(WorkoutSession.date.desc()).all()
+    workouts = query.options(*workout_load_options(selected, start_date, end_date)).order_by(WorkoutSession.date.desc()).all()
+    if fields or normalize:
+        return JSONResponse(serialize_workouts(workouts, selected, normalize))
+    return workouts
 
 
 @app.delete("/workouts/{workout_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -562,11 +791,45 @@ def delete_workout(
     if not workout:
         raise HTTPException(status_code=404, detail="Workout not found")
     
+    workout_date = workout.date
     db.delete(workout)
+    db.flush()
+    refresh_goals(db, current_user.id, "workouts", workout_date)
+    record_write(db, current_user.id, "workouts", workout_date, deleted=True)
     db.commit()
+    publish_dashboard_delta(current_user.id, "workout", workout_date, workouts=-1)
     return None
 
 
+@app.delete("/history", response_model=Dict[str, int])
+def delete_history_range(
+    start_date: date_type,
+    end_date: date_type,
+    kinds: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delete everything logged from start_date to end_date (inclusive) and
+    return the number of rows removed per kind. `kinds` limits it, e.g.
+    `?kinds=meals,water` (meals, workouts, water, body_metrics).
+    """
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    try:
+        selected = parse_kinds(kinds)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    counts = delete_history(db, current_user.id, start_date, end_date, selected)
+    for kind in selected:
+        refresh_goals(db, current_user.id, kind)
+    recompute_user(db, current_user.id)
+    db.commit()
+    publish_resync(current_user.id)
+    return counts
+
+
 # ==== WATER INTAKE ENDPOINTS ====
 @app.post("/water", response_model=WaterIntakeResponse, status_code=status.HTTP_201_CREATED)
 def log_water_intake(
@@ -577,8 +840,12 @@ def log_water_intake(
     """Log water intake."""
     db_water = WaterIntake(user_id=current_user.id, **water.dict())
     db.add(db_water)
+    db.flush()
+    refresh_goals(db, current_user.id, "water", db_water.date)
+    record_write(db, current_user.id, "water", db_water.date)
     db.commit()
     db.refresh(db_water)
+    publish_dashboard_delta(current_user.id, "water", db_water.date, water_ml=db_water.amount_ml)
     return db_water
 
 
@@ -607,12 +874,17 @@ def create_goal(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Create a fitness goal."""
+    """
+    Create a fitness goal. Tracked types (weight_target, weekly_workouts,
+    daily_protein, water_streak) compute their progress from logged data.
+    """
     db_goal = Goal(user_id=current_user.id, **goal.dict())
     db.add(db_goal)
+    db.flush()
+    start_goal(db, db_goal)
     db.commit()
     db.refresh(db_goal)
-    return db_goal
+    return goal_response(db_goal)
 
 
 @app.get("/goals", response_model=List[GoalResponse])
@@ -625,9 +897,9 @@ def get_goals(
     query = db.query(Goal).filter(Goal.user_id == current_user.id)
     
     if active_only:
-        query = query.filter(Goal.is_achieved == False)
+        query = query.filter(Goal.status == GoalStatus.ACTIVE)
     
-    return query.order_by(Goal.created_at.desc()).all()
+    return [goal_response(goal) for goal in query.order_by(Goal.created_at.desc()).all()]
 
 
 # ==== DASHBOARD SUMMARY ENDPOINT ====
@@ -637,54 +909,70 @@ def get_dashboard_summary(
     db: Session = Depends(get_db)
 ):
     """Get dashboard summary with today's stats."""
-    today = date_type.today()
-    week_ago = today - timedelta(days=7)
-    
-    # Get today's meals
-    today_meals = db.query(MealLog).filter(
-        MealLog.user_id == current_user.id,
-        MealLog.date == today
-    ).all()
-    
-    # Calculate nutrition totals
-    total_calories = 0
-    total_protein = 0.0
-    total_carbs = 0.0
-    total_fats = 0.0
-    
-    for meal in today_meals:
-        for meal_food in meal.foods:
-            food = meal_food.food
-            servings = meal_food.servings
-            total_calories += food.calories * servings
-            total_protein += food.protein_g * servings
-            total_carbs += food.carbs_g * servings
-            total_fats += food.fats_g * servings
-    
-    # Get today's water intake
-    water_today = db.query(WaterIntake).filter(
-        WaterIntake.user_id == current_user.id,
-        WaterIntake.date == today
-    ).all()
-    total_water = sum(w.amount_ml for w in water_today)
-    
-    # Get this week's workouts
-    workouts_this_week = db.query(WorkoutSession).filter(
-        WorkoutSession.user_id == current_user.id,
-        WorkoutSession.date >= week_ago
-    ).count()
-    
-    # Get current profile data
-    profile = db.query(UserProfile).filter(UserProfile.user_id == current_user.id).first()
-    
-    return {
-        "total_calories_today": int(total_calories),
-        "total_protein_today": round(total_protein, 1),
-        "total_carbs_today": round(total_carbs, 1),
-        "total_fats_today": round(total_fats, 1),
-        "total_water_today": total_water,
-        "workouts_this_week": workouts_this_week,
-        "current_weight": profile.current_weight_kg if profile else None,
-        "goal_weight": profile.goal_weight_kg if profile else None,
-        "calories_target": profile.daily_calorie_target if profile else None
-    }
+    return dashboard_summary(db, current_user.id)
+
+
+@app.get("/streaks", response_model=StreakSummary)
+def get_streaks(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Logging and workout streaks plus calorie-target adherence."""
+    return streak_summary(db, current_user.id)
+
+
+@app.get("/bootstrap", response_model=BootstrapResponse, response_model_exclude_unset=True)
+async def bootstrap(
+    fields: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    User, profile, dashboard totals, recent body metrics and active goals in
+    one request. `fields` picks sections, e.g. `?fields=user,dashboard`.
+    """
+    try:
+        sections = parse_sections(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return await load_bootstrap(db, current_user, sections)
+
+
+# ==== DELTA SYNC ENDPOINT ====
+@app.get("/sync", response_model=SyncResponse, response_model_exclude_unset=True)
+def sync_changes(
+    since: Optional[str] = None,
+    limit: int = SYNC_PAGE_SIZE,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Rows created, updated or deleted since the `since` token (everything when
+    omitted). Repeat with `next_token` while `has_more`, then store it for the
+    next sync.
+    """
+    if limit < 1 or limit > 5000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 5000")
+    try:
+        return collect_changes(db, current_user.id, since, limit)
+    except SyncTokenExpired as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.get("/events/dashboard")
+async def dashboard_events(request: Request, token: str, db: Session = Depends(get_db)):
+    """
+    Stream dashboard deltas as Server-Sent Events. EventSource can't send an
+    Authorization header, so the access token comes as a query parameter.
+    """
+    user = await get_current_user(token=token, db=db)
+    user_id = user.id
+    db.close()  # the stream may stay open for hours; don't pin a connection
+    
+    return StreamingResponse(
+        event_stream(request, user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,105 @@
+"""
+Meal Nutrition Snapshots
+Per-entry nutrition (the logged amount times the food's per-gram / per-ml
+vector, or food values x servings for count-only foods) is copied onto
+MealFood when a meal is logged and per-meal totals are cached on MealLog,
+so later edits to a food never rewrite history and aggregations are
+single-table SUMs.
+"""
+import logging
+from typing import Iterable
+
+from sqlalchemy import inspect, text
+
+from app.database import FoodDatabase, MealFood, MealLog
+from app.units import NUTRIENTS, nutrient_vector
+
+logger = logging.getLogger(__name__)
+
+# MealLog cached total column for each nutrient
+TOTAL_COLUMNS = {nutrient: f"total_{nutrient}" for nutrient in NUTRIENTS}
+
+
+def snapshot_nutrition(meal_food: MealFood, food: FoodDatabase):
+    """
+    Copy the food's nutrition for the logged quantity onto the meal entry.
+    An entry logged by amount (g or ml) gets its servings filled in and one
+    logged in servings gets its amount, when the food has a base unit.
+    Raises ValueError for an amount of a count-only food.
+    """
+    if meal_food.amount is not None:
+        if not food.base_amount:
+            raise ValueError(f"{food.name} is measured in '{food.serving_unit}'; log it in servings")
+        meal_food.servings = round(meal_food.amount / food.base_amount, 4)
+        values = [meal_food.amount * density for density in nutrient_vector(food)]
+    else:
+        servings = meal_food.servings if meal_food.servings is not None else 1.0
+        meal_food.amount = round(servings * food.base_amount, 2) if food.base_amount else None
+        values = [(getattr(food, nutrient) or 0) * servings for nutrient in NUTRIENTS]
+    for nutrient, value in zip(NUTRIENTS, values):
+        setattr(meal_food, nutrient, round(value, 2))
+
+
+def refresh_meal_totals(meal: MealLog, meal_foods: Iterable[MealFood]):
+    """Recompute the cached per-meal totals from its entries' snapshots."""
+    meal_foods = list(meal_foods)
+    for nutrient, column in TOTAL_COLUMNS.items():
+        total = sum(getattr(mf, nutrient) or 0 for mf in meal_foods)
+        setattr(meal, column, round(total, 2))
+
+
+def add_missing_columns(engine):
+    """Add the snapshot and total columns to existing tables (idempotent)."""
+    inspector = inspect(engine)
+    wanted = {
+        MealFood.__tablename__: NUTRIENTS,
+        MealLog.__tablename__: tuple(TOTAL_COLUMNS.values()),
+    }
+    with engine.begin() as conn:
+        for table, columns in wanted.items():
+            existing = {column["name"] for column in inspector.get_columns(table)}
+            for column in columns:
+                if column not in existing:
+                    logger.info(f"Adding column {table}.{column}")
+                    conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} FLOAT'))
+
+
+def _id_ranges(engine, table: str, batch_size: int):
+    with engine.connect() as conn:
+        low, high = conn.execute(text(f"SELECT MIN(id), MAX(id) FROM {table}")).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, batch_size):
+        yield start, start + batch_size - 1
+
+
+def backfill_nutrition(engine, batch_size: int = 10000, on_batch=None) -> dict:
+    """
+    Backfill snapshots for entries logged before they existed, then rebuild
+    meal totals. Works in id-range batches with one short transaction each.
+    """
+    snapshot_sql = text(
+        "UPDATE meal_foods SET "
+        + ", ".join(f"{n} = food_database.{n} * COALESCE(meal_foods.servings, 1)" for n in NUTRIENTS)
+        + ", amount = food_database.base_amount * COALESCE(meal_foods.servings, 1)"
+        + " FROM food_database WHERE food_database.id = meal_foods.food_id"
+        " AND meal_foods.id BETWEEN :low AND :high AND meal_foods.calories IS NULL"
+    )
+    totals_sql = text(
+        "UPDATE meal_logs SET "
+        + ", ".join(f"{column} = COALESCE(sums.{n}, 0)" for n, column in TOTAL_COLUMNS.items())
+        + " FROM (SELECT meal_logs.id AS meal_id, "
+        + ", ".join(f"SUM(meal_foods.{n}) AS {n}" for n in NUTRIENTS)
+        + " FROM meal_logs LEFT JOIN meal_foods ON meal_foods.meal_id = meal_logs.id"
+        " WHERE meal_logs.id BETWEEN :low AND :high GROUP BY meal_logs.id) AS sums"
+        " WHERE meal_logs.id = sums.meal_id"
+    )
+
+    counts = {"meal_foods": 0, "meal_logs": 0}
+    for table, statement in (("meal_foods", snapshot_sql), ("meal_logs", totals_sql)):
+        for low, high in _id_ranges(engine, table, batch_size):
+            with engine.begin() as conn:
+                counts[table] += conn.execute(statement, {"low": low, "high": high}).rowcount
+            if on_batch:
+                on_batch(table, high, counts[table])
+    return counts
@@ -0,0 +1,269 @@
+"""
+History Partitioning and Archival
+meal_foods, exercise_sets and water_intake are range-partitioned by month
+on their `date` column in PostgreSQL (migration 0006), with one partition
+per month named like `water_intake_y2026m10` plus a `<table>_default`
+catch-all. Queries that filter on `date` (GET /water, the dashboard, and
+GET /meals / GET /workouts with a date range, which repeat the range on
+their entries) only scan the matching months.
+
+Maintenance, run daily from cron:
+
+    python -m app.partitioning maintain          # create the next months' partitions
+    python -m app.partitioning archive           # archive months older than ARCHIVE_AFTER_MONTHS
+    python -m app.partitioning restore water_intake 2024-05
+
+Archiving a month writes each user's rows to history_archive as one
+zlib-compressed JSON blob, then detaches and drops the month's partition
+in the same transaction, which is instant and leaves no dead rows behind.
+Meals and workouts keep their cached totals, so old history still shows
+them; only the per-entry detail goes cold. On SQLite and unpartitioned
+databases the same job deletes the month's rows instead.
+"""
+import argparse
+import json
+import logging
+import os
+import zlib
+from datetime import date, datetime
+from itertools import groupby
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Column, DateTime, Date, delete, func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from app.database import (
+    ExerciseSet, HistoryArchive, MealFood, MealLog, SessionLocal, WaterIntake, WorkoutExercise,
+    WorkoutSession, engine as default_engine
+)
+
+logger = logging.getLogger(__name__)
+
+PARTITION_MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "12"))
+ARCHIVE_COMPRESSION_LEVEL = int(os.getenv("ARCHIVE_COMPRESSION_LEVEL", "9"))
+
+
+def _meal_food_rows(start: date, end: date) -> Select:
+    return select(MealFood.__table__, MealLog.user_id.label("owner_id")).join(
+        MealLog, MealLog.id == MealFood.meal_id
+    ).where(MealFood.date >= start, MealFood.date < end)
+
+
+def _exercise_set_rows(start: date, end: date) -> Select:
+    return select(ExerciseSet.__table__, WorkoutSession.user_id.label("owner_id")).join(
+        WorkoutExercise, WorkoutExercise.id == ExerciseSet.workout_exercise_id
+    ).join(WorkoutSession, WorkoutSession.id == WorkoutExercise.session_id).where(
+        ExerciseSet.date >= start, ExerciseSet.date < end
+    )
+
+
+def _water_rows(start: date, end: date) -> Select:
+    return select(WaterIntake.__table__, WaterIntake.user_id.label("owner_id")).where(
+        WaterIntake.date >= start, WaterIntake.date < end
+    )
+
+
+# Partitioned tables and how to read one month of rows with their owner
+PARTITIONED_TABLES: Dict[str, Callable[[date, date], Select]] = {
+    "meal_foods": _meal_food_rows,
+    "exercise_sets": _exercise_set_rows,
+    "water_intake": _water_rows,
+}
+_MODELS = {"meal_foods": MealFood, "exercise_sets": ExerciseSet, "water_intake": WaterIntake}
+# Entries whose meal / workout was deleted after archiving are not restored
+_PARENTS = {"meal_foods": (MealLog, "meal_id"), "exercise_sets": (WorkoutExercise, "workout_exercise_id")}
+
+
+def date_range(column: Column, start: Optional[date], end: Optional[date]) -> list:
+    """Inclusive date bounds as filter criteria (empty when unbounded)."""
+    criteria = []
+    if start:
+        criteria.append(column >= start)
+    if end:
+        criteria.append(column <= end)
+    return criteria
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_y{month.year}m{month.month:02d}"
+
+
+def is_partitioned(conn: Connection, table: str) -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return conn.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+        " WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {"table": table}).scalar()
+
+
+def ensure_partitions(conn: Connection, table: str, first: date, last: date) -> List[str]:
+    """Create the monthly partitions from `first` to `last` (inclusive) that don't exist yet."""
+    created = []
+    month = month_start(first)
+    while month <= last:
+        name = partition_name(table, month)
+        if not conn.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": name}).scalar():
+            conn.execute(text(
+                f"CREATE TABLE {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+            ))
+            created.append(name)
+        month = add_months(month, 1)
+    return created
+
+
+def maintain(bind: Engine = default_engine, today: Optional[date] = None) -> List[str]:
+    """
+    Keep PARTITION_MONTHS_AHEAD months of empty partitions ready. Rows for
+    a month without a partition land in the default partition, and a
+    partition can't be created over a range the default already holds, so
+    this has to run well ahead of the calendar.
+    """
+    current = month_start(today or date.today())
+    created = []
+    with bind.begin() as conn:
+        for table in PARTITIONED_TABLES:
+            if is_partitioned(conn, table):
+                created += ensure_partitions(conn, table, current, add_months(current, PARTITION_MONTHS_AHEAD))
+    return created
+
+
+def _encode(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Can't archive {type(value).__name__}")
+
+
+def _decode(table: str, row: dict) -> dict:
+    columns = _MODELS[table].__table__.c
+    for name, value in row.items():
+        if value is None:
+            continue
+        if isinstance(columns[name].type, DateTime):
+            row[name] = datetime.fromisoformat(value)
+        elif isinstance(columns[name].type, Date):
+            row[name] = date.fromisoformat(value)
+    return row
+
+
+def archive_month(db: Session, table: str, month: date) -> int:
+    """
+    Move one month of `table` into history_archive (one compressed blob per
+    user) and drop it from the live table. Commits; returns the row count.
+    """
+    start, end = month_start(month), add_months(month_start(month), 1)
+    result = db.execute(
+        PARTITIONED_TABLES[table](start, end).order_by(text("owner_id")),
+        execution_options={"yield_per": 5000}
+    ).mappings()
+
+    archived = 0
+    for user_id, rows in groupby(result, key=lambda row: row["owner_id"]):
+        rows = [{key: value for key, value in row.items() if key != "owner_id"} for row in rows]
+        payload = zlib.compress(json.dumps(rows, default=_encode).encode(), ARCHIVE_COMPRESSION_LEVEL)
+        db.add(HistoryArchive(table_name=table, month=start, user_id=user_id,
+                              row_count=len(rows), payload=payload))
+        archived += len(rows)
+    db.flush()
+
+    conn = db.connection()
+    partition = partition_name(table, start)
+    if is_partitioned(conn, table) and conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"), {"name": partition}
+    ).scalar():
+        conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition}"))
+        conn.execute(text(f"DROP TABLE {partition}"))
+    # Rows outside a monthly partition (default partition, unpartitioned tables)
+    model = _MODELS[table]
+    db.execute(delete(model).where(model.date >= start, model.date < end))
+    db.commit()
+    return archived
+
+
+def archive_old_months(db: Session, today: Optional[date] = None,
+                       after_months: int = ARCHIVE_AFTER_MONTHS) -> Dict[str, int]:
+    """Archive every month older than `after_months`; returns rows archived per table."""
+    cutoff = add_months(month_start(today or date.today()), -after_months)
+    counts = {}
+    for table, model in _MODELS.items():
+        counts[table] = 0
+        oldest = db.query(func.min(model.date)).scalar()
+        month = month_start(oldest) if oldest else cutoff
+        while month < cutoff:
+            rows = archive_month(db, table, month)
+            if rows:
+                logger.info(f"Archived {rows} {table} rows from {month:%Y-%m}")
+            counts[table] += rows
+            month = add_months(month, 1)
+    return counts
+
+
+def restore_month(db: Session, table: str, month: date) -> int:
+    """Put an archived month back into the live table. Commits; returns the row count."""
+    start = month_start(month)
+    archives = db.query(HistoryArchive).filter(
+        HistoryArchive.table_name == table,
+        HistoryArchive.month == start
+    ).all()
+    conn = db.connection()
+    if archives and is_partitioned(conn, table):
+        ensure_partitions(conn, table, start, start)
+
+    restored = 0
+    for archive in archives:
+        rows = [_decode(table, row) for row in json.loads(zlib.decompress(archive.payload))]
+        if table in _PARENTS:
+            parent, key = _PARENTS[table]
+            live = set(db.scalars(select(parent.id).where(parent.id.in_({row[key] for row in rows}))))
+            rows = [row for row in rows if row[key] in live]
+        if rows:
+            db.execute(insert(_MODELS[table].__table__), rows)
+        db.delete(archive)
+        restored += len(rows)
+    db.commit()
+    return restored
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain and archive partitioned history tables")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("maintain", help="Create upcoming monthly partitions")
+    archive = commands.add_parser("archive", help="Archive months older than ARCHIVE_AFTER_MONTHS")
+    archive.add_argument("--after-months", type=int, default=ARCHIVE_AFTER_MONTHS)
+    restore = commands.add_parser("restore", help="Restore one archived month")
+    restore.add_argument("table", choices=list(PARTITIONED_TABLES))
+    restore.add_argument("month", help="YYYY-MM")
+    args = parser.parse_args()
+
+    if args.command == "maintain":
+        created = maintain()
+        logger.info(f"Created {len(created)} partitions: {', '.join(created) or '-'}")
+        return
+
+    db = SessionLocal()
+    try:
+        if args.command == "archive":
+            logger.info(f"Archived rows: {archive_old_months(db, after_months=args.after_months)}")
+        else:
+            month = datetime.strptime(args.month, "%Y-%m").date()
+            logger.info(f"Restored {restore_month(db, args.table, month)} {args.table} rows from {args.month}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    main()
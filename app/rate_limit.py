@@ -0,0 +1,48 @@
+"""
+Rate Limiting
+Shared slowapi limiter. Counters live in the storage named by
+RATE_LIMIT_STORAGE_URI (e.g. redis://redis:6379/0) so every uvicorn worker
+enforces the same limits and restarts don't reset them. The default
+"memory://" storage is process-local and meant for development and tests.
+"""
+import os
+
+from fastapi import Request
+from jose import JWTError, jwt
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from app.auth import SECRET_KEY, ALGORITHM
+
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+# sliding-window-counter keeps two counters per key (O(1) memory) while
+# smoothing the burst a fixed window allows at window boundaries
+RATE_LIMIT_STRATEGY = os.getenv("RATE_LIMIT_STRATEGY", "sliding-window-counter")
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+
+# Limits for the expensive OpenAI-backed endpoints, applied per user
+AI_RATE_LIMIT = os.getenv("AI_RATE_LIMIT", "20/minute")
+
+
+def user_or_ip_key(request: Request) -> str:
+    """Key requests by authenticated username, falling back to client IP."""
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        try:
+            username = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+        except JWTError:
+            username = None
+        if username:
+            return f"user:{username}"
+    return get_remote_address(request)
+
+
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=RATE_LIMIT_STORAGE_URI,
+    strategy=RATE_LIMIT_STRATEGY,
+    key_prefix="fittrack",
+    enabled=RATE_LIMIT_ENABLED,
+    # Keep enforcing limits per worker if the shared storage is unreachable
+    in_memory_fallback_enabled=RATE_LIMIT_STORAGE_URI != "memory://",
+)
@@ -0,0 +1,71 @@
+"""
+Schema Version Check
+Migrations run separately (`python migrate.py`); app workers only confirm
+the database is at the revision this code expects, with a single query
+against alembic_version. No reflection or DDL happens at boot.
+"""
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# "error" refuses to start on a mismatch, "warn" logs it, "off" skips the check
+SCHEMA_CHECK = os.getenv("SCHEMA_CHECK", "error").lower()
+
+VERSIONS_DIR = Path(__file__).resolve().parent.parent / "migrations" / "versions"
+
+_REVISION = re.compile(r"^revision = ['\"](\w+)['\"]", re.MULTILINE)
+_DOWN_REVISION = re.compile(r"^down_revision = (?:['\"](\w+)['\"]|None)", re.MULTILINE)
+
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is not at the revision this code expects."""
+
+
+def head_revision(versions_dir: Path = VERSIONS_DIR) -> Optional[str]:
+    """
+    Head of the (linear) migration history, read from the version files
+    with a regex instead of importing alembic and every migration module.
+    """
+    parents = {}
+    for path in versions_dir.glob("*.py"):
+        source = path.read_text()
+        revision = _REVISION.search(source)
+        down = _DOWN_REVISION.search(source)
+        if revision and down:
+            parents[revision.group(1)] = down.group(1)
+    heads = set(parents) - set(parents.values())
+    if len(heads) > 1:
+        raise SchemaVersionError(f"Multiple migration heads: {sorted(heads)}")
+    return heads.pop() if heads else None
+
+
+def current_revision(engine) -> Optional[str]:
+    """The revision stamped in the database, or None if it was never migrated."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except Exception:
+        return None
+
+
+def check_schema_revision(engine, mode: str = SCHEMA_CHECK):
+    """Compare the database revision with the code's head revision."""
+    if mode == "off":
+        return
+    expected = head_revision()
+    actual = current_revision(engine)
+    if actual == expected:
+        logger.info(f"Database schema at revision {actual}")
+        return
+
+    message = f"Database schema is at revision {actual}, expected {expected}. Run `python migrate.py`."
+    if mode == "warn":
+        logger.warning(message)
+        return
+    raise SchemaVersionError(message)
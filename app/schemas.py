@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime, date
 from enum import Enum
 
@@ -142,15 +142,31 @@ class FoodDatabaseResponse(BaseModel):
     fats_g: float
     fiber_g: float
     is_custom: bool
+    # Serving size in grams or ml; null when the serving is a count ("large egg")
+    base_unit: Optional[str] = None
+    base_amount: Optional[float] = None
     
     class Config:
         from_attributes = True
 
 
+class FoodImportStatus(BaseModel):
+    import_id: str
+    status: str
+    rows_read: int
+    rows_imported: int
+    rows_rejected: int
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
 # Meal Schemas
 class MealFoodItem(BaseModel):
     food_id: int
     servings: float = Field(1.0, gt=0)
+    # Quantity in the food's base unit (g or ml); used instead of servings
+    amount: Optional[float] = Field(None, gt=0)
 
 
 class MealLogCreate(BaseModel):
@@ -164,6 +180,12 @@ class MealFoodResponse(BaseModel):
     id: int
     food_id: int
     servings: float
+    amount: Optional[float] = None
+    calories: Optional[float] = None
+    protein_g: Optional[float] = None
+    carbs_g: Optional[float] = None
+    fats_g: Optional[float] = None
+    fiber_g: Optional[float] = None
     food: FoodDatabaseResponse
     
     class Config:
@@ -177,6 +199,11 @@ class MealLogResponse(BaseModel):
     meal_type: MealType
     notes: Optional[str]
     created_at: datetime
+    total_calories: Optional[float] = 0
+    total_protein_g: Optional[float] = 0
+    total_carbs_g: Optional[float] = 0
+    total_fats_g: Optional[float] = 0
+    total_fiber_g: Optional[float] = 0
     foods: List[MealFoodResponse]
     
     class Config:
@@ -292,6 +319,8 @@ class GoalCreate(BaseModel):
     current_value: float = 0
     start_date: date
     target_date: Optional[date] = None
+    # Per-day amount for streak goals, e.g. ml of water for water_streak
+    threshold_value: Optional[float] = Field(None, gt=0)
 
 
 class GoalResponse(BaseModel):
@@ -304,18 +333,46 @@ class GoalResponse(BaseModel):
     target_date: Optional[date]
     status: str
     created_at: datetime
+    baseline_value: Optional[float] = None
+    threshold_value: Optional[float] = None
+    achieved_at: Optional[datetime] = None
+    is_achieved: bool = False
+    is_tracked: bool = False
     
     class Config:
         from_attributes = True
 
 
+# Delta Sync Schemas
+class SyncChanges(BaseModel):
+    profile: Optional[List[UserProfileResponse]] = None
+    meals: Optional[List[MealLogResponse]] = None
+    workouts: Optional[List[WorkoutSessionResponse]] = None
+    body_metrics: Optional[List[BodyMetricResponse]] = None
+    water: Optional[List[WaterIntakeResponse]] = None
+    goals: Optional[List[GoalResponse]] = None
+
+
+class SyncResponse(BaseModel):
+    changes: SyncChanges
+    deleted: Dict[str, List[int]] = {}
+    next_token: str
+    has_more: bool
+
+
 # AI Parsing Schemas
 class AIParseFoodRequest(BaseModel):
     text: str = Field(..., min_length=1, max_length=1000)
 
 
+class AIParsedFood(FoodDatabaseCreate):
+    # The parsed serving in grams or ml, so it can be matched and logged by amount
+    base_unit: Optional[str] = None
+    base_amount: Optional[float] = None
+
+
 class AIParseFoodResponse(BaseModel):
-    food_items: List[FoodDatabaseCreate]
+    food_items: List[AIParsedFood]
 
 
 class AIParseWorkoutRequest(BaseModel):
@@ -337,3 +394,31 @@ class DashboardSummary(BaseModel):
     current_weight: Optional[float]
     goal_weight: Optional[float]
     calories_target: Optional[int]
+
+
+class Streak(BaseModel):
+    current: int
+    longest: int
+    last_date: Optional[date]
+
+
+class Adherence(BaseModel):
+    window_days: int
+    calorie_target: Optional[int]
+    logged_days: int
+    adherent_days: int
+    percent: Optional[float]
+
+
+class StreakSummary(BaseModel):
+    logging: Streak
+    workouts: Streak
+    adherence: Adherence
+
+
+class BootstrapResponse(BaseModel):
+    user: Optional[UserResponse] = None
+    profile: Optional[UserProfileResponse] = None
+    dashboard: Optional[DashboardSummary] = None
+    body_metrics: Optional[List[BodyMetricResponse]] = None
+    goals: Optional[List[GoalResponse]] = None
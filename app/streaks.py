@@ -0,0 +1,271 @@
+"""
+Streaks and Adherence
+Keeps a running user_streaks row per user so GET /streaks never scans
+history:
+
+    logging streak   consecutive days with any meal, workout or water logged
+    workout streak   consecutive days with a workout session
+    adherence        share of logged days in the last ADHERENCE_WINDOW_DAYS
+                     whose calories were within ADHERENCE_TOLERANCE of the
+                     profile's daily_calorie_target
+
+Each write calls record_write(), which updates the row in O(1): a streak
+grows when the logged day follows its last active day, and adherence is
+kept as two day bitmasks (logged / on target) that shift as days pass.
+Backdated writes and deletes that empty a day can't be applied
+incrementally, so they recompute that one user. Rebuild everyone with:
+
+    python -m app.streaks
+"""
+import argparse
+import logging
+import os
+from datetime import date, timedelta
+from itertools import groupby
+from typing import Iterable, List, Optional
+
+from sqlalchemy import func, union
+from sqlalchemy.orm import Session
+
+from app.database import MealLog, SessionLocal, User, UserProfile, UserStreak, WaterIntake, WorkoutSession
+
+logger = logging.getLogger(__name__)
+
+ADHERENCE_WINDOW_DAYS = min(int(os.getenv("ADHERENCE_WINDOW_DAYS", "30")), 31)
+ADHERENCE_TOLERANCE = float(os.getenv("ADHERENCE_TOLERANCE", "0.10"))
+
+_WINDOW_MASK = (1 << ADHERENCE_WINDOW_DAYS) - 1
+_SOURCES = {"meals": MealLog, "workouts": WorkoutSession, "water": WaterIntake}
+
+
+def _empty_state(user_id: int) -> UserStreak:
+    return UserStreak(user_id=user_id, logging_current=0, logging_longest=0,
+                      workout_current=0, workout_longest=0, logged_mask=0, adherent_mask=0)
+
+
+def _get_state(db: Session, user_id: int) -> UserStreak:
+    state = db.get(UserStreak, user_id)
+    if state is None:
+        state = _empty_state(user_id)
+        db.add(state)
+    return state
+
+
+def _extend(current: int, longest: int, last: Optional[date], day: date):
+    """Apply activity on `day` to a streak; returns (current, longest, last)."""
+    if last is not None and day <= last:
+        return current, longest, last
+    current = current + 1 if last == day - timedelta(days=1) else 1
+    return current, max(longest, current), day
+
+
+def _shifted(mask: int, days: int) -> int:
+    """Age a day bitmask by `days`; bits falling out of the window are dropped."""
+    return (mask << days) & _WINDOW_MASK if days < ADHERENCE_WINDOW_DAYS else 0
+
+
+def _shift_window(state: UserStreak, day: date):
+    """Move the bitmasks so bit 0 is `day` (bit i is `day - i`)."""
+    if state.window_end is None or day > state.window_end:
+        gap = (day - state.window_end).days if state.window_end else ADHERENCE_WINDOW_DAYS
+        state.logged_mask = _shifted(state.logged_mask, gap)
+        state.adherent_mask = _shifted(state.adherent_mask, gap)
+        state.window_end = day
+
+
+def _day_calories(db: Session, user_id: int, day: date) -> Optional[float]:
+    """Calories logged on one day, or None when no meal was logged."""
+    count, total = db.query(func.count(MealLog.id), func.coalesce(func.sum(MealLog.total_calories), 0)).filter(
+        MealLog.user_id == user_id,
+        MealLog.date == day
+    ).one()
+    return float(total) if count else None
+
+
+def _is_adherent(calories: float, target: Optional[int]) -> bool:
+    return bool(target) and abs(calories - target) <= target * ADHERENCE_TOLERANCE
+
+
+def _update_adherence(db: Session, state: UserStreak, day: date):
+    """Set one day's bits from that day's meal total (one bounded aggregate)."""
+    _shift_window(state, day)
+    offset = (state.window_end - day).days
+    if offset >= ADHERENCE_WINDOW_DAYS:
+        return
+    bit = 1 << offset
+    calories = _day_calories(db, state.user_id, day)
+    target = db.query(UserProfile.daily_calorie_target).filter(UserProfile.user_id == state.user_id).scalar()
+    state.logged_mask = state.logged_mask | bit if calories is not None else state.logged_mask & ~bit
+    adherent = calories is not None and _is_adherent(calories, target)
+    state.adherent_mask = state.adherent_mask | bit if adherent else state.adherent_mask & ~bit
+
+
+def _has_activity(db: Session, user_id: int, day: date, models: Iterable) -> bool:
+    return any(
+        db.query(model.id).filter(model.user_id == user_id, model.date == day).first() is not None
+        for model in models
+    )
+
+
+def record_write(db: Session, user_id: int, source: str, day: date, deleted: bool = False):
+    """Update the user's streak state after a meal, workout or water write (call after flush)."""
+    state = _get_state(db, user_id)
+
+    backdated = state.logging_last is not None and day < state.logging_last
+    emptied = deleted and not _has_activity(db, user_id, day, _SOURCES.values())
+    workout_emptied = deleted and source == "workouts" and not _has_activity(db, user_id, day, [WorkoutSession])
+    if backdated or emptied or workout_emptied:
+        recompute_user(db, user_id)
+        return
+
+    if not deleted:
+        state.logging_current, state.logging_longest, state.logging_last = _extend(
+            state.logging_current, state.logging_longest, state.logging_last, day)
+        if source == "workouts":
+            state.workout_current, state.workout_longest, state.workout_last = _extend(
+                state.workout_current, state.workout_longest, state.workout_last, day)
+    if source == "meals":
+        _update_adherence(db, state, day)
+
+
+def _streaks(days: Iterable[date]):
+    """(current, longest, last) over ascending distinct days."""
+    current, longest, last = 0, 0, None
+    for day in days:
+        current, longest, last = _extend(current, longest, last, day)
+    return current, longest, last
+
+
+def _activity_days(db: Session, models, user_id: Optional[int] = None):
+    """Distinct (user_id, date) pairs across the models, ordered for streaming."""
+    selects = []
+    for model in models:
+        query = db.query(model.user_id.label("user_id"), model.date.label("date"))
+        if user_id is not None:
+            query = query.filter(model.user_id == user_id)
+        selects.append(query.statement)
+    rows = union(*selects).subquery()
+    return db.query(rows.c.user_id, rows.c.date).order_by(rows.c.user_id, rows.c.date).yield_per(5000)
+
+
+def _rebuild_adherence(db: Session, state: UserStreak, today: date):
+    state.window_end, state.logged_mask, state.adherent_mask = today, 0, 0
+    start = today - timedelta(days=ADHERENCE_WINDOW_DAYS - 1)
+    target = db.query(UserProfile.daily_calorie_target).filter(UserProfile.user_id == state.user_id).scalar()
+    totals = db.query(MealLog.date, func.sum(MealLog.total_calories)).filter(
+        MealLog.user_id == state.user_id,
+        MealLog.date >= start,
+        MealLog.date <= today
+    ).group_by(MealLog.date)
+    for day, calories in totals:
+        bit = 1 << (today - day).days
+        state.logged_mask |= bit
+        if _is_adherent(float(calories or 0), target):
+            state.adherent_mask |= bit
+
+
+def calorie_target_changed(db: Session, user_id: int, today: Optional[date] = None) -> UserStreak:
+    """Re-check the adherence window against a new daily_calorie_target (flush it first)."""
+    state = _get_state(db, user_id)
+    _rebuild_adherence(db, state, today or date.today())
+    return state
+
+
+def recompute_user(db: Session, user_id: int, today: Optional[date] = None) -> UserStreak:
+    """Rebuild one user's state from their full history."""
+    today = today or date.today()
+    state = _get_state(db, user_id)
+    logged = [day for _, day in _activity_days(db, _SOURCES.values(), user_id)]
+    workouts = [day for _, day in _activity_days(db, [WorkoutSession], user_id)]
+    state.logging_current, state.logging_longest, state.logging_last = _streaks(logged)
+    state.workout_current, state.workout_longest, state.workout_last = _streaks(workouts)
+    _rebuild_adherence(db, state, today)
+    return state
+
+
+def recompute_all(db: Session, batch_size: int = 1000, today: Optional[date] = None) -> int:
+    """
+    One-time (or repair) rebuild for every user. Streams distinct activity
+    days for all users in one ordered query per streak type and commits in
+    batches; returns the number of users processed.
+    """
+    today = today or date.today()
+    logging_streaks = {
+        user_id: _streaks(day for _, day in rows)
+        for user_id, rows in groupby(_activity_days(db, _SOURCES.values()), key=lambda row: row[0])
+    }
+    workout_streaks = {
+        user_id: _streaks(day for _, day in rows)
+        for user_id, rows in groupby(_activity_days(db, [WorkoutSession]), key=lambda row: row[0])
+    }
+
+    user_ids: List[int] = [user_id for (user_id,) in db.query(User.id).order_by(User.id)]
+    for index, user_id in enumerate(user_ids, 1):
+        state = _get_state(db, user_id)
+        state.logging_current, state.logging_longest, state.logging_last = logging_streaks.get(user_id, (0, 0, None))
+        state.workout_current, state.workout_longest, state.workout_last = workout_streaks.get(user_id, (0, 0, None))
+        _rebuild_adherence(db, state, today)
+        if index % batch_size == 0:
+            db.commit()
+            logger.info(f"Recomputed streaks for {index}/{len(user_ids)} users")
+    db.commit()
+    return len(user_ids)
+
+
+def _alive(current: int, last: Optional[date], today: date) -> int:
+    """A streak is still current if its last day is today or yesterday."""
+    return current if last is not None and last >= today - timedelta(days=1) else 0
+
+
+def streak_summary(db: Session, user_id: int, today: Optional[date] = None) -> dict:
+    """Read-only view of the state as of today."""
+    today = today or date.today()
+    target = db.query(UserProfile.daily_calorie_target).filter(UserProfile.user_id == user_id).scalar()
+    state = db.get(UserStreak, user_id) or _empty_state(user_id)
+
+    gap = max((today - state.window_end).days, 0) if state.window_end else 0
+    logged_mask, adherent_mask = _shifted(state.logged_mask, gap), _shifted(state.adherent_mask, gap)
+    logged_days, adherent_days = bin(logged_mask).count("1"), bin(adherent_mask).count("1")
+
+    return {
+        "logging": {
+            "current": _alive(state.logging_current, state.logging_last, today),
+            "longest": state.logging_longest,
+            "last_date": state.logging_last,
+        },
+        "workouts": {
+            "current": _alive(state.workout_current, state.workout_last, today),
+            "longest": state.workout_longest,
+            "last_date": state.workout_last,
+        },
+        "adherence": {
+            "window_days": ADHERENCE_WINDOW_DAYS,
+            "calorie_target": target,
+            "logged_days": logged_days,
+            "adherent_days": adherent_days,
+            "percent": round(100 * adherent_days / logged_days, 1) if target and logged_days else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild streak and adherence state")
+    parser.add_argument("--user-id", type=int, help="Only this user")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Users per commit")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.user_id:
+            recompute_user(db, args.user_id)
+            db.commit()
+            logger.info(f"Recomputed streaks for user {args.user_id}")
+        else:
+            logger.info(f"Recomputed streaks for {recompute_all(db, args.batch_size)} users")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    main()
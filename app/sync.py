@@ -0,0 +1,177 @@
+"""
+Delta Sync
+GET /sync?since=<token> returns only the user's rows created, updated or
+deleted since the token was issued, for every synced entity in one
+response. Each entity is scanned in (updated_at, id) order on its
+(user_id, updated_at, id) index; deletes are read from sync_tombstones,
+which a session after_flush hook fills in whenever a synced row is deleted
+through the ORM (bulk query deletes must write their own tombstones).
+
+A sync round is pinned to the time of its first page (`until`) and pages
+forward per entity with a keyset cursor until every entity is drained.
+The next round starts SYNC_OVERLAP_SECONDS before `until` so rows from
+transactions that committed late are not missed; clients upsert by id, so
+re-sent rows are harmless.
+
+Prune old tombstones with:
+    python -m app.sync
+"""
+import base64
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Integer, event, literal, tuple_
+from sqlalchemy.orm import Session, selectinload
+
+from app.database import (
+    BodyMetric, Goal, MealFood, MealLog, SessionLocal, SyncTombstone, UserProfile,
+    WaterIntake, WorkoutExercise, WorkoutSession,
+)
+
+logger = logging.getLogger(__name__)
+
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "500"))
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "30"))
+# Tokens older than this need a full resync, since their tombstones may be gone
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "90"))
+
+
+class SyncEntity(NamedTuple):
+    name: str
+    model: type
+    options: tuple = ()
+
+
+SYNC_ENTITIES = [
+    SyncEntity("profile", UserProfile),
+    SyncEntity("meals", MealLog, (selectinload(MealLog.foods).selectinload(MealFood.food),)),
+    SyncEntity("workouts", WorkoutSession, (
+        selectinload(WorkoutSession.exercises).selectinload(WorkoutExercise.exercise),
+        selectinload(WorkoutSession.exercises).selectinload(WorkoutExercise.sets),
+    )),
+    SyncEntity("body_metrics", BodyMetric),
+    SyncEntity("water", WaterIntake),
+    SyncEntity("goals", Goal),
+]
+ENTITY_NAMES = {entity.model: entity.name for entity in SYNC_ENTITIES}
+TOMBSTONES = "deleted"
+
+
+class SyncTokenExpired(ValueError):
+    """The token predates the tombstone retention window; the client must resync."""
+
+
+@event.listens_for(Session, "after_flush")
+def _record_tombstones(session, flush_context):
+    """Write a tombstone for each deleted synced row, in the same transaction."""
+    rows = [
+        {"user_id": obj.user_id, "entity": ENTITY_NAMES[type(obj)], "entity_id": obj.id,
+         "deleted_at": datetime.utcnow()}
+        for obj in session.deleted if type(obj) in ENTITY_NAMES
+    ]
+    if rows:
+        session.connection().execute(SyncTombstone.__table__.insert(), rows)
+
+
+def encode_token(until: Optional[datetime], cursors: Dict[str, Tuple[datetime, int]]) -> str:
+    payload = {
+        "u": until.isoformat() if until else None,
+        "c": {name: [ts.isoformat(), id_] for name, (ts, id_) in cursors.items()},
+    }
+    raw = json.dumps(payload, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_token(token: str) -> Tuple[Optional[datetime], Dict[str, Tuple[datetime, int]]]:
+    """Return (until, cursors) from a token; raises ValueError if malformed."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        until = datetime.fromisoformat(payload["u"]) if payload["u"] else None
+        cursors = {name: (datetime.fromisoformat(ts), int(id_)) for name, (ts, id_) in payload["c"].items()}
+    except Exception:
+        raise ValueError("Invalid sync token")
+    return until, cursors
+
+
+def _page(db: Session, model, column, user_id: int, cursor, until: datetime, limit: int, options=()):
+    return (
+        db.query(model)
+        .options(*options)
+        .filter(
+            model.user_id == user_id,
+            tuple_(column, model.id) > tuple_(literal(cursor[0], column.type), literal(cursor[1], Integer)),
+            column <= until,
+        )
+        .order_by(column, model.id)
+        .limit(limit)
+        .all()
+    )
+
+
+def collect_changes(db: Session, user_id: int, token: Optional[str] = None,
+                    limit: int = SYNC_PAGE_SIZE) -> dict:
+    """
+    One page of changes for the user. Returns {"changes": {entity: [rows]},
+    "deleted": {entity: [ids]}, "next_token": str, "has_more": bool}; keep
+    calling with next_token while has_more is true.
+    """
+    if token:
+        until, cursors = decode_token(token)
+        tombstones_from = cursors.get(TOMBSTONES, (datetime.min, 0))[0]
+        if tombstones_from < datetime.utcnow() - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise SyncTokenExpired("Sync token expired; drop local data and sync without a token")
+        until = until or datetime.utcnow()
+    else:
+        # Full sync: every row, and no tombstones since the client has nothing to delete
+        until = datetime.utcnow()
+        cursors = {TOMBSTONES: (until, 0)}
+
+    changes, deleted, has_more = {}, {}, False
+    next_cursors = {}
+    for entity in SYNC_ENTITIES:
+        cursor = cursors.get(entity.name, (datetime.min, 0))
+        rows = _page(db, entity.model, entity.model.updated_at, user_id, cursor, until, limit, entity.options)
+        if rows:
+            changes[entity.name] = rows
+            cursor = (rows[-1].updated_at, rows[-1].id)
+        has_more = has_more or len(rows) == limit
+        next_cursors[entity.name] = cursor
+
+    cursor = cursors[TOMBSTONES]
+    tombstones = _page(db, SyncTombstone, SyncTombstone.deleted_at, user_id, cursor, until, limit)
+    for tombstone in tombstones:
+        deleted.setdefault(tombstone.entity, []).append(tombstone.entity_id)
+    if tombstones:
+        cursor = (tombstones[-1].deleted_at, tombstones[-1].id)
+    has_more = has_more or len(tombstones) == limit
+    next_cursors[TOMBSTONES] = cursor
+
+    if has_more:
+        next_token = encode_token(until, next_cursors)
+    else:
+        # Round finished: next round starts just before this one's cut-off
+        restart = until - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+        next_token = encode_token(None, {name: (restart, 0) for name in next_cursors})
+
+    return {"changes": changes, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+
+
+def prune_tombstones(db: Session, retention_days: int = SYNC_TOMBSTONE_RETENTION_DAYS) -> int:
+    """Delete tombstones older than the retention window; returns the count."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    count = db.query(SyncTombstone).filter(SyncTombstone.deleted_at < cutoff).delete(synchronize_session=False)
+    db.commit()
+    return count
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    session = SessionLocal()
+    try:
+        logger.info(f"Pruned {prune_tombstones(session)} sync tombstones")
+    finally:
+        session.close()
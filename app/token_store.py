@@ -0,0 +1,222 @@
+"""
+Verification Token Store
+Single-use, expiring tokens for email verification. TOKEN_STORE selects the
+backend:
+    database - verification_tokens table, shared by every worker (default)
+    memory   - bounded per-process store for development and tests
+    signed   - stateless signed JWTs, nothing stored (not single-use)
+"""
+import hashlib
+import logging
+import os
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from jose import JWTError, jwt
+
+from app.auth import SECRET_KEY, ALGORITHM
+
+logger = logging.getLogger(__name__)
+
+TOKEN_STORE = os.getenv("TOKEN_STORE", "database")
+TOKEN_TTL_HOURS = float(os.getenv("TOKEN_TTL_HOURS", "24"))
+TOKEN_STORE_MAX_SIZE = int(os.getenv("TOKEN_STORE_MAX_SIZE", "100000"))
+TOKEN_SWEEP_SECONDS = float(os.getenv("TOKEN_SWEEP_SECONDS", "300"))
+
+
+class TokenStore(ABC):
+    """Issue tokens for a user id and consume them exactly once."""
+
+    def __init__(self, ttl: timedelta = timedelta(hours=TOKEN_TTL_HOURS)):
+        self.ttl = ttl
+
+    @abstractmethod
+    def issue(self, user_id: str) -> str:
+        """Create a token for the user id."""
+
+    @abstractmethod
+    def consume(self, token: str) -> Optional[str]:
+        """Return the token's user id, or None if it is unknown, used or expired."""
+
+    def sweep(self) -> int:
+        """Evict expired tokens. Returns how many were removed."""
+        return 0
+
+
+class MemoryTokenStore(TokenStore):
+    """
+    Dict-backed store. Every token has the same TTL, so insertion order is
+    expiry order and sweeping only pops from the front. Once full, the
+    oldest tokens are evicted first.
+    """
+
+    def __init__(self, ttl: timedelta = timedelta(hours=TOKEN_TTL_HOURS), max_size: int = TOKEN_STORE_MAX_SIZE):
+        super().__init__(ttl)
+        self.max_size = max_size
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def issue(self, user_id: str) -> str:
+        token = secrets.token_urlsafe(32)
+        with self._lock:
+            self._sweep_locked(datetime.utcnow())
+            self._tokens[token] = (user_id, datetime.utcnow() + self.ttl)
+            while len(self._tokens) > self.max_size:
+                self._tokens.popitem(last=False)
+        return token
+
+    def consume(self, token: str) -> Optional[str]:
+        with self._lock:
+            entry = self._tokens.pop(token, None)
+        if entry is None:
+            return None
+        user_id, expires_at = entry
+        if datetime.utcnow() > expires_at:
+            logger.warning("Verification token expired")
+            return None
+        return user_id
+
+    def sweep(self) -> int:
+        with self._lock:
+            return self._sweep_locked(datetime.utcnow())
+
+    def _sweep_locked(self, now: datetime) -> int:
+        removed = 0
+        while self._tokens:
+            token, (_, expires_at) = next(iter(self._tokens.items()))
+            if expires_at > now:
+                break
+            del self._tokens[token]
+            removed += 1
+        return removed
+
+
+class DatabaseTokenStore(TokenStore):
+    """
+    verification_tokens table keyed by the token's SHA-256 (primary key
+    lookups). Expired rows are swept every TOKEN_SWEEP_SECONDS while issuing.
+    """
+
+    def __init__(self, session_factory=None, ttl: timedelta = timedelta(hours=TOKEN_TTL_HOURS),
+                 sweep_seconds: float = TOKEN_SWEEP_SECONDS):
+        super().__init__(ttl)
+        if session_factory is None:
+            from app.database import SessionLocal
+            session_factory = SessionLocal
+        self.session_factory = session_factory
+        self.sweep_seconds = sweep_seconds
+        self._last_sweep = 0.0
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def issue(self, user_id: str) -> str:
+        from app.database import VerificationToken
+
+        if time.monotonic() - self._last_sweep >= self.sweep_seconds:
+            self.sweep()
+
+        token = secrets.token_urlsafe(32)
+        db = self.session_factory()
+        try:
+            db.add(VerificationToken(
+                token_hash=self._hash(token),
+                user_id=user_id,
+                expires_at=datetime.utcnow() + self.ttl
+            ))
+            db.commit()
+        finally:
+            db.close()
+        return token
+
+    def consume(self, token: str) -> Optional[str]:
+        from app.database import VerificationToken
+
+        token_hash = self._hash(token)
+        db = self.session_factory()
+        try:
+            row = db.get(VerificationToken, token_hash)
+            if row is None:
+                return None
+            user_id, expires_at = row.user_id, row.expires_at
+            # The delete decides who wins if two requests race for one token
+            deleted = db.query(VerificationToken).filter(
+                VerificationToken.token_hash == token_hash
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+        if not deleted:
+            return None
+        if datetime.utcnow() > expires_at:
+            logger.warning("Verification token expired")
+            return None
+        return user_id
+
+    def sweep(self) -> int:
+        from app.database import VerificationToken
+
+        self._last_sweep = time.monotonic()
+        db = self.session_factory()
+        try:
+            removed = db.query(VerificationToken).filter(
+                VerificationToken.expires_at <= datetime.utcnow()
+            ).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+        if removed:
+            logger.info(f"Swept {removed} expired verification tokens")
+        return removed
+
+
+class SignedTokenStore(TokenStore):
+    """
+    Stateless tokens signed with SECRET_KEY. Nothing is stored, so a token
+    stays valid until it expires; only use it where replays are harmless
+    (verifying an already verified email is a no-op).
+    """
+
+    PURPOSE = "email-verification"
+
+    def issue(self, user_id: str) -> str:
+        payload = {"sub": user_id, "purpose": self.PURPOSE, "exp": datetime.utcnow() + self.ttl}
+        return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
+
+    def consume(self, token: str) -> Optional[str]:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            return None
+        if payload.get("purpose") != self.PURPOSE:
+            return None
+        return payload.get("sub")
+
+
+_STORES = {
+    "database": DatabaseTokenStore,
+    "memory": MemoryTokenStore,
+    "signed": SignedTokenStore,
+}
+
+_store: Optional[TokenStore] = None
+
+
+def get_token_store() -> TokenStore:
+    """Return the process-wide store selected by TOKEN_STORE."""
+    global _store
+    if _store is None:
+        if TOKEN_STORE not in _STORES:
+            raise ValueError(f"Unknown TOKEN_STORE: {TOKEN_STORE}")
+        _store = _STORES[TOKEN_STORE]()
+    return _store
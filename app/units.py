@@ -0,0 +1,157 @@
+"""
+Serving Unit Normalization
+Food servings are free text ("grams cooked", "ml (1 cup)", "scoop (30g)",
+"large egg"). They are parsed once, when a food is written or imported,
+into the serving's size in a base unit (g or ml) and the food's nutrients
+per gram / ml, stored on food_database. Logging "150 g" of a food is then
+150 times that vector, and nothing re-reads the unit text per request.
+
+Servings that name no mass or volume ("large egg", "medium") have no base
+unit and are logged in servings only. Volumes stay volumes: there are no
+densities, so a food measured in ml is logged in ml.
+
+Foods written before a change to the tables below are refreshed with:
+
+    python -m app.units
+"""
+import argparse
+import logging
+import re
+from typing import Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import Table, bindparam, select, update
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Nutrient columns shared by FoodDatabase and the MealFood snapshot
+NUTRIENTS = ("calories", "protein_g", "carbs_g", "fats_g", "fiber_g")
+
+# FoodDatabase column holding each nutrient per 1 g / 1 ml of its base unit
+DENSITY_COLUMNS = {nutrient: f"{nutrient}_per_unit" for nutrient in NUTRIENTS}
+
+# Every column food_units() fills in
+UNIT_COLUMNS = ("base_unit", "base_amount", *DENSITY_COLUMNS.values())
+
+# Unit aliases -> (canonical unit, factor to convert the serving size)
+UNIT_ALIASES = {
+    "g": ("g", 1.0), "gr": ("g", 1.0), "gram": ("g", 1.0), "grams": ("g", 1.0),
+    "kg": ("g", 1000.0), "mg": ("g", 0.001),
+    "oz": ("g", 28.3495), "ounce": ("g", 28.3495), "ounces": ("g", 28.3495),
+    "lb": ("g", 453.592), "lbs": ("g", 453.592), "pound": ("g", 453.592),
+    "ml": ("ml", 1.0), "milliliter": ("ml", 1.0), "milliliters": ("ml", 1.0), "millilitre": ("ml", 1.0),
+    "l": ("ml", 1000.0), "liter": ("ml", 1000.0), "litre": ("ml", 1000.0), "liters": ("ml", 1000.0),
+    "fl oz": ("ml", 29.5735), "floz": ("ml", 29.5735),
+    "cup": ("cup", 1.0), "cups": ("cup", 1.0),
+    "tbsp": ("tbsp", 1.0), "tablespoon": ("tbsp", 1.0), "tablespoons": ("tbsp", 1.0),
+    "tsp": ("tsp", 1.0), "teaspoon": ("tsp", 1.0), "teaspoons": ("tsp", 1.0),
+    "slice": ("slice", 1.0), "slices": ("slice", 1.0),
+    "piece": ("piece", 1.0), "pieces": ("piece", 1.0),
+    "serving": ("serving", 1.0), "servings": ("serving", 1.0),
+}
+
+# Household measures in ml (US customary), used when nothing more exact is given
+HOUSEHOLD_ML = {"cup": 236.588, "tbsp": 14.787, "tsp": 4.929}
+
+_WHITESPACE = re.compile(r"\s+")
+_PARENTHESES = re.compile(r"\(([^)]*)\)")
+_QUANTITY = re.compile(r"^(\d+(?:\.\d+)?)\s*([a-z][a-z ]*)$")
+
+
+def clean_unit(unit: Optional[str]) -> str:
+    """Lower-case a unit and collapse its whitespace."""
+    return _WHITESPACE.sub(" ", (unit or "").strip().lower()).rstrip(".")
+
+
+def lookup_unit(unit: str) -> Optional[Tuple[str, float]]:
+    """(canonical unit, factor) for a cleaned unit, or for its first word."""
+    return UNIT_ALIASES.get(unit) or UNIT_ALIASES.get(unit.split(" ")[0] if unit else "")
+
+
+def _metric(unit: str) -> Optional[Tuple[str, float]]:
+    alias = lookup_unit(unit)
+    return alias if alias and alias[0] in ("g", "ml") else None
+
+
+def parse_serving(serving_size: Optional[float], serving_unit: Optional[str]) -> Optional[Tuple[str, float]]:
+    """
+    A serving as (base unit, amount), e.g. ("g", 30.0) for 1 "scoop (30g)".
+    A metric unit wins, then a metric quantity in parentheses (per unit),
+    then a household volume; None when the serving names no mass or volume
+    or rounds to nothing.
+    """
+    if not serving_size or serving_size <= 0:
+        return None
+    unit = clean_unit(serving_unit)
+    head = clean_unit(_PARENTHESES.sub(" ", unit))
+
+    per_unit = _metric(head)
+    if per_unit is None:
+        for inner in _PARENTHESES.findall(unit):
+            match = _QUANTITY.match(clean_unit(inner))
+            if match and _metric(match.group(2)):
+                base, factor = _metric(match.group(2))
+                per_unit = (base, float(match.group(1)) * factor)
+                break
+    if per_unit is None:
+        alias = lookup_unit(head)
+        if alias and alias[0] in HOUSEHOLD_ML:
+            per_unit = ("ml", alias[1] * HOUSEHOLD_ML[alias[0]])
+    if per_unit is None:
+        return None
+
+    base, factor = per_unit
+    amount = round(serving_size * factor, 3)
+    # Too small to store (e.g. "0.4 mg"): no usable base amount to divide by
+    return (base, amount) if amount > 0 else None
+
+
+def food_units(values: Mapping) -> Dict[str, Optional[float]]:
+    """The base unit, serving amount and per-unit nutrient columns for a food's values."""
+    parsed = parse_serving(values.get("serving_size"), values.get("serving_unit"))
+    if parsed is None:
+        return dict.fromkeys(UNIT_COLUMNS)
+    base_unit, base_amount = parsed
+    row = {"base_unit": base_unit, "base_amount": base_amount}
+    for nutrient, column in DENSITY_COLUMNS.items():
+        row[column] = (values.get(nutrient) or 0) / base_amount
+    return row
+
+
+def nutrient_vector(food) -> Tuple[float, ...]:
+    """A food's nutrients per 1 g / 1 ml, in NUTRIENTS order."""
+    return tuple(getattr(food, column) or 0 for column in DENSITY_COLUMNS.values())
+
+
+def normalize_foods(conn: Connection, table: Table, batch_size: int = 1000) -> int:
+    """Recompute the unit columns of every food, in id batches; returns the row count."""
+    source = [table.c.id, table.c.serving_size, table.c.serving_unit, *(table.c[n] for n in NUTRIENTS)]
+    statement = update(table).where(table.c.id == bindparam("food_id")).values(
+        {column: bindparam(column) for column in UNIT_COLUMNS}
+    )
+    last_id, updated = 0, 0
+    while True:
+        rows = conn.execute(
+            select(*source).where(table.c.id > last_id).order_by(table.c.id).limit(batch_size)
+        ).mappings().all()
+        if not rows:
+            return updated
+        conn.execute(statement, [{"food_id": row["id"], **food_units(row)} for row in rows])
+        last_id = rows[-1]["id"]
+        updated += len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute base units and nutrient densities of all foods")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    from app.database import FoodDatabase, engine
+    with engine.begin() as conn:
+        updated = normalize_foods(conn, FoodDatabase.__table__, args.batch_size)
+    logger.info(f"Normalized {updated} foods")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    main()
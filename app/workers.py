@@ -0,0 +1,21 @@
+"""
+Gunicorn Worker
+Uvicorn's gunicorn worker with the production event loop and HTTP parser
+pinned instead of auto-detected, so a missing uvloop/httptools wheel fails
+at boot rather than silently falling back to the slower pure-Python ones.
+"""
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        # Client addresses (rate limits, logs) come from the proxy's X-Forwarded-For;
+        # the default trusts any peer because only Caddy can reach the container
+        "proxy_headers": True,
+        "forwarded_allow_ips": os.getenv("FORWARDED_ALLOW_IPS", "*"),
+        "server_header": False,
+    }
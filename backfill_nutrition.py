@@ -0,0 +1,39 @@
+"""
+Nutrition snapshot migration.
+Adds the MealFood nutrition snapshot and MealLog total columns to an existing
+database, then backfills them in id-range batches (one short transaction per
+batch). Safe to re-run: only entries without a snapshot are updated.
+
+Usage:
+    python backfill_nutrition.py --batch-size 10000
+"""
+import argparse
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from app.database import engine
+from app.nutrition import add_missing_columns, backfill_nutrition
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backfill meal nutrition snapshots and totals.")
+    parser.add_argument("--batch-size", type=int, default=10000, help="ids per batch")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+
+    def report(table, last_id, updated):
+        print(f"  ... {table}: {updated:,} rows updated (through id {last_id:,})")
+
+    print("🧮 Adding nutrition snapshot columns...")
+    add_missing_columns(engine)
+    print("🧮 Backfilling nutrition snapshots...")
+    counts = backfill_nutrition(engine, batch_size=args.batch_size, on_batch=report)
+    print(f"✅ Backfill complete in {time.perf_counter() - started:.1f}s: "
+          f"{counts['meal_foods']:,} entries snapshotted, {counts['meal_logs']:,} meal totals rebuilt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold-start benchmark: time from a fresh interpreter to the first HTTP response.
+
+Each run starts a new Python process that imports app.main, runs the startup
+hooks and serves GET /health in-process, so the numbers exclude server and
+network overhead. The schema check is skipped unless --schema-check is given.
+
+Usage:
+    python benchmarks/bench_cold_start.py [--runs 10] [--path /health]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, time
+t0 = time.perf_counter()
+from app.main import app
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    t2 = time.perf_counter()
+    status = client.get({path!r}).status_code
+    t3 = time.perf_counter()
+print(json.dumps({{"import": t1 - t0, "startup": t2 - t1, "first_response": t3 - t2, "status": status}}))
+"""
+
+
+def run_once(path: str, env: dict) -> dict:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(path=path)],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"❌ Cold start failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["wall"] = wall
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app cold start")
+    parser.add_argument("--runs", type=int, default=10, help="Fresh processes to start")
+    parser.add_argument("--path", default="/health", help="Path of the first request")
+    parser.add_argument("--schema-check", action="store_true",
+                        help="Run the startup schema check (needs a reachable database)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("EMAIL_WORKER_ENABLED", "false")
+    if not args.schema_check:
+        env["SCHEMA_CHECK"] = "off"
+
+    print(f"🧊 Starting {args.runs} fresh processes, first request GET {args.path}")
+    runs = [run_once(args.path, env) for _ in range(args.runs)]
+    if any(r["status"] >= 500 for r in runs):
+        print(f"⚠️  First request returned {runs[0]['status']}")
+
+    for key, label in [("import", "import app.main"), ("startup", "startup hooks"),
+                       ("first_response", "first response"), ("wall", "process wall time")]:
+        values = sorted(r[key] * 1000 for r in runs)
+        print(f"  {label:18} median {statistics.median(values):8.1f} ms   "
+              f"min {values[0]:8.1f} ms   max {values[-1]:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark for email template rendering.
+
+Usage:
+    python benchmarks/bench_email_templates.py [--renders 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.email_templates import TEMPLATES, render_email
+
+
+def sample_values(name: str, i: int) -> dict:
+    if name == "weekly_summary":
+        return {
+            "username": f"user{i}", "meals": 21, "calories": 14350 + i % 500,
+            "workouts": i % 6, "water_liters": 14.5, "url": "http://localhost:8000/",
+        }
+    return {"username": f"user{i}", "url": f"http://localhost:8000/verify?token=tok{i}"}
+
+
+def bench(name: str, renders: int) -> float:
+    values = [sample_values(name, i) for i in range(1000)]
+    start = time.perf_counter()
+    for i in range(renders):
+        render_email(name, **values[i % 1000])
+    return renders / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email template rendering")
+    parser.add_argument("--renders", type=int, default=100000, help="Renders per template")
+    args = parser.parse_args()
+
+    print(f"📧 Rendering each template {args.renders:,} times (HTML + text parts)")
+    for name in TEMPLATES:
+        print(f"  {name:<16} {bench(name, args.renders):>12,.0f} renders/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Payload size and serialization time for meal history representations.
+
+Builds an in-memory history (no database) and serializes it the way
+GET /meals does: the full response models, `fields=`, and `normalize=true`.
+
+Usage:
+    python benchmarks/bench_fieldsets.py [--days 30] [--foods 50]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pydantic import TypeAdapter
+
+from app.database import FoodDatabase, MealFood, MealLog, MealType
+from app.fieldsets import MEAL_FIELDS, parse_fields, serialize_meals
+from app.schemas import MealLogResponse
+
+
+def build_history(days: int, food_count: int) -> List[MealLog]:
+    rng = random.Random(42)
+    foods = [
+        FoodDatabase(id=i, name=f"Food {i}", brand="Brand", serving_size=100, serving_unit="g",
+                     calories=rng.randint(50, 400), protein_g=5.0, carbs_g=20.0, fats_g=3.0,
+                     fiber_g=1.0, is_custom=False)
+        for i in range(1, food_count + 1)
+    ]
+    meals, entry_id = [], 0
+    for day in range(days):
+        for meal_type in MealType:
+            meal = MealLog(id=len(meals) + 1, user_id=1, date=date.today() - timedelta(days=day),
+                           meal_type=meal_type, notes=None, created_at=datetime.utcnow(),
+                           total_calories=0, total_protein_g=0, total_carbs_g=0, total_fats_g=0, total_fiber_g=0)
+            for _ in range(rng.randint(2, 5)):
+                entry_id += 1
+                food = rng.choice(foods)
+                meal.foods.append(MealFood(id=entry_id, food_id=food.id, food=food, servings=1.0,
+                                           calories=food.calories, protein_g=5.0, carbs_g=20.0,
+                                           fats_g=3.0, fiber_g=1.0))
+            meals.append(meal)
+    return meals
+
+
+def measure(label: str, serialize, repeats: int = 20):
+    body = serialize()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        serialize()
+    elapsed = (time.perf_counter() - start) / repeats
+    print(f"  {label:34} {len(body) / 1024:9.1f} KiB {elapsed * 1000:9.2f} ms")
+    return len(body), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark meal list representations")
+    parser.add_argument("--days", type=int, default=30, help="Days of history")
+    parser.add_argument("--foods", type=int, default=50, help="Distinct foods eaten")
+    args = parser.parse_args()
+
+    meals = build_history(args.days, args.foods)
+    adapter = TypeAdapter(List[MealLogResponse])
+    slim = parse_fields("date,meal_type,total_calories", MEAL_FIELDS)
+    print(f"🍽️  {len(meals)} meals, {sum(len(m.foods) for m in meals)} entries, {args.foods} foods")
+
+    full = measure("full (response models)", lambda: adapter.dump_json(adapter.validate_python(meals, from_attributes=True)))
+    measure("normalize=true", lambda: json.dumps(serialize_meals(meals, MEAL_FIELDS, normalize=True)).encode())
+    summary = measure("fields=date,meal_type,total_calories", lambda: json.dumps(serialize_meals(meals, slim)).encode())
+
+    print(f"\n📉 Summary rows: {full[0] / summary[0]:.0f}x smaller, {full[1] / summary[1]:.0f}x faster than full")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Container image benchmark: image size and time from `docker run` to the
+first successful GET /health.
+
+Builds the production target of the Dockerfile (unless --no-build) and
+measures each image given, so an older build can be compared side by side:
+
+    git show <old-commit>:Dockerfile > /tmp/Dockerfile.old
+    docker build -f /tmp/Dockerfile.old -t fittrack:old .
+    python benchmarks/bench_image.py --images fittrack:old
+
+Start time covers container creation, the interpreter and gunicorn booting
+and the app importing; the schema check is switched off so no database is
+needed. Pull time scales with the compressed size, which is reported too
+(from `docker save | gzip`, roughly what a registry transfers).
+
+Usage:
+    python benchmarks/bench_image.py [--runs 5] [--workers 2] [--images tag ...] [--no-build]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import time
+import zlib
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE = "fittrack:bench"
+
+
+def docker(*args: str, **kwargs) -> subprocess.CompletedProcess:
+    result = subprocess.run(["docker", *args], cwd=ROOT, capture_output=True, **kwargs)
+    if result.returncode != 0:
+        stderr = result.stderr if isinstance(result.stderr, str) else result.stderr.decode(errors="replace")
+        raise SystemExit(f"❌ docker {args[0]} failed:\n{stderr[-2000:]}")
+    return result
+
+
+def build(tag: str, target: str):
+    start = time.perf_counter()
+    docker("build", "--target", target, "-t", tag, ".", text=True)
+    print(f"🔨 Built {tag} (target {target}) in {time.perf_counter() - start:.0f}s")
+
+
+def image_size(tag: str) -> tuple:
+    """Uncompressed size and gzip-compressed size of the image, in MB."""
+    size = int(docker("image", "inspect", "--format", "{{.Size}}", tag, text=True).stdout.strip())
+    saved = subprocess.Popen(["docker", "save", tag], stdout=subprocess.PIPE)
+    compressor = zlib.compressobj(6)
+    compressed = 0
+    while chunk := saved.stdout.read(16 * 1024 * 1024):
+        compressed += len(compressor.compress(chunk))
+    compressed += len(compressor.flush())
+    saved.wait()
+    return size / 1e6, compressed / 1e6
+
+
+def start_once(tag: str, port: int, workers: int, timeout: float = 60) -> float:
+    """Seconds from `docker run` until /health answers 200."""
+    start = time.perf_counter()
+    container = docker(
+        "run", "-d", "--rm", "-p", f"127.0.0.1:{port}:8000",
+        "-e", "SCHEMA_CHECK=off", "-e", "EMAIL_WORKER_ENABLED=false",
+        "-e", f"WEB_CONCURRENCY={workers}", tag, text=True
+    ).stdout.strip()
+    try:
+        deadline = start + timeout
+        while time.perf_counter() < deadline:
+            try:
+                if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1).status_code == 200:
+                    return time.perf_counter() - start
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.05)
+        logs = subprocess.run(["docker", "logs", container], capture_output=True, text=True)
+        raise SystemExit(f"❌ {tag} did not become healthy:\n{(logs.stdout + logs.stderr)[-2000:]}")
+    finally:
+        subprocess.run(["docker", "rm", "-f", container], capture_output=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark container image size and start time")
+    parser.add_argument("--images", nargs="*", default=[], help="Other image tags to compare")
+    parser.add_argument("--target", default="production", help="Dockerfile target to build")
+    parser.add_argument("--no-build", action="store_true", help=f"Use the existing {IMAGE}")
+    parser.add_argument("--runs", type=int, default=5, help="Container starts per image")
+    parser.add_argument("--workers", type=int, default=2, help="WEB_CONCURRENCY inside the container")
+    parser.add_argument("--port", type=int, default=8200)
+    args = parser.parse_args()
+
+    if not args.no_build:
+        build(IMAGE, args.target)
+
+    print(f"🐳 {args.runs} starts per image, {args.workers} workers, until GET /health is 200")
+    print(f"  {'image':24} {'size MB':>9} {'gzip MB':>9} {'start p50 s':>12} {'min s':>7} {'max s':>7}")
+    for tag in [IMAGE, *args.images]:
+        size, compressed = image_size(tag)
+        starts = sorted(start_once(tag, args.port, args.workers) for _ in range(args.runs))
+        print(f"  {tag:24} {size:9.0f} {compressed:9.0f} {statistics.median(starts):12.2f} "
+              f"{starts[0]:7.2f} {starts[-1]:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Throughput scaling of the production server profile with worker count.
+
+For each worker count, starts `gunicorn app.main:app` (gunicorn.conf.py,
+WEB_CONCURRENCY=N), logs in as a synthetic user and drives GET /dashboard
+and GET /foods?search=... with a fixed number of concurrent keep-alive
+connections, then reports requests/s, latency percentiles and the speedup
+over one worker. Needs a migrated PostgreSQL database with data from
+generate_data.py (DATABASE_URL), plus gunicorn and uvicorn[standard].
+
+The load generator shares the machine, so pin the server and the client
+to separate cores for clean numbers, e.g. on an 8-core host:
+
+    taskset -c 0-5 python benchmarks/bench_server.py --workers 1,2,4,6 --client-cpus 6,7
+
+Usage:
+    python benchmarks/bench_server.py [--workers 1,2,4] [--duration 15] [--concurrency 64]
+"""
+import argparse
+import asyncio
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENDPOINTS = {
+    "dashboard": "/dashboard",
+    "foods": "/foods?search=chicken&limit=20",
+}
+
+
+def start_server(workers: int, port: int) -> subprocess.Popen:
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), BIND=f"127.0.0.1:{port}",
+               GUNICORN_ACCESS_LOG="", EMAIL_WORKER_ENABLED="false")
+    return subprocess.Popen([sys.executable, "-m", "gunicorn", "app.main:app"], cwd=ROOT, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+
+def wait_until_ready(server: subprocess.Popen, base_url: str, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"❌ Server exited:\n{server.stderr.read()[-2000:]}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit("❌ Server did not become ready")
+
+
+def stop_server(server: subprocess.Popen):
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+
+
+def login(base_url: str, username: str, password: str) -> dict:
+    response = httpx.post(f"{base_url}/token", data={"username": username, "password": password})
+    if response.status_code != 200:
+        raise SystemExit(f"❌ Login as {username} failed ({response.status_code}); run generate_data.py first")
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def drive(base_url: str, path: str, headers: dict, concurrency: int, duration: float) -> dict:
+    latencies, errors = [], 0
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+
+        async def user():
+            nonlocal errors
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code == 200
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies.append(time.perf_counter() - start)
+                else:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000 if latencies else 0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark throughput against worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds of load per endpoint")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of unmeasured load first")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent connections")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated: dashboard,foods")
+    parser.add_argument("--username", default="perf_user_0", help="User to log in as")
+    parser.add_argument("--password", default="perfpass123")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--client-cpus", help="Pin this load generator to these CPUs, e.g. 6,7")
+    args = parser.parse_args()
+
+    if args.client_cpus:
+        os.sched_setaffinity(0, {int(cpu) for cpu in args.client_cpus.split(",")})
+    base_url = f"http://127.0.0.1:{args.port}"
+    endpoints = [name.strip() for name in args.endpoints.split(",")]
+    baseline = {}
+
+    print(f"🚀 {args.concurrency} connections, {args.duration:.0f}s per endpoint")
+    print(f"  {'workers':>7} {'endpoint':10} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7} {'speedup':>8}")
+    for workers in (int(n) for n in args.workers.split(",")):
+        server = start_server(workers, args.port)
+        try:
+            wait_until_ready(server, base_url)
+            headers = login(base_url, args.username, args.password)
+            for name in endpoints:
+                asyncio.run(drive(base_url, ENDPOINTS[name], headers, args.concurrency, args.warmup))
+                result = asyncio.run(drive(base_url, ENDPOINTS[name], headers, args.concurrency, args.duration))
+                baseline.setdefault(name, result["rps"])
+                speedup = result["rps"] / baseline[name] if baseline[name] else 0
+                print(f"  {workers:>7} {name:10} {result['rps']:9.0f} {result['p50']:8.1f} "
+                      f"{result['p99']:8.1f} {result['errors']:>7} {speedup:7.2f}x")
+        finally:
+            stop_server(server)
+
+
+if __name__ == "__main__":
+    main()
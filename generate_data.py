@@ -0,0 +1,283 @@
+"""
+Synthetic data generator for performance environments.
+Creates large, deterministic volumes of foods, exercises, users, meals,
+workouts (with sets), water intake and body metrics.
+
+Rows are streamed through Postgres COPY (executemany on SQLite) in batches
+and inserted with ON CONFLICT DO NOTHING, so re-running with the same
+arguments is idempotent.
+
+Usage:
+    python generate_data.py --users 10000 --foods 50000 --days 90 --seed 42
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, '/app')
+
+from app.auth import get_password_hash
+from app.bulk import BulkWriter, reset_sequences
+from app.nutrition import refresh_meal_totals, snapshot_nutrition
+from app.streaks import recompute_all
+from app.units import food_units
+from app.database import (
+    engine, SessionLocal, User, UserProfile, BodyMetric, FoodDatabase, MealLog, MealFood,
+    ExerciseLibrary, WorkoutSession, WorkoutExercise, ExerciseSet, WaterIntake,
+    ActivityLevel, GoalType, ExerciseCategory, MealType
+)
+
+# Every synthetic user gets this password
+SYNTHETIC_PASSWORD = "perfpass123"
+
+FOOD_WORDS = ["Chicken", "Beef", "Tofu", "Rice", "Oat", "Bean", "Apple", "Berry",
+              "Cheese", "Yogurt", "Pasta", "Potato", "Salmon", "Almond", "Corn", "Lentil"]
+FOOD_KINDS = ["Bowl", "Wrap", "Salad", "Bar", "Soup", "Shake", "Bake", "Mix"]
+BRANDS = [None, None, "Generic", "FreshCo", "NutriBest", "GreenFarm"]
+UNITS = [(100, "grams"), (1, "serving"), (1, "cup"), (240, "ml"), (30, "grams")]
+EXERCISE_WORDS = ["Squat", "Press", "Row", "Curl", "Lunge", "Run", "Ride", "Swim", "Plank", "Jump"]
+MUSCLE_GROUPS = ["chest", "back", "legs", "arms", "shoulders", "core", None]
+
+
+class IdSequence:
+    """Deterministic id counter for one table."""
+
+    def __init__(self, start: int):
+        self.value = start
+
+    def next(self) -> int:
+        current = self.value
+        self.value += 1
+        return current
+
+
+def generate_foods(writer, count, seed, id_offset):
+    """Generate foods; returns them in id order for snapshotting meal entries."""
+    rng = random.Random(f"{seed}:foods")
+    foods = []
+    for i in range(count):
+        serving_size, serving_unit = rng.choice(UNITS)
+        protein = round(rng.uniform(0, 40), 1)
+        carbs = round(rng.uniform(0, 80), 1)
+        fats = round(rng.uniform(0, 30), 1)
+        food = {
+            "id": id_offset + i,
+            "name": f"{rng.choice(FOOD_WORDS)} {rng.choice(FOOD_KINDS)} #{i}",
+            "brand": rng.choice(BRANDS),
+            "serving_size": serving_size,
+            "serving_unit": serving_unit,
+            "calories": int(protein * 4 + carbs * 4 + fats * 9),
+            "protein_g": protein,
+            "carbs_g": carbs,
+            "fats_g": fats,
+            "fiber_g": round(rng.uniform(0, 10), 1),
+            "is_custom": False,
+        }
+        # COPY skips the column defaults, so the unit columns are set here
+        food.update(food_units(food))
+        writer.add(FoodDatabase.__table__, food)
+        foods.append(SimpleNamespace(**food))
+    return foods
+
+
+def generate_exercises(writer, count, seed, id_offset):
+    rng = random.Random(f"{seed}:exercises")
+    categories = list(ExerciseCategory)
+    for i in range(count):
+        writer.add(ExerciseLibrary.__table__, {
+            "id": id_offset + i,
+            "name": f"{rng.choice(EXERCISE_WORDS)} Variation #{i}",
+            "category": rng.choice(categories),
+            "muscle_group": rng.choice(MUSCLE_GROUPS),
+            "description": None,
+            "calories_per_minute": round(rng.uniform(3, 12), 1),
+            "is_custom": False,
+        })
+
+
+def generate_users(writer, args, id_offset, foods):
+    """Generate users with a profile and a full day-by-day history each."""
+    hashed_password = get_password_hash(SYNTHETIC_PASSWORD)
+    start_date = args.end_date - timedelta(days=args.days - 1)
+    ids = {name: IdSequence(id_offset) for name in (
+        "profile", "metric", "meal", "meal_food", "water", "workout", "workout_exercise", "set"
+    )}
+
+    for i in range(args.users):
+        rng = random.Random(f"{args.seed}:user:{i}")
+        user_id = id_offset + i
+        weight = round(rng.uniform(50, 110), 1)
+
+        writer.add(User.__table__, {
+            "id": user_id,
+            "username": f"perf_user_{i}",
+            "email": f"perf_user_{i}@example.com",
+            "hashed_password": hashed_password,
+            "is_verified": True,
+            "created_at": datetime.combine(start_date, datetime.min.time()),
+        })
+        writer.add(UserProfile.__table__, {
+            "id": ids["profile"].next(),
+            "user_id": user_id,
+            "date_of_birth": date(rng.randint(1960, 2005), rng.randint(1, 12), rng.randint(1, 28)),
+            "height_cm": round(rng.uniform(150, 200), 1),
+            "current_weight_kg": weight,
+            "goal_weight_kg": round(weight + rng.uniform(-15, 10), 1),
+            "activity_level": rng.choice(list(ActivityLevel)),
+            "goal_type": rng.choice(list(GoalType)),
+            "daily_calorie_target": rng.randrange(1600, 3200, 50),
+            "updated_at": datetime.combine(start_date, datetime.min.time()),
+        })
+
+        for day in range(args.days):
+            current = start_date + timedelta(days=day)
+            created = datetime.combine(current, datetime.min.time())
+
+            if day % 7 == 0:
+                weight = round(weight + rng.uniform(-0.8, 0.6), 1)
+                writer.add(BodyMetric.__table__, {
+                    "id": ids["metric"].next(),
+                    "user_id": user_id,
+                    "date": current,
+                    "weight_kg": weight,
+                    "body_fat_percentage": round(rng.uniform(10, 35), 1),
+                    "notes": None,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+
+            for meal_type in MealType:
+                if rng.random() > (0.5 if meal_type == MealType.SNACK else 0.9):
+                    continue
+                meal = SimpleNamespace(
+                    id=ids["meal"].next(),
+                    user_id=user_id,
+                    date=current,
+                    meal_type=meal_type,
+                    notes=None,
+                    created_at=created,
+                    updated_at=created,
+                )
+                entries = []
+                for _ in range(rng.randint(1, 4)):
+                    food = foods[rng.randrange(args.foods)]
+                    entry = SimpleNamespace(
+                        id=ids["meal_food"].next(),
+                        meal_id=meal.id,
+                        date=current,
+                        food_id=food.id,
+                        servings=rng.choice([0.5, 1.0, 1.0, 1.5, 2.0]),
+                        amount=None,
+                    )
+                    # COPY skips the write path, so snapshots and totals are set here
+                    snapshot_nutrition(entry, food)
+                    entries.append(entry)
+                refresh_meal_totals(meal, entries)
+                writer.add(MealLog.__table__, vars(meal))
+                writer.add_many(MealFood.__table__, (vars(entry) for entry in entries))
+
+            for _ in range(rng.randint(2, 6)):
+                writer.add(WaterIntake.__table__, {
+                    "id": ids["water"].next(),
+                    "user_id": user_id,
+                    "date": current,
+                    "amount_ml": rng.choice([250, 330, 500, 750]),
+                    "created_at": created,
+                    "updated_at": created,
+                })
+
+            if rng.random() < 0.45:
+                workout_id = ids["workout"].next()
+                duration = rng.randint(20, 90)
+                writer.add(WorkoutSession.__table__, {
+                    "id": workout_id,
+                    "user_id": user_id,
+                    "name": f"Workout {current.isoformat()}",
+                    "date": current,
+                    "duration_minutes": duration,
+                    "total_calories_burned": duration * rng.randint(5, 11),
+                    "notes": None,
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                for order in range(rng.randint(3, 5)):
+                    workout_exercise_id = ids["workout_exercise"].next()
+                    writer.add(WorkoutExercise.__table__, {
+                        "id": workout_exercise_id,
+                        "session_id": workout_id,
+                        "exercise_id": id_offset + rng.randrange(args.exercises),
+                        "order": order,
+                        "notes": None,
+                    })
+                    for set_number in range(1, rng.randint(3, 5) + 1):
+                        writer.add(ExerciseSet.__table__, {
+                            "id": ids["set"].next(),
+                            "workout_exercise_id": workout_exercise_id,
+                            "date": current,
+                            "set_number": set_number,
+                            "reps": rng.randint(5, 15),
+                            "weight_kg": round(rng.uniform(5, 120), 1),
+                            "duration_seconds": None,
+                        })
+
+
+# Parents before children so every flush satisfies foreign keys
+TABLES = [
+    FoodDatabase.__table__, ExerciseLibrary.__table__, User.__table__,
+    UserProfile.__table__, BodyMetric.__table__, MealLog.__table__, MealFood.__table__,
+    WaterIntake.__table__, WorkoutSession.__table__, WorkoutExercise.__table__,
+    ExerciseSet.__table__,
+]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate deterministic synthetic data for performance testing.")
+    parser.add_argument("--users", type=int, default=1000, help="number of users")
+    parser.add_argument("--foods", type=int, default=5000, help="number of foods")
+    parser.add_argument("--exercises", type=int, default=200, help="number of exercises")
+    parser.add_argument("--days", type=int, default=30, help="days of history per user")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today(),
+                        help="last day of generated history (YYYY-MM-DD, default today)")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per COPY batch")
+    parser.add_argument("--id-offset", type=int, default=1_000_000,
+                        help="first id used for generated rows, keeps them clear of real data")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = time.perf_counter()
+
+    def report(counts):
+        total = sum(counts.values())
+        elapsed = time.perf_counter() - started
+        print(f"  ... {total:,} rows in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    print(f"🌱 Generating synthetic data (seed={args.seed}, users={args.users}, days={args.days})...")
+    with BulkWriter(engine, batch_size=args.batch_size, on_flush=report) as writer:
+        for table in TABLES:
+            writer.add_table(table)
+        foods = generate_foods(writer, args.foods, args.seed, args.id_offset)
+        generate_exercises(writer, args.exercises, args.seed, args.id_offset)
+        generate_users(writer, args, args.id_offset, foods)
+
+    reset_sequences(engine, TABLES)
+
+    # COPY bypasses the write paths that keep streak state current
+    db = SessionLocal()
+    try:
+        print(f"🔥 Rebuilt streaks for {recompute_all(db):,} users")
+    finally:
+        db.close()
+
+    for name, count in writer.counts.items():
+        print(f"  {name}: {count:,}")
+    print(f"✅ Synthetic data generated in {time.perf_counter() - started:.1f}s!")
+
+
+if __name__ == "__main__":
+    main()
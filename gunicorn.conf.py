@@ -0,0 +1,58 @@
+"""
+Production server settings, loaded automatically by `gunicorn app.main:app`
+(the container's default command). Every value can be overridden through
+the environment; see DEPLOYMENT.md for the reasoning and the benchmark.
+
+gunicorn is only the process manager: each worker is an asyncio event loop
+(uvloop) serving HTTP with httptools, see app/workers.py.
+"""
+import os
+
+
+def _cpu_count() -> int:
+    """CPUs this container may actually use (respects cpusets / taskset)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '8000')}")
+worker_class = "app.workers.ProductionWorker"
+# One event loop per core; each already handles many concurrent requests
+workers = int(os.getenv("WEB_CONCURRENCY", max(2, _cpu_count())))
+
+# Import the app once in the master so workers fork with it already loaded
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# Recycle each worker after a few thousand requests (jittered so they don't
+# all restart together) to return fragmented memory to the OS
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "5000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "500"))
+
+# Idle keep-alive connections stay open longer than the proxy's own idle
+# timeout (Caddy and most load balancers use 60s), so the proxy closes them
+# first and never reuses a socket the worker is closing
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+# In-flight requests get this long to finish on restart or recycling; open
+# SSE streams are cut after it and their clients reconnect
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def on_starting(server):
+    if workers > 1 and os.getenv("LIVE_UPDATES_BACKEND", "memory") == "memory":
+        server.log.warning(
+            "LIVE_UPDATES_BACKEND=memory only reaches clients connected to the same worker; "
+            "use LIVE_UPDATES_BACKEND=postgres with more than one worker"
+        )
+
+
+def post_fork(server, worker):
+    # Connections must never be shared across processes: drop any pooled in the master
+    from app.database import engine
+    engine.dispose(close=False)
@@ -0,0 +1,51 @@
+"""
+Bulk food catalogue import.
+Streams a CSV or JSONL nutrition dump (optionally gzipped) into the food
+database in batches. Progress is checkpointed so an interrupted import can be
+resumed by running the same command again.
+
+Usage:
+    python import_foods.py foods.csv.gz --batch-size 5000
+"""
+import argparse
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from app.database import engine
+from app.food_import import import_foods
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import foods from a CSV/JSONL nutrition dataset.")
+    parser.add_argument("path", help="CSV or JSONL file (.gz supported)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="override format detection")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per upsert batch")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <path>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    args = parser.parse_args(argv)
+
+    checkpoint = args.checkpoint or f"{args.path}.checkpoint.json"
+    started = time.perf_counter()
+
+    def report(state):
+        elapsed = time.perf_counter() - started
+        print(f"  ... {state['rows_read']:,} rows read, {state['rows_imported']:,} imported, "
+              f"{state['rows_rejected']:,} rejected ({elapsed:.1f}s)")
+
+    print(f"🍎 Importing foods from {args.path}...")
+    state = import_foods(
+        engine, args.path,
+        checkpoint_path=checkpoint,
+        batch_size=args.batch_size,
+        fmt=args.format,
+        resume=not args.restart,
+        on_progress=report,
+    )
+    print(f"✅ Import {state['status']}: {state['rows_imported']:,} foods imported, "
+          f"{state['rows_rejected']:,} rows rejected")
+
+
+if __name__ == "__main__":
+    main()
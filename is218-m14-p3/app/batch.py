@@ -0,0 +1,73 @@
+"""
+Batch Calculations
+Evaluates many (operation, operand1, operand2) rows at once with NumPy, one
+vectorized call per operation, and inserts the valid rows in a single
+statement. Invalid rows are reported by index instead of failing the batch.
+"""
+from datetime import datetime
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.database import Calculation
+
+OPERATIONS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+}
+
+
+def evaluate_batch(
+    operations: Sequence[str],
+    operand1: Sequence[float],
+    operand2: Sequence[float]
+) -> Tuple[np.ndarray, Dict[int, str]]:
+    """
+    Evaluate every row. Returns the results array and a {row index: error}
+    dict; results for rows with an error are NaN.
+    """
+    ops = np.array([op.lower() for op in operations], dtype=object)
+    a = np.asarray(operand1, dtype=np.float64)
+    b = np.asarray(operand2, dtype=np.float64)
+    results = np.full(len(ops), np.nan)
+    errors: Dict[int, str] = {}
+
+    handled = np.zeros(len(ops), dtype=bool)
+    for name, ufunc in OPERATIONS.items():
+        mask = ops == name
+        if not mask.any():
+            continue
+        handled |= mask
+        if name == "divide":
+            zero = mask & (b == 0)
+            for i in np.flatnonzero(zero):
+                errors[int(i)] = "Cannot divide by zero"
+            mask &= ~zero
+        with np.errstate(over="ignore", invalid="ignore"):
+            results[mask] = ufunc(a[mask], b[mask])
+
+    for i in np.flatnonzero(~handled):
+        errors[int(i)] = f"Invalid operation: {operations[i]}"
+
+    # Overflow (inf) and inf - inf (nan) can't be stored or returned as JSON
+    for i in np.flatnonzero(~np.isfinite(results)):
+        errors.setdefault(int(i), "Result is not a finite number")
+
+    return results, errors
+
+
+def insert_batch(db: Session, user_id: int, rows: List[dict]) -> List[int]:
+    """Insert calculation rows in one statement and return their ids in order."""
+    if not rows:
+        return []
+    now = datetime.utcnow()
+    for row in rows:
+        row.update(user_id=user_id, created_at=now, updated_at=now)
+    statement = insert(Calculation).returning(Calculation.id, sort_by_parameter_order=True)
+    ids = list(db.scalars(statement, rows))
+    db.commit()
+    return ids
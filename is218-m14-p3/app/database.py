@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, DateTime
+from sqlalchemy import create_engine, Column, Integer, String, Float, ForeignKey, DateTime, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, relationship
 from datetime import datetime
@@ -29,9 +29,11 @@ class Calculation(Base):
     __tablename__ = "calculations"
     
     id = Column(Integer, primary_key=True, index=True)
-    operation = Column(String, nullable=False)  # add, subtract, multiply, divide
-    operand1 = Column(Float, nullable=False)
-    operand2 = Column(Float, nullable=False)
+    operation = Column(String, nullable=False)  # add, subtract, multiply, divide, expression
+    operand1 = Column(Float, nullable=True)  # unused for expressions
+    operand2 = Column(Float, nullable=True)
+    expression = Column(String, nullable=True)
+    idempotency_key = Column(String(255), nullable=True)  # client-supplied Idempotency-Key
     result = Column(Float, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -39,6 +41,15 @@ class Calculation(Base):
     
     # Relationship to user
     owner = relationship("User", back_populates="calculations")
+    
+    __table_args__ = (
+        # Newest-first keyset pagination and date-range filters per user
+        Index("ix_calculations_user_created", "user_id", "created_at", "id"),
+        # Per-operation stats as an index-only scan on PostgreSQL
+        Index("ix_calculations_user_operation", "user_id", "operation", postgresql_include=["result"]),
+        # One calculation per client retry key (NULLs don't collide)
+        Index("uq_calculations_user_idempotency_key", "user_id", "idempotency_key", unique=True),
+    )
 
 
 # Dependency to get database session
@@ -0,0 +1,145 @@
+"""
+Expression Engine
+Safely evaluates arithmetic expressions such as "2 * (3 + sqrt(16)) ^ 2".
+Expressions are parsed with Python's ast module, checked against a whitelist
+of node types, names and functions, and compiled to a code object. Compiled
+expressions are kept in an LRU cache keyed by normalized text, so a repeated
+formula skips parsing entirely.
+"""
+import ast
+import math
+import os
+import re
+from functools import lru_cache
+from types import CodeType
+
+EXPRESSION_MAX_LENGTH = int(os.getenv("EXPRESSION_MAX_LENGTH", "500"))
+EXPRESSION_CACHE_SIZE = int(os.getenv("EXPRESSION_CACHE_SIZE", "1024"))
+
+
+def _round(value, digits=0):
+    # Literals are floats, so round(x, 2) arrives as round(x, 2.0)
+    return float(round(value, int(digits)))
+
+
+def _floor(value):
+    # math.floor returns an int, and int powers have no size limit
+    return float(math.floor(value))
+
+
+def _ceil(value):
+    return float(math.ceil(value))
+
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": _round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "floor": _floor,
+    "ceil": _ceil,
+}
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau}
+
+# Only these names are visible while evaluating; no builtins
+_NAMESPACE = {"__builtins__": {}, **FUNCTIONS, **CONSTANTS}
+
+_ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod, ast.Pow, ast.FloorDiv, ast.UAdd, ast.USub,
+)
+
+_OPERATOR_SPACING = re.compile(r"\s*([-+*/%(),])\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions that are invalid or can't be evaluated."""
+
+
+def normalize_expression(expression: str) -> str:
+    """Canonical text for caching: no spacing around operators, ^ means power."""
+    text = _WHITESPACE.sub(" ", expression.strip()).replace("^", "**")
+    return _OPERATOR_SPACING.sub(r"\1", text)
+
+
+class _FloatConstants(ast.NodeTransformer):
+    """Use float arithmetic throughout so huge powers overflow instead of hanging."""
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ExpressionError(f"Unsupported value: {node.value!r}")
+        return ast.copy_location(ast.Constant(float(node.value)), node)
+
+
+def _validate(tree: ast.AST):
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.Name) and node.id not in _NAMESPACE:
+            raise ExpressionError(f"Unknown name: {node.id}")
+        if isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+                raise ExpressionError("Only built-in math functions can be called")
+            if node.keywords:
+                raise ExpressionError("Keyword arguments are not supported")
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_normalized(normalized: str) -> CodeType:
+    if not normalized:
+        raise ExpressionError("Expression is required")
+    if len(normalized) > EXPRESSION_MAX_LENGTH:
+        raise ExpressionError(f"Expression is longer than {EXPRESSION_MAX_LENGTH} characters")
+    try:
+        tree = ast.parse(normalized, mode="eval")
+        _validate(tree)
+        tree = ast.fix_missing_locations(_FloatConstants().visit(tree))
+        return compile(tree, "<expression>", "eval")
+    except SyntaxError:
+        raise ExpressionError("Invalid expression syntax")
+    except (RecursionError, MemoryError):
+        raise ExpressionError("Expression is nested too deeply")
+
+
+# Exact-text front cache: repeats skip even the normalizing regexes
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expression: str) -> CodeType:
+    """Parse, validate and compile an expression (cached)."""
+    return _compile_normalized(normalize_expression(expression))
+
+
+def evaluate_compiled(code: CodeType) -> float:
+    """Evaluate a compiled expression."""
+    try:
+        result = eval(code, _NAMESPACE)
+        if isinstance(result, complex) or not math.isfinite(result):
+            raise ExpressionError("Result is not a finite real number")
+        return float(result)
+    except ZeroDivisionError:
+        raise ExpressionError("Cannot divide by zero")
+    except OverflowError:
+        raise ExpressionError("Result is too large")
+    except (ValueError, TypeError) as e:
+        raise ExpressionError(f"Math error: {e}")
+
+
+def evaluate_expression(expression: str) -> float:
+    """Evaluate an expression and return its result."""
+    return evaluate_compiled(compile_expression(expression))
+
+
+def cache_info():
+    """Hit/miss statistics for the compiled-expression cache."""
+    return _compile_normalized.cache_info()
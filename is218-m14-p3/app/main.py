@@ -1,24 +1,33 @@
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response, Query, Header
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse, FileResponse, JSONResponse
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List
-from datetime import timedelta
+from typing import List, Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
 import os
 import traceback
 
 from app.database import get_db, create_tables, User, Calculation
 from app.schemas import (
     UserCreate, UserResponse, Token,
-    CalculationCreate, CalculationUpdate, CalculationResponse
+    CalculationCreate, CalculationUpdate, CalculationResponse,
+    CalculationBatchCreate, CalculationBatchResponse, CalculationStats
 )
+from app.expressions import evaluate_expression
+from app.pagination import encode_cursor, filter_calculations, keyset_page
 from app.auth import (
     get_password_hash, authenticate_user, create_access_token,
     get_current_user, get_user_by_username, get_user_by_email,
     ACCESS_TOKEN_EXPIRE_MINUTES
 )
 
+# Bounded memo cache for calculate_result (identical inputs are very common)
+CALCULATION_CACHE_SIZE = int(os.getenv("CALCULATION_CACHE_SIZE", "10000"))
+
 # Create FastAPI app
 app = FastAPI(title="Calculations API", version="1.0.0")
 
@@ -61,6 +70,28 @@ async def health_check():
     return {"status": "healthy"}
 
 
+def _cache_stats(info) -> dict:
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0
+    }
+
+
+# Cache metrics endpoint
+@app.get("/metrics/cache")
+def cache_metrics(current_user: User = Depends(get_current_user)):
+    """Hit rates of the calculation memo cache and the expression compile cache."""
+    from app.expressions import cache_info
+    return {
+        "calculations": _cache_stats(calculate_result.cache_info()),
+        "expressions": _cache_stats(cache_info())
+    }
+
+
 # Root endpoint
 @app.get("/", response_class=HTMLResponse)
 async def root():
@@ -129,8 +160,14 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 
 # ===== BREAD ENDPOINTS FOR CALCULATIONS =====
 
-def calculate_result(operation: str, operand1: float, operand2: float) -> float:
-    """Perform calculation based on operation."""
+@lru_cache(maxsize=CALCULATION_CACHE_SIZE)
+def calculate_result(operation: str, operand1: Optional[float], operand2: Optional[float],
+                     expression: Optional[str] = None) -> float:
+    """Perform calculation based on operation (memoized; inputs fully determine the result)."""
+    if operation == "expression":
+        return evaluate_expression(expression or "")
+    if operand1 is None or operand2 is None:
+        raise ValueError("operand1 and operand2 are required")
     if operation == "add":
         return operand1 + operand2
     elif operation == "subtract":
@@ -148,23 +185,125 @@ def calculate_result(operation: str, operand1: float, operand2: float) -> float:
 # Browse - GET all calculations for current user
 @app.get("/calculations", response_model=List[CalculationResponse])
 def browse_calculations(
-    skip: int = 0,
-    limit: int = 100,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Deprecated: use cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    operation: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
-    Retrieve all calculations belonging to the logged-in user.
+    Retrieve the logged-in user's calculations, newest first.
     
-    - **skip**: Number of records to skip (for pagination)
     - **limit**: Maximum number of records to return
+    - **cursor**: Value of the previous page's X-Next-Cursor header
+    - **operation**: Only this operation
+    - **created_from** / **created_to**: Only calculations created in [from, to)
+    - **skip**: Number of records to skip (slow for deep pages; prefer cursor)
     """
-    calculations = db.query(Calculation).filter(
-        Calculation.user_id == current_user.id
-    ).offset(skip).limit(limit).all()
+    query = filter_calculations(
+        db.query(Calculation).filter(Calculation.user_id == current_user.id),
+        operation, created_from, created_to
+    )
+    try:
+        query = keyset_page(query, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    if skip and not cursor:
+        query = query.offset(skip)
+    
+    calculations = query.all()
+    if len(calculations) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(calculations[-1])
     return calculations
 
 
+# Stats - GET per-operation aggregates for current user
+@app.get("/calculations/stats", response_model=CalculationStats)
+def calculation_stats(
+    operation: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-operation count, sum, min, max and average of results, computed in SQL.
+    
+    - **operation**: Only this operation
+    - **created_from** / **created_to**: Only calculations created in [from, to)
+    """
+    query = filter_calculations(
+        db.query(
+            Calculation.operation,
+            func.count(Calculation.id),
+            func.sum(Calculation.result),
+            func.min(Calculation.result),
+            func.max(Calculation.result),
+            func.avg(Calculation.result)
+        ).filter(Calculation.user_id == current_user.id),
+        operation, created_from, created_to
+    )
+    rows = query.group_by(Calculation.operation).order_by(Calculation.operation).all()
+    
+    operations = [
+        {"operation": op, "count": count, "sum": total, "min": low, "max": high, "avg": avg}
+        for op, count, total, low, high, avg in rows
+    ]
+    return {"total": sum(row["count"] for row in operations), "operations": operations}
+
+
+# Batch Add - POST many calculations in one request
+@app.post("/calculations/batch", response_model=CalculationBatchResponse, status_code=status.HTTP_201_CREATED)
+def add_calculations_batch(
+    batch: CalculationBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create many calculations at once. Rows that can't be calculated are
+    reported with their index and error; the rest are saved.
+    
+    - **calculations**: List of {operation, operand1, operand2} (max 10,000)
+    """
+    from app.batch import evaluate_batch, insert_batch
+    
+    items = batch.calculations
+    results, errors = evaluate_batch(
+        [item.operation for item in items],
+        [item.operand1 for item in items],
+        [item.operand2 for item in items]
+    )
+    
+    valid = [i for i in range(len(items)) if i not in errors]
+    ids = insert_batch(db, current_user.id, [
+        {
+            "operation": items[i].operation.lower(),
+            "operand1": items[i].operand1,
+            "operand2": items[i].operand2,
+            "result": float(results[i])
+        }
+        for i in valid
+    ])
+    created = dict(zip(valid, ids))
+    
+    return {
+        "created": len(valid),
+        "failed": len(errors),
+        "results": [
+            {"index": i, "error": errors[i]} if i in errors
+            else {"index": i, "id": created[i], "result": float(results[i])}
+            for i in range(len(items))
+        ]
+    }
+
+
 # Read - GET a specific calculation by ID
 @app.get("/calculations/{calculation_id}", response_model=CalculationResponse)
 def read_calculation(
@@ -195,22 +334,35 @@ def read_calculation(
 @app.post("/calculations", response_model=CalculationResponse, status_code=status.HTTP_201_CREATED)
 def add_calculation(
     calculation: CalculationCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Create a new calculation by specifying the operation and operands.
     
-    - **operation**: The operation to perform (add, subtract, multiply, divide)
+    - **operation**: The operation to perform (add, subtract, multiply, divide, expression)
     - **operand1**: The first operand
     - **operand2**: The second operand
+    - **expression**: The expression to evaluate when operation is "expression"
+    
+    Send an **Idempotency-Key** header to make retries safe: repeating a
+    request with the same key returns the original calculation.
     """
+    if idempotency_key:
+        existing = _find_idempotent(db, current_user.id, idempotency_key, calculation)
+        if existing:
+            response.headers["Idempotent-Replayed"] = "true"
+            return existing
+    
     try:
         # Calculate the result
         result = calculate_result(
             calculation.operation,
             calculation.operand1,
-            calculation.operand2
+            calculation.operand2,
+            calculation.expression
         )
         
         # Create new calculation
@@ -218,8 +370,10 @@ def add_calculation(
             operation=calculation.operation,
             operand1=calculation.operand1,
             operand2=calculation.operand2,
+            expression=calculation.expression,
             result=result,
-            user_id=current_user.id
+            user_id=current_user.id,
+            idempotency_key=idempotency_key
         )
         
         db.add(db_calculation)
@@ -227,6 +381,15 @@ def add_calculation(
         db.refresh(db_calculation)
         return db_calculation
         
+    except IntegrityError:
+        # A concurrent retry with the same key inserted first
+        db.rollback()
+        existing = _find_idempotent(db, current_user.id, idempotency_key, calculation)
+        if not existing:
+            raise
+        response.headers["Idempotent-Replayed"] = "true"
+        return existing
+        
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -234,6 +397,22 @@ def add_calculation(
         )
 
 
+def _find_idempotent(db: Session, user_id: int, key: str, calculation: CalculationCreate) -> Optional[Calculation]:
+    """Return the calculation created earlier with this key, if any."""
+    existing = db.query(Calculation).filter(
+        Calculation.user_id == user_id,
+        Calculation.idempotency_key == key
+    ).first()
+    if existing and (existing.operation, existing.operand1, existing.operand2, existing.expression) != (
+        calculation.operation, calculation.operand1, calculation.operand2, calculation.expression
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency-Key was already used for a different calculation"
+        )
+    return existing
+
+
 # Edit - PUT/PATCH update an existing calculation
 @app.put("/calculations/{calculation_id}", response_model=CalculationResponse)
 @app.patch("/calculations/{calculation_id}", response_model=CalculationResponse)
@@ -250,6 +429,7 @@ def edit_calculation(
     - **operation**: (optional) New operation
     - **operand1**: (optional) New first operand
     - **operand2**: (optional) New second operand
+    - **expression**: (optional) New expression
     """
     # Get the calculation
     db_calculation = db.query(Calculation).filter(
@@ -272,15 +452,28 @@ def edit_calculation(
             detail="No fields to update"
         )
     
+    def inputs():
+        return (db_calculation.operation, db_calculation.operand1,
+                db_calculation.operand2, db_calculation.expression)
+    
+    before = inputs()
     for field, value in update_data.items():
         setattr(db_calculation, field, value)
+    if db_calculation.operation != "expression":
+        db_calculation.expression = None
+    
+    # Nothing changed: skip the recompute and the write
+    if inputs() == before:
+        db.rollback()
+        return db_calculation
     
     # Recalculate result
     try:
         db_calculation.result = calculate_result(
             db_calculation.operation,
             db_calculation.operand1,
-            db_calculation.operand2
+            db_calculation.operand2,
+            db_calculation.expression
         )
     except ValueError as e:
         raise HTTPException(
@@ -0,0 +1,54 @@
+"""
+Keyset Pagination
+Calculations are listed newest first, ordered by (created_at, id). A cursor
+encodes the last row of a page, and the next page starts strictly after it,
+so every page is an index range scan on (user_id, created_at, id) no matter
+how deep it is.
+"""
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Query
+
+from app.database import Calculation
+
+
+def encode_cursor(calculation: Calculation) -> str:
+    raw = f"{calculation.created_at.isoformat()}|{calculation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Return (created_at, id) from a cursor; raises ValueError if malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id_ = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(id_)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def filter_calculations(
+    query: Query,
+    operation: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None
+) -> Query:
+    """Apply the optional operation and created_at range filters."""
+    if operation:
+        query = query.filter(Calculation.operation == operation.lower())
+    if created_from:
+        query = query.filter(Calculation.created_at >= created_from)
+    if created_to:
+        query = query.filter(Calculation.created_at < created_to)
+    return query
+
+
+def keyset_page(query: Query, cursor: Optional[str], limit: int) -> Query:
+    """Newest-first page of the query starting after the cursor."""
+    if cursor:
+        created_at, id_ = decode_cursor(cursor)
+        query = query.filter(tuple_(Calculation.created_at, Calculation.id) < (created_at, id_))
+    return query.order_by(Calculation.created_at.desc(), Calculation.id.desc()).limit(limit)
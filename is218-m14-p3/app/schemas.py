@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -22,16 +22,19 @@ class UserResponse(UserBase):
 
 
 # Calculation Schemas
+ALLOWED_OPERATIONS = ['add', 'subtract', 'multiply', 'divide', 'expression']
+
+
 class CalculationBase(BaseModel):
-    operation: str = Field(..., description="Operation: add, subtract, multiply, divide")
-    operand1: float = Field(..., description="First operand")
-    operand2: float = Field(..., description="Second operand")
+    operation: str = Field(..., description="Operation: add, subtract, multiply, divide, expression")
+    operand1: Optional[float] = Field(None, description="First operand")
+    operand2: Optional[float] = Field(None, description="Second operand")
+    expression: Optional[str] = Field(None, max_length=500, description="Expression, e.g. 2 * (3 + sqrt(16)) ^ 2")
     
     @validator('operation')
     def validate_operation(cls, v):
-        allowed_operations = ['add', 'subtract', 'multiply', 'divide']
-        if v.lower() not in allowed_operations:
-            raise ValueError(f'Operation must be one of: {", ".join(allowed_operations)}')
+        if v.lower() not in ALLOWED_OPERATIONS:
+            raise ValueError(f'Operation must be one of: {", ".join(ALLOWED_OPERATIONS)}')
         return v.lower()
     
     @validator('operand2')
@@ -42,20 +45,27 @@ class CalculationBase(BaseModel):
 
 
 class CalculationCreate(CalculationBase):
-    pass
+    @validator('expression', always=True)
+    def validate_inputs(cls, v, values):
+        if values.get('operation') == 'expression':
+            if not v or not v.strip():
+                raise ValueError('Expression is required for the expression operation')
+        elif values.get('operand1') is None or values.get('operand2') is None:
+            raise ValueError('operand1 and operand2 are required')
+        return v
 
 
 class CalculationUpdate(BaseModel):
     operation: Optional[str] = None
     operand1: Optional[float] = None
     operand2: Optional[float] = None
+    expression: Optional[str] = Field(None, max_length=500)
     
     @validator('operation')
     def validate_operation(cls, v):
         if v is not None:
-            allowed_operations = ['add', 'subtract', 'multiply', 'divide']
-            if v.lower() not in allowed_operations:
-                raise ValueError(f'Operation must be one of: {", ".join(allowed_operations)}')
+            if v.lower() not in ALLOWED_OPERATIONS:
+                raise ValueError(f'Operation must be one of: {", ".join(ALLOWED_OPERATIONS)}')
             return v.lower()
         return v
 
@@ -71,6 +81,48 @@ class CalculationResponse(CalculationBase):
         from_attributes = True
 
 
+class OperationStats(BaseModel):
+    operation: str
+    count: int
+    sum: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    avg: Optional[float] = None
+
+
+class CalculationStats(BaseModel):
+    total: int
+    operations: List[OperationStats]
+
+
+# Batch Calculation Schemas
+MAX_BATCH_SIZE = 10000
+
+
+class CalculationBatchItem(BaseModel):
+    # Validated per row by the batch evaluator so one bad row doesn't reject the batch
+    operation: str
+    operand1: float
+    operand2: float
+
+
+class CalculationBatchCreate(BaseModel):
+    calculations: List[CalculationBatchItem] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class CalculationBatchResult(BaseModel):
+    index: int
+    id: Optional[int] = None
+    result: Optional[float] = None
+    error: Optional[str] = None
+
+
+class CalculationBatchResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[CalculationBatchResult]
+
+
 # Token Schemas
 class Token(BaseModel):
     access_token: str
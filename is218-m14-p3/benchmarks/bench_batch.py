@@ -0,0 +1,80 @@
+"""
+Throughput benchmark: POST /calculations row-at-a-time vs /calculations/batch.
+
+Runs both code paths directly against DATABASE_URL (default: a temporary
+SQLite file) so the numbers reflect evaluation + persistence, not HTTP.
+
+Usage:
+    python benchmarks/bench_batch.py [--rows 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.batch import evaluate_batch, insert_batch
+from app.database import Base, Calculation, User
+from app.main import calculate_result
+
+
+def make_rows(count: int):
+    rng = random.Random(42)
+    return [
+        (rng.choice(["add", "subtract", "multiply", "divide"]), rng.uniform(-1e3, 1e3), rng.uniform(-1e3, 1e3))
+        for _ in range(count)
+    ]
+
+
+def single_row_path(db, user_id, rows):
+    for operation, a, b in rows:
+        db.add(Calculation(operation=operation, operand1=a, operand2=b,
+                           result=calculate_result(operation, a, b), user_id=user_id))
+        db.commit()
+
+
+def batch_path(db, user_id, rows, batch_size=10000):
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        operations, operand1, operand2 = zip(*chunk)
+        results, errors = evaluate_batch(operations, operand1, operand2)
+        insert_batch(db, user_id, [
+            {"operation": op, "operand1": a, "operand2": b, "result": float(results[i])}
+            for i, (op, a, b) in enumerate(chunk) if i not in errors
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch vs single-row calculation inserts")
+    parser.add_argument("--rows", type=int, default=10000, help="Calculations per run")
+    args = parser.parse_args()
+
+    url = os.getenv("DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    db = Session()
+    user = User(username=f"bench{int(time.time())}", email=f"bench{int(time.time())}@example.com",
+                hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    rows = make_rows(args.rows)
+    print(f"🧮 {args.rows:,} calculations on {engine.dialect.name}")
+    for name, path in (("single-row", single_row_path), ("batch", batch_path)):
+        start = time.perf_counter()
+        path(db, user.id, rows)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:<11} {elapsed:8.2f}s  {args.rows / elapsed:>12,.0f} rows/sec")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
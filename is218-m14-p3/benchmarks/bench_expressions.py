@@ -0,0 +1,59 @@
+"""
+Benchmark for the expression engine: re-parsing every time vs the LRU
+compile cache vs compiling once and evaluating many times.
+
+Usage:
+    python benchmarks/bench_expressions.py [--evaluations 100000]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.expressions import (
+    _compile_normalized, compile_expression, evaluate_compiled, evaluate_expression, normalize_expression
+)
+
+EXPRESSIONS = [
+    "1 + 2 * 3",
+    "2 * (3 + sqrt(16)) ^ 2",
+    "round(sin(pi / 4) ** 2 + cos(pi / 4) ** 2, 6)",
+    "max(3, 7, 2) * log(e ^ 3) - abs(-12.5) / 5",
+]
+
+
+def reparse(expression):
+    return evaluate_compiled(_compile_normalized.__wrapped__(normalize_expression(expression)))
+
+
+def cached(expression):
+    return evaluate_expression(expression)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark expression parsing vs cached compilation")
+    parser.add_argument("--evaluations", type=int, default=100000, help="Evaluations per expression")
+    args = parser.parse_args()
+
+    print(f"🧮 {args.evaluations:,} evaluations per expression")
+    for expression in EXPRESSIONS:
+        print(f"\n  {expression}")
+        for name, evaluate in (("re-parse", reparse), ("lru cache", cached)):
+            start = time.perf_counter()
+            for _ in range(args.evaluations):
+                evaluate(expression)
+            elapsed = time.perf_counter() - start
+            print(f"    {name:<15} {args.evaluations / elapsed:>12,.0f} evals/sec")
+
+        code = compile_expression(expression)
+        start = time.perf_counter()
+        for _ in range(args.evaluations):
+            evaluate_compiled(code)
+        elapsed = time.perf_counter() - start
+        print(f"    {'compile once':<15} {args.evaluations / elapsed:>12,.0f} evals/sec")
+
+
+if __name__ == "__main__":
+    main()
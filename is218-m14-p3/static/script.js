@@ -176,6 +176,13 @@ function getOperationSymbol(operation) {
     return symbols[operation] || operation;
 }
 
+// Escape user-entered text (expressions) before inserting it as HTML
+function escapeHtml(text) {
+    const div = document.createElement('div');
+    div.textContent = text;
+    return div.innerHTML;
+}
+
 // Format date
 function formatDate(dateString) {
     const date = new Date(dateString);
@@ -198,7 +205,7 @@ async function loadCalculations() {
             <div class="calculation-item" data-id="${calc.id}">
                 <div class="calculation-info">
                     <div class="calculation-expression">
-                        ${calc.operand1} ${getOperationSymbol(calc.operation)} ${calc.operand2}
+                        ${calc.operation === 'expression' ? escapeHtml(calc.expression) : `${calc.operand1} ${getOperationSymbol(calc.operation)} ${calc.operand2}`}
                     </div>
                     <div class="calculation-result">
                         = ${calc.result}
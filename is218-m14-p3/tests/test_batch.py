@@ -0,0 +1,49 @@
+"""Unit tests for vectorized batch calculations."""
+import math
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.batch import evaluate_batch, insert_batch
+from app.database import Base, Calculation, User
+
+
+def test_evaluate_batch_matches_single_row_results():
+    """Test each operation group is evaluated correctly."""
+    results, errors = evaluate_batch(
+        ["add", "subtract", "MULTIPLY", "divide"], [6, 6, 6, 6], [3, 3, 3, 3]
+    )
+    assert errors == {}
+    assert list(results) == [9, 3, 18, 2]
+
+
+def test_evaluate_batch_reports_row_errors():
+    """Test bad rows are reported by index without affecting the others."""
+    results, errors = evaluate_batch(
+        ["divide", "modulo", "add", "multiply"], [1, 1, 1, 1e308], [0, 1, 2, 1e308]
+    )
+    assert errors == {
+        0: "Cannot divide by zero",
+        1: "Invalid operation: modulo",
+        3: "Result is not a finite number",
+    }
+    assert results[2] == 3
+    assert math.isnan(results[0])
+
+
+def test_insert_batch_returns_ids_in_order(tmp_path):
+    """Test rows are inserted in one call and ids line up with the input."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="batch", email="batch@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+
+    rows = [{"operation": "add", "operand1": i, "operand2": 1, "result": i + 1} for i in range(50)]
+    ids = insert_batch(db, user.id, rows)
+
+    assert len(ids) == 50
+    assert [db.get(Calculation, id_).result for id_ in ids] == [i + 1 for i in range(50)]
+    db.close()
+    engine.dispose()
@@ -0,0 +1,56 @@
+"""Unit tests for the safe expression engine."""
+import pytest
+
+from app.expressions import ExpressionError, compile_expression, evaluate_expression, normalize_expression
+from app.main import calculate_result
+
+
+@pytest.mark.parametrize("expression,expected", [
+    ("1 + 2 * 3", 7),
+    ("2 * (3 + sqrt(16)) ^ 2", 98),
+    ("-2 ** 2", -4),
+    ("round(pi, 2)", 3.14),
+    ("max(1, 5, 3) - abs(-2) % 3", 3),
+    ("7 // 2", 3),
+])
+def test_evaluates_expressions(expression, expected):
+    """Test nested arithmetic, powers and functions."""
+    assert evaluate_expression(expression) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os').system('true')",
+    "(1).__class__",
+    "x + 1",
+    "[1, 2]",
+    "lambda: 1",
+    "'a' * 3",
+    "1 +",
+])
+def test_rejects_unsafe_or_invalid_expressions(expression):
+    """Test anything outside the arithmetic whitelist is refused."""
+    with pytest.raises(ExpressionError):
+        evaluate_expression(expression)
+
+
+@pytest.mark.parametrize("expression", [
+    "1 / 0", "9 ** 9 ** 9 ** 9", "ceil(9) ** ceil(9) ** ceil(9)", "ceil(9) ** ceil(9) ** ceil(7)",
+    "floor(9.5) ** floor(9.5) ** floor(9.5)", "round(9) ** round(9) ** round(9)", "sqrt(-1)", "(-8) ** 0.5",
+])
+def test_math_errors_are_expression_errors(expression):
+    """Test runtime failures surface as ValueErrors (HTTP 400), not crashes."""
+    with pytest.raises(ValueError):
+        evaluate_expression(expression)
+
+
+def test_equivalent_spacing_shares_compiled_code():
+    """Test the cache key ignores spacing and ^ is power."""
+    assert normalize_expression(" 2 ^ ( 1+1 ) ") == "2**(1+1)"
+    assert compile_expression("2^(1+1)") is compile_expression("2 ** (1 + 1)")
+
+
+def test_calculate_result_supports_expressions():
+    """Test the calculations API accepts the expression operation."""
+    assert calculate_result("expression", None, None, "2 ^ 10") == 1024
+    with pytest.raises(ValueError):
+        calculate_result("add", None, 2)
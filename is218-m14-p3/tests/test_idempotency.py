@@ -0,0 +1,76 @@
+"""Tests for the calculation memo cache and Idempotency-Key handling (SQLite)."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, Calculation, get_db
+from app.main import app, calculate_result
+
+
+@pytest.fixture
+def sqlite_client():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    client.post("/register", json={"username": "idem", "email": "idem@example.com", "password": "secret1"})
+    token = client.post("/token", data={"username": "idem", "password": "secret1"}).json()["access_token"]
+    client.headers["Authorization"] = f"Bearer {token}"
+    yield client, Session
+    app.dependency_overrides.clear()
+    engine.dispose()
+
+
+def test_calculate_result_is_memoized():
+    """Test repeated inputs are served from the cache."""
+    before = calculate_result.cache_info()
+    calculate_result("multiply", 12345.0, 6789.0)
+    calculate_result("multiply", 12345.0, 6789.0)
+    after = calculate_result.cache_info()
+    assert after.hits - before.hits >= 1
+
+
+def test_idempotency_key_replays_original(sqlite_client):
+    """Test a retried POST returns the original row instead of a duplicate."""
+    client, Session = sqlite_client
+    body = {"operation": "add", "operand1": 1, "operand2": 2}
+    headers = {"Idempotency-Key": "retry-1"}
+
+    first = client.post("/calculations", json=body, headers=headers)
+    second = client.post("/calculations", json=body, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert second.json()["id"] == first.json()["id"]
+    assert second.headers["Idempotent-Replayed"] == "true"
+    db = Session()
+    assert db.query(Calculation).count() == 1
+    db.close()
+
+
+def test_idempotency_key_reuse_with_other_payload_is_rejected(sqlite_client):
+    """Test a key can't be reused for a different calculation."""
+    client, _ = sqlite_client
+    headers = {"Idempotency-Key": "retry-2"}
+    client.post("/calculations", json={"operation": "add", "operand1": 1, "operand2": 2}, headers=headers)
+    response = client.post("/calculations", json={"operation": "add", "operand1": 5, "operand2": 2}, headers=headers)
+    assert response.status_code == 422
+
+
+def test_cache_metrics_endpoint(sqlite_client):
+    """Test hit-rate metrics are exposed to signed-in users only."""
+    client, _ = sqlite_client
+    assert client.get("/metrics/cache", headers={"Authorization": ""}).status_code == 401
+    stats = client.get("/metrics/cache").json()
+    assert set(stats) == {"calculations", "expressions"}
+    assert 0 <= stats["calculations"]["hit_rate"] <= 1
@@ -0,0 +1,57 @@
+"""Unit tests for keyset pagination and calculation stats queries."""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, Calculation, User
+from app.pagination import decode_cursor, encode_cursor, filter_calculations, keyset_page
+
+
+@pytest.fixture
+def session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, username="pager", email="pager@example.com", hashed_password="x"))
+    start = datetime(2024, 1, 1)
+    # Pairs of rows share a timestamp so the id tiebreaker matters
+    for i in range(10):
+        db.add(Calculation(operation="add" if i % 2 else "multiply", operand1=i, operand2=1,
+                           result=i, user_id=1, created_at=start + timedelta(days=i // 2)))
+    db.commit()
+    yield db
+    db.close()
+    engine.dispose()
+
+
+def test_pages_cover_every_row_once_newest_first(session):
+    """Test following cursors visits all rows in (created_at, id) desc order."""
+    base = session.query(Calculation).filter(Calculation.user_id == 1)
+    seen, cursor = [], None
+    while True:
+        page = keyset_page(base, cursor, 3).all()
+        seen.extend(c.id for c in page)
+        if len(page) < 3:
+            break
+        cursor = encode_cursor(page[-1])
+    expected = [c.id for c in base.order_by(Calculation.created_at.desc(), Calculation.id.desc())]
+    assert seen == expected
+    assert len(set(seen)) == 10
+
+
+def test_filters_by_operation_and_date_range(session):
+    """Test the operation filter and half-open created_at range."""
+    query = filter_calculations(
+        session.query(Calculation), "ADD", datetime(2024, 1, 2), datetime(2024, 1, 4)
+    )
+    assert sorted(c.result for c in query) == [3, 5]
+
+
+def test_cursor_round_trip_and_rejects_garbage(session):
+    """Test cursors decode to (created_at, id) and bad input is a ValueError."""
+    calculation = session.query(Calculation).first()
+    assert decode_cursor(encode_cursor(calculation)) == (calculation.created_at, calculation.id)
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
@@ -0,0 +1,109 @@
+"""
+Apply database migrations (one-shot; run before starting or rolling app workers).
+
+Usage:
+    python migrate.py                      # upgrade to the latest revision
+    python migrate.py --revision 0002      # upgrade to a specific revision
+    python migrate.py --downgrade 0001     # roll back to a revision
+    python migrate.py --stamp-baseline     # adopt a database already at the baseline schema
+    python migrate.py --sql                # print the SQL instead of running it
+"""
+import argparse
+import os
+import sys
+import tempfile
+from typing import Dict, List, Set
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect
+
+from app.database import DATABASE_URL, engine
+from app.schema_version import current_revision, head_revision
+
+BASELINE_REVISION = "0001"
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini")
+
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    config.attributes["database_url"] = DATABASE_URL
+    return config
+
+
+def table_columns(engine) -> Dict[str, Set[str]]:
+    """Column names of every table in the database, besides alembic's own."""
+    inspector = inspect(engine)
+    return {
+        table: {column["name"] for column in inspector.get_columns(table)}
+        for table in inspector.get_table_names() if table != "alembic_version"
+    }
+
+
+def baseline_differences(engine) -> List[str]:
+    """
+    How the database's tables and columns differ from the baseline
+    revision's, which is built in a scratch SQLite database to compare.
+    Empty when the database can be stamped as the baseline.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        url = f"sqlite:///{os.path.join(scratch, 'baseline.db')}"
+        config = alembic_config()
+        config.attributes.update(database_url=url, configure_logger=False)
+        command.upgrade(config, BASELINE_REVISION)
+        baseline_engine = create_engine(url)
+        try:
+            expected = table_columns(baseline_engine)
+        finally:
+            baseline_engine.dispose()
+    actual = table_columns(engine)
+
+    differences = [f"missing table {table}" for table in sorted(expected.keys() - actual.keys())]
+    differences += [f"unexpected table {table}" for table in sorted(actual.keys() - expected.keys())]
+    for table in sorted(expected.keys() & actual.keys()):
+        differences += [f"missing column {table}.{column}" for column in sorted(expected[table] - actual[table])]
+        differences += [f"unexpected column {table}.{column}" for column in sorted(actual[table] - expected[table])]
+    return differences
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply FitTrack database migrations")
+    parser.add_argument("--revision", default="head", help="Target revision (default: head)")
+    parser.add_argument("--downgrade", metavar="REVISION", help="Downgrade to this revision instead")
+    parser.add_argument("--stamp-baseline", action="store_true",
+                        help="Mark an existing database matching the baseline schema as that revision first")
+    parser.add_argument("--sql", action="store_true", help="Print SQL instead of executing it")
+    args = parser.parse_args()
+
+    config = alembic_config()
+    before = None if args.sql else current_revision(engine)
+
+    if args.stamp_baseline:
+        differences = baseline_differences(engine)
+        if differences:
+            print(f"❌ The database does not match revision {BASELINE_REVISION}, so it can't be stamped:")
+            for difference in differences:
+                print(f"   - {difference}")
+            print("   Stamping would skip or repeat migrations; bring the schema to the baseline first.")
+            sys.exit(1)
+        print(f"🏷️  Stamping existing schema as revision {BASELINE_REVISION}")
+        command.stamp(config, BASELINE_REVISION)
+        before = BASELINE_REVISION
+    elif before is None and not args.sql and inspect(engine).has_table("users"):
+        print("❌ Tables exist but the database has never been migrated.")
+        print("   If it was created by create_all(), run: python migrate.py --stamp-baseline")
+        sys.exit(1)
+
+    target = args.downgrade or args.revision
+    print(f"🔄 Migrating {engine.url.render_as_string(hide_password=True)}: {before or 'empty'} -> {target}")
+    if args.downgrade:
+        command.downgrade(config, args.downgrade, sql=args.sql)
+    else:
+        command.upgrade(config, args.revision, sql=args.sql)
+
+    if not args.sql:
+        print(f"✅ Database at revision {current_revision(engine)} (head: {head_revision()})")
+
+
+if __name__ == "__main__":
+    main()
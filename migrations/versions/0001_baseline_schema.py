@@ -0,0 +1,244 @@
+"""baseline schema
+
+The schema as it was when migrations were introduced, including the
+email outbox, verification tokens and meal nutrition snapshots added just
+before. A database created by create_all() from that code matches it and
+only needs stamping:
+    python migrate.py --stamp-baseline
+which compares the database's tables and columns with this revision's
+first and refuses to stamp one from older code that differs.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 05:35:38.904757
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('email_outbox',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('to_email', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('html_content', sa.Text(), nullable=False),
+    sa.Column('text_content', sa.Text(), nullable=True),
+    sa.Column('status', sa.Enum('PENDING', 'SENT', 'FAILED', name='outboxstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_email_outbox_due', 'email_outbox', ['status', 'next_attempt_at'], unique=False)
+    op.create_index(op.f('ix_email_outbox_id'), 'email_outbox', ['id'], unique=False)
+    op.create_table('exercise_library',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('category', sa.Enum('STRENGTH', 'CARDIO', 'FLEXIBILITY', 'SPORTS', name='exercisecategory'), nullable=False),
+    sa.Column('muscle_group', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('calories_per_minute', sa.Float(), nullable=True),
+    sa.Column('is_custom', sa.Boolean(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exercise_library_id'), 'exercise_library', ['id'], unique=False)
+    op.create_table('food_database',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('brand', sa.String(), nullable=True),
+    sa.Column('serving_size', sa.Float(), nullable=False),
+    sa.Column('serving_unit', sa.String(), nullable=False),
+    sa.Column('calories', sa.Integer(), nullable=False),
+    sa.Column('protein_g', sa.Float(), nullable=True),
+    sa.Column('carbs_g', sa.Float(), nullable=True),
+    sa.Column('fats_g', sa.Float(), nullable=True),
+    sa.Column('fiber_g', sa.Float(), nullable=True),
+    sa.Column('is_custom', sa.Boolean(), nullable=True),
+    sa.Column('dedupe_key', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_food_database_dedupe_key'), 'food_database', ['dedupe_key'], unique=True)
+    op.create_index(op.f('ix_food_database_id'), 'food_database', ['id'], unique=False)
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('is_verified', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+    op.create_index(op.f('ix_users_id'), 'users', ['id'], unique=False)
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('verification_tokens',
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_verification_tokens_expires_at'), 'verification_tokens', ['expires_at'], unique=False)
+    op.create_table('body_metrics',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('weight_kg', sa.Float(), nullable=False),
+    sa.Column('body_fat_percentage', sa.Float(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_body_metrics_id'), 'body_metrics', ['id'], unique=False)
+    op.create_table('goals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('goal_type', sa.String(), nullable=False),
+    sa.Column('target_value', sa.Float(), nullable=False),
+    sa.Column('current_value', sa.Float(), nullable=True),
+    sa.Column('start_date', sa.Date(), nullable=False),
+    sa.Column('target_date', sa.Date(), nullable=True),
+    sa.Column('status', sa.Enum('ACTIVE', 'COMPLETED', 'ABANDONED', name='goalstatus'), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_goals_id'), 'goals', ['id'], unique=False)
+    op.create_table('meal_logs',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('meal_type', sa.Enum('BREAKFAST', 'LUNCH', 'DINNER', 'SNACK', name='mealtype'), nullable=False),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('total_calories', sa.Float(), nullable=True),
+    sa.Column('total_protein_g', sa.Float(), nullable=True),
+    sa.Column('total_carbs_g', sa.Float(), nullable=True),
+    sa.Column('total_fats_g', sa.Float(), nullable=True),
+    sa.Column('total_fiber_g', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_meal_logs_id'), 'meal_logs', ['id'], unique=False)
+    op.create_table('user_profiles',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date_of_birth', sa.Date(), nullable=True),
+    sa.Column('height_cm', sa.Float(), nullable=True),
+    sa.Column('current_weight_kg', sa.Float(), nullable=True),
+    sa.Column('goal_weight_kg', sa.Float(), nullable=True),
+    sa.Column('activity_level', sa.Enum('SEDENTARY', 'LIGHT', 'MODERATE', 'ACTIVE', 'VERY_ACTIVE', name='activitylevel'), nullable=True),
+    sa.Column('goal_type', sa.Enum('LOSE_WEIGHT', 'GAIN_WEIGHT', 'MAINTAIN', 'BUILD_MUSCLE', name='goaltype'), nullable=True),
+    sa.Column('daily_calorie_target', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    op.create_index(op.f('ix_user_profiles_id'), 'user_profiles', ['id'], unique=False)
+    op.create_table('water_intake',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('amount_ml', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_water_intake_id'), 'water_intake', ['id'], unique=False)
+    op.create_table('workout_sessions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('duration_minutes', sa.Integer(), nullable=True),
+    sa.Column('total_calories_burned', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workout_sessions_id'), 'workout_sessions', ['id'], unique=False)
+    op.create_table('meal_foods',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meal_id', sa.Integer(), nullable=False),
+    sa.Column('food_id', sa.Integer(), nullable=False),
+    sa.Column('servings', sa.Float(), nullable=True),
+    sa.Column('calories', sa.Float(), nullable=True),
+    sa.Column('protein_g', sa.Float(), nullable=True),
+    sa.Column('carbs_g', sa.Float(), nullable=True),
+    sa.Column('fats_g', sa.Float(), nullable=True),
+    sa.Column('fiber_g', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['food_id'], ['food_database.id'], ),
+    sa.ForeignKeyConstraint(['meal_id'], ['meal_logs.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_meal_foods_id'), 'meal_foods', ['id'], unique=False)
+    op.create_table('workout_exercises',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('exercise_id', sa.Integer(), nullable=False),
+    sa.Column('order', sa.Integer(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['exercise_id'], ['exercise_library.id'], ),
+    sa.ForeignKeyConstraint(['session_id'], ['workout_sessions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_workout_exercises_id'), 'workout_exercises', ['id'], unique=False)
+    op.create_table('exercise_sets',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('workout_exercise_id', sa.Integer(), nullable=False),
+    sa.Column('set_number', sa.Integer(), nullable=False),
+    sa.Column('reps', sa.Integer(), nullable=True),
+    sa.Column('weight_kg', sa.Float(), nullable=True),
+    sa.Column('duration_seconds', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['workout_exercise_id'], ['workout_exercises.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exercise_sets_id'), 'exercise_sets', ['id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_exercise_sets_id'), table_name='exercise_sets')
+    op.drop_table('exercise_sets')
+    op.drop_index(op.f('ix_workout_exercises_id'), table_name='workout_exercises')
+    op.drop_table('workout_exercises')
+    op.drop_index(op.f('ix_meal_foods_id'), table_name='meal_foods')
+    op.drop_table('meal_foods')
+    op.drop_index(op.f('ix_workout_sessions_id'), table_name='workout_sessions')
+    op.drop_table('workout_sessions')
+    op.drop_index(op.f('ix_water_intake_id'), table_name='water_intake')
+    op.drop_table('water_intake')
+    op.drop_index(op.f('ix_user_profiles_id'), table_name='user_profiles')
+    op.drop_table('user_profiles')
+    op.drop_index(op.f('ix_meal_logs_id'), table_name='meal_logs')
+    op.drop_table('meal_logs')
+    op.drop_index(op.f('ix_goals_id'), table_name='goals')
+    op.drop_table('goals')
+    op.drop_index(op.f('ix_body_metrics_id'), table_name='body_metrics')
+    op.drop_table('body_metrics')
+    op.drop_index(op.f('ix_verification_tokens_expires_at'), table_name='verification_tokens')
+    op.drop_table('verification_tokens')
+    op.drop_index(op.f('ix_users_username'), table_name='users')
+    op.drop_index(op.f('ix_users_id'), table_name='users')
+    op.drop_index(op.f('ix_users_email'), table_name='users')
+    op.drop_table('users')
+    op.drop_index(op.f('ix_food_database_id'), table_name='food_database')
+    op.drop_index(op.f('ix_food_database_dedupe_key'), table_name='food_database')
+    op.drop_table('food_database')
+    op.drop_index(op.f('ix_exercise_library_id'), table_name='exercise_library')
+    op.drop_table('exercise_library')
+    op.drop_index(op.f('ix_email_outbox_id'), table_name='email_outbox')
+    op.drop_index('ix_email_outbox_due', table_name='email_outbox')
+    op.drop_table('email_outbox')
+    
+    # PostgreSQL keeps enum types after their tables are dropped
+    for name in ('outboxstatus', 'exercisecategory', 'goalstatus', 'mealtype', 'activitylevel', 'goaltype'):
+        sa.Enum(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,40 @@
+"""user/date and foreign key indexes
+
+Built with CREATE INDEX CONCURRENTLY on PostgreSQL so the tables stay
+writable while the indexes build. CONCURRENTLY can't run inside a
+transaction, hence the autocommit block; IF NOT EXISTS makes a retry after
+an interrupted build safe (drop any INVALID leftover index first).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 05:40:00
+"""
+from alembic import op
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_meal_logs_user_date', 'meal_logs', ['user_id', 'date']),
+    ('ix_workout_sessions_user_date', 'workout_sessions', ['user_id', 'date']),
+    ('ix_water_intake_user_date', 'water_intake', ['user_id', 'date']),
+    ('ix_body_metrics_user_date', 'body_metrics', ['user_id', 'date']),
+    ('ix_meal_foods_meal_id', 'meal_foods', ['meal_id']),
+    ('ix_workout_exercises_session_id', 'workout_exercises', ['session_id']),
+    ('ix_exercise_sets_workout_exercise_id', 'exercise_sets', ['workout_exercise_id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
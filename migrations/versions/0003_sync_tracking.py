@@ -0,0 +1,63 @@
+"""updated_at columns and tombstones for delta sync
+
+Existing rows get a constant 1970-01-01 updated_at so the column can be
+added without rewriting the tables; they only show up in a client's first
+(full) sync, which is the only sync that needs them. New rows always get
+their value from the application.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 07:10:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = ['user_profiles', 'body_metrics', 'workout_sessions', 'meal_logs', 'water_intake', 'goals']
+
+INDEXES = [
+    ('ix_body_metrics_user_updated', 'body_metrics'),
+    ('ix_workout_sessions_user_updated', 'workout_sessions'),
+    ('ix_meal_logs_user_updated', 'meal_logs'),
+    ('ix_water_intake_user_updated', 'water_intake'),
+    ('ix_goals_user_updated', 'goals'),
+]
+
+
+def upgrade():
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(), nullable=False,
+                                       server_default=sa.text("'1970-01-01 00:00:00'")))
+
+    op.create_table('sync_tombstones',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=32), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=False),
+    sa.Column('deleted_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_tombstones_user_deleted', 'sync_tombstones', ['user_id', 'deleted_at', 'id'], unique=False)
+
+    with op.get_context().autocommit_block():
+        for name, table in INDEXES:
+            op.create_index(name, table, ['user_id', 'updated_at', 'id'],
+                            postgresql_concurrently=True, if_not_exists=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+    op.drop_index('ix_sync_tombstones_user_deleted', table_name='sync_tombstones')
+    op.drop_table('sync_tombstones')
+
+    for table in reversed(SYNCED_TABLES):
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,28 @@
+"""tracked goal progress columns
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 08:05:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('goals', sa.Column('baseline_value', sa.Float(), nullable=True))
+    op.add_column('goals', sa.Column('threshold_value', sa.Float(), nullable=True))
+    op.add_column('goals', sa.Column('progress_period', sa.Date(), nullable=True))
+    op.add_column('goals', sa.Column('achieved_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('goals', 'achieved_at')
+    op.drop_column('goals', 'progress_period')
+    op.drop_column('goals', 'threshold_value')
+    op.drop_column('goals', 'baseline_value')
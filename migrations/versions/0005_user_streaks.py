@@ -0,0 +1,38 @@
+"""user streak state
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:20:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_streaks',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('logging_current', sa.Integer(), nullable=False),
+        sa.Column('logging_longest', sa.Integer(), nullable=False),
+        sa.Column('logging_last', sa.Date(), nullable=True),
+        sa.Column('workout_current', sa.Integer(), nullable=False),
+        sa.Column('workout_longest', sa.Integer(), nullable=False),
+        sa.Column('workout_last', sa.Date(), nullable=True),
+        sa.Column('window_end', sa.Date(), nullable=True),
+        sa.Column('logged_mask', sa.Integer(), nullable=False),
+        sa.Column('adherent_mask', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    # Existing users are filled in by `python -m app.streaks` after upgrading
+
+
+def downgrade():
+    op.drop_table('user_streaks')
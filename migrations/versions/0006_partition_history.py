@@ -0,0 +1,157 @@
+"""monthly partitions for meal_foods, exercise_sets and water_intake
+
+meal_foods and exercise_sets get a `date` column copied from their meal /
+workout so all three tables share a partition key, plus history_archive
+for the archival job in app/partitioning.py.
+
+On PostgreSQL each table is rebuilt as a RANGE (date) partitioned table
+with one partition per month that has data, PARTITION_MONTHS_AHEAD empty
+future months and a default partition. The primary key becomes
+(id, date), since a partitioned table's unique keys must include the
+partition key; ids still come from the same sequence. The rows are copied,
+so this takes an exclusive lock on the three tables for the duration:
+run it in a maintenance window. Other databases only get the new columns.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 11:40:00
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+PARTITION_MONTHS_AHEAD = 3
+
+# table -> (expression for the partition key, FROM clause for the copy, foreign keys, indexes)
+TABLES = {
+    'meal_foods': (
+        'meal_logs.date',
+        'meal_foods_old AS src JOIN meal_logs ON meal_logs.id = src.meal_id',
+        [('meal_foods_meal_id_fkey', 'meal_id', 'meal_logs'),
+         ('meal_foods_food_id_fkey', 'food_id', 'food_database')],
+        [('ix_meal_foods_id', ['id']), ('ix_meal_foods_meal_id', ['meal_id'])],
+    ),
+    'exercise_sets': (
+        'workout_sessions.date',
+        'exercise_sets_old AS src'
+        ' JOIN workout_exercises ON workout_exercises.id = src.workout_exercise_id'
+        ' JOIN workout_sessions ON workout_sessions.id = workout_exercises.session_id',
+        [('exercise_sets_workout_exercise_id_fkey', 'workout_exercise_id', 'workout_exercises')],
+        [('ix_exercise_sets_id', ['id']), ('ix_exercise_sets_workout_exercise_id', ['workout_exercise_id'])],
+    ),
+    'water_intake': (
+        'src.date',
+        'water_intake_old AS src',
+        [('water_intake_user_id_fkey', 'user_id', 'users')],
+        [('ix_water_intake_id', ['id']), ('ix_water_intake_user_date', ['user_id', 'date']),
+         ('ix_water_intake_user_updated', ['user_id', 'updated_at', 'id'])],
+    ),
+}
+
+BACKFILL = {
+    'meal_foods': 'SELECT meal_logs.date FROM meal_logs WHERE meal_logs.id = meal_foods.meal_id',
+    'exercise_sets': 'SELECT workout_sessions.date FROM workout_exercises'
+                     ' JOIN workout_sessions ON workout_sessions.id = workout_exercises.session_id'
+                     ' WHERE workout_exercises.id = exercise_sets.workout_exercise_id',
+}
+
+
+def _add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _swap_table(table, partitioned, select_date, source):
+    """Rebuild `table` (as partitioned or plain) by copying it; keeps its id sequence."""
+    bind = op.get_bind()
+    legacy = f'{table}_old'
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    if 'date' not in [column['name'] for column in sa.inspect(bind).get_columns(legacy)]:
+        op.execute(f'ALTER TABLE {legacy} ADD COLUMN date DATE')
+    columns = [column['name'] for column in sa.inspect(bind).get_columns(legacy) if column['name'] != 'date']
+    sequence = bind.execute(sa.text(f"SELECT pg_get_serial_sequence('{legacy}', 'id')")).scalar()
+
+    suffix = ' PARTITION BY RANGE (date)' if partitioned else ''
+    op.execute(f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS){suffix}')
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN date SET NOT NULL')
+
+    if partitioned:
+        first = bind.execute(sa.text(f'SELECT min({select_date}) FROM {source}')).scalar() or date.today()
+        month = first.replace(day=1)
+        last = _add_months(date.today().replace(day=1), PARTITION_MONTHS_AHEAD)
+        while month <= last:
+            op.execute(
+                f"CREATE TABLE {table}_y{month.year}m{month.month:02d} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+            )
+            month = _add_months(month, 1)
+        op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+    names = ', '.join(f'"{name}"' for name in columns)
+    op.execute(f'INSERT INTO {table} ({names}, date) '
+               f'SELECT {", ".join(f"src.{name}" for name in columns)}, {select_date} FROM {source}')
+
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+    op.execute(f'DROP TABLE {legacy}')
+    op.execute(f'ALTER SEQUENCE {sequence} OWNED BY {table}.id')
+
+
+def _add_constraints(table, primary_key, foreign_keys, indexes):
+    op.create_primary_key(f'{table}_pkey', table, primary_key)
+    for name, column, parent in foreign_keys:
+        op.create_foreign_key(name, table, parent, [column], ['id'])
+    for name, columns in indexes:
+        op.create_index(name, table, columns, unique=False)
+
+
+def upgrade():
+    op.create_table('history_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('table_name', sa.String(length=32), nullable=False),
+    sa.Column('month', sa.Date(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_history_archive_table_month', 'history_archive', ['table_name', 'month'], unique=False)
+    op.create_index('ix_history_archive_user', 'history_archive', ['user_id', 'table_name', 'month'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, (select_date, source, foreign_keys, indexes) in TABLES.items():
+            _swap_table(table, True, select_date, source)
+            _add_constraints(table, ['id', 'date'], foreign_keys, indexes)
+        return
+
+    for table, backfill in BACKFILL.items():
+        op.add_column(table, sa.Column('date', sa.Date(), nullable=True))
+        op.execute(f'UPDATE {table} SET date = ({backfill})')
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column('date', existing_type=sa.Date(), nullable=False)
+
+
+def downgrade():
+    # Archived months are not restored; run `python -m app.partitioning restore` first
+    if op.get_bind().dialect.name == 'postgresql':
+        for table, (_, _, foreign_keys, indexes) in TABLES.items():
+            _swap_table(table, False, 'src.date', f'{table}_old AS src')
+            _add_constraints(table, ['id'], foreign_keys, indexes)
+        for table in BACKFILL:
+            op.drop_column(table, 'date')
+    else:
+        for table in BACKFILL:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.drop_column('date')
+
+    op.drop_index('ix_history_archive_user', table_name='history_archive')
+    op.drop_index('ix_history_archive_table_month', table_name='history_archive')
+    op.drop_table('history_archive')
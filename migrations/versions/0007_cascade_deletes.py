@@ -0,0 +1,85 @@
+"""ON DELETE CASCADE for user history
+
+Rows owned by a user, and meal entries / workout exercises / sets owned by
+their meal or workout, are now deleted by the database with their parent.
+References to shared rows (food_database, exercise_library) are unchanged.
+
+On PostgreSQL the new constraints on ordinary tables are added NOT VALID
+and validated afterwards outside the migration's transaction, so the
+existing rows are checked without blocking writes. Partitioned tables
+don't support NOT VALID and are checked while the constraint is added.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 13:05:00
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# (table, column, parent table); constraints use PostgreSQL's default names
+FOREIGN_KEYS = [
+    ('user_profiles', 'user_id', 'users'),
+    ('body_metrics', 'user_id', 'users'),
+    ('workout_sessions', 'user_id', 'users'),
+    ('workout_exercises', 'session_id', 'workout_sessions'),
+    ('exercise_sets', 'workout_exercise_id', 'workout_exercises'),
+    ('meal_logs', 'user_id', 'users'),
+    ('meal_foods', 'meal_id', 'meal_logs'),
+    ('water_intake', 'user_id', 'users'),
+    ('goals', 'user_id', 'users'),
+    ('sync_tombstones', 'user_id', 'users'),
+    ('user_streaks', 'user_id', 'users'),
+    ('history_archive', 'user_id', 'users'),
+]
+
+# Lets batch mode name SQLite's unnamed foreign keys the way PostgreSQL does
+NAMING_CONVENTION = {"fk": "%(table_name)s_%(column_0_name)s_fkey"}
+
+
+def _is_partitioned(bind, table):
+    return bind.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid"
+        " WHERE c.relname = :table AND pg_table_is_visible(c.oid))"
+    ), {"table": table}).scalar()
+
+
+def _replace_foreign_keys(ondelete):
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        for table, column, parent in FOREIGN_KEYS:
+            name = f'{table}_{column}_fkey'
+            with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+                batch_op.drop_constraint(name, type_='foreignkey')
+                batch_op.create_foreign_key(name, parent, [column], ['id'], ondelete=ondelete)
+        return
+
+    to_validate = []
+    for table, column, parent in FOREIGN_KEYS:
+        name = f'{table}_{column}_fkey'
+        not_valid = not _is_partitioned(bind, table)
+        op.drop_constraint(name, table, type_='foreignkey')
+        op.execute(
+            f'ALTER TABLE {table} ADD CONSTRAINT {name} FOREIGN KEY ({column}) REFERENCES {parent} (id)'
+            + (f' ON DELETE {ondelete}' if ondelete else '')
+            + (' NOT VALID' if not_valid else '')
+        )
+        if not_valid:
+            to_validate.append((table, name))
+
+    with op.get_context().autocommit_block():
+        for table, name in to_validate:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {name}')
+
+
+def upgrade():
+    _replace_foreign_keys('CASCADE')
+
+
+def downgrade():
+    _replace_foreign_keys(None)
@@ -0,0 +1,49 @@
+"""food base units and nutrient densities
+
+Adds each food's serving size in grams or ml and its nutrients per gram /
+ml (parsed from serving_unit by app/units.py), plus the logged amount on
+meal entries, and fills both for existing rows.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 15:40:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.units import DENSITY_COLUMNS, NUTRIENTS, normalize_foods
+
+
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('food_database', sa.Column('base_unit', sa.String(length=2), nullable=True))
+    op.add_column('food_database', sa.Column('base_amount', sa.Float(), nullable=True))
+    for column in DENSITY_COLUMNS.values():
+        op.add_column('food_database', sa.Column(column, sa.Float(), nullable=True))
+    op.add_column('meal_foods', sa.Column('amount', sa.Float(), nullable=True))
+
+    foods = sa.table(
+        'food_database',
+        sa.column('id', sa.Integer()), sa.column('serving_size', sa.Float()),
+        sa.column('serving_unit', sa.String()), sa.column('base_unit', sa.String()),
+        sa.column('base_amount', sa.Float()),
+        *(sa.column(name, sa.Float()) for name in (*NUTRIENTS, *DENSITY_COLUMNS.values()))
+    )
+    normalize_foods(op.get_bind(), foods)
+    op.execute(
+        "UPDATE meal_foods SET amount = COALESCE(servings, 1) * "
+        "(SELECT base_amount FROM food_database WHERE food_database.id = meal_foods.food_id)"
+    )
+
+
+def downgrade():
+    op.drop_column('meal_foods', 'amount')
+    for column in reversed(list(DENSITY_COLUMNS.values())):
+        op.drop_column('food_database', column)
+    op.drop_column('food_database', 'base_amount')
+    op.drop_column('food_database', 'base_unit')
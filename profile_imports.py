@@ -0,0 +1,88 @@
+"""
+Profile import time of the app (a digest of `python -X importtime`).
+
+Usage:
+    python profile_imports.py                    # profile `import app.main`
+    python profile_imports.py --module app.auth  # profile another module
+    python profile_imports.py --top 30 --runs 5  # more rows, best of 5 runs
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def run_importtime(module: str) -> dict:
+    """Import `module` in a fresh interpreter; return {name: (self_us, cumulative_us, depth)}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"❌ import {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            timings[name] = (int(self_us), int(cumulative_us), len(indent) // 2)
+    return timings
+
+
+def best_of(module: str, runs: int) -> dict:
+    """Per-module minimum over several runs, to smooth out disk cache noise."""
+    best = {}
+    for _ in range(runs):
+        for name, timing in run_importtime(module).items():
+            if name not in best or timing[1] < best[name][1]:
+                best[name] = timing
+    return best
+
+
+def by_package(timings: dict) -> dict:
+    """Self time summed per top-level package."""
+    totals = defaultdict(int)
+    for name, (self_us, _, _) in timings.items():
+        totals[name.split(".")[0]] += self_us
+    return totals
+
+
+def print_table(title: str, rows, total_us: int):
+    print(f"\n{title}")
+    for name, us in rows:
+        print(f"  {us / 1000:9.1f} ms  {100 * us / total_us:5.1f}%  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Digest of `python -X importtime` for the app")
+    parser.add_argument("--module", default="app.main", help="Module to import (default: app.main)")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    parser.add_argument("--runs", type=int, default=3, help="Runs to take the best timing from")
+    args = parser.parse_args()
+
+    timings = best_of(args.module, args.runs)
+    total_us = timings[args.module][1]
+    print(f"⏱️  import {args.module}: {total_us / 1000:.1f} ms "
+          f"({len(timings)} modules, best of {args.runs})")
+
+    direct = [(name, t[1]) for name, t in timings.items() if t[2] == 1]
+    print_table("Direct imports by cumulative time:",
+                sorted(direct, key=lambda r: -r[1])[:args.top], total_us)
+    print_table("Top-level packages by self time:",
+                sorted(by_package(timings).items(), key=lambda r: -r[1])[:args.top], total_us)
+    print_table("Slowest single modules (self time):",
+                sorted(((n, t[0]) for n, t in timings.items()), key=lambda r: -r[1])[:args.top], total_us)
+
+    app_modules = sorted((n, t[1]) for n, t in timings.items() if n.startswith("app."))
+    print_table("App modules (cumulative):", app_modules, total_us)
+
+
+if __name__ == "__main__":
+    main()
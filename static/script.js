@@ -3,6 +3,9 @@ let token = localStorage.getItem('token');
 let currentUser = null;
 let weightChart = null;
 let nutritionChart = null;
+let dashboardData = null;
+let liveUpdates = null;
+let bootstrapProfile;  // profile from /bootstrap, used once by the settings view
 
 // API Helper Function
 async function apiRequest(endpoint, options = {}) {
@@ -119,8 +122,11 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 function logout() {
+    disconnectLiveUpdates();
     token = null;
     currentUser = null;
+    dashboardData = null;
+    bootstrapProfile = undefined;
     localStorage.removeItem('token');
     document.getElementById('auth-section').style.display = 'block';
     document.getElementById('app-section').style.display = 'none';
@@ -128,13 +134,17 @@ function logout() {
 
 async function loadApp() {
     try {
-        currentUser = await apiRequest('/users/me');
+        // One round trip for everything the first screen needs
+        const boot = await apiRequest('/bootstrap?fields=user,profile,dashboard,body_metrics');
+        currentUser = boot.user;
+        bootstrapProfile = boot.profile;
         document.getElementById('username-display').textContent = currentUser.username;
         document.getElementById('auth-section').style.display = 'none';
         document.getElementById('app-section').style.display = 'block';
         
         setupNavigation();
-        loadDashboard();
+        showDashboard(boot.dashboard, boot.body_metrics);
+        connectLiveUpdates();
     } catch (error) {
         logout();
     }
@@ -164,7 +174,9 @@ function switchView(viewName) {
     document.getElementById(`${viewName}-view`).classList.add('active');
 
     // Load view data
-    if (viewName === 'dashboard') loadDashboard();
+    if (viewName === 'dashboard') {
+        if (!isLive() || !dashboardData || dashboardData.loadedFor !== todayISO()) loadDashboard();
+    }
     else if (viewName === 'meals') loadMeals();
     else if (viewName === 'workouts') loadWorkouts();
     else if (viewName === 'progress') loadProgress();
@@ -177,31 +189,92 @@ function switchView(viewName) {
 // ===== DASHBOARD =====
 async function loadDashboard() {
     try {
-        const data = await apiRequest('/dashboard');
-        
-        document.getElementById('calories-today').textContent = data.total_calories_today;
-        document.getElementById('calorie-target').textContent = data.calories_target || '--';
-        document.getElementById('workouts-week').textContent = data.workouts_this_week;
-        const waterOz = Math.round(data.total_water_today / 29.5735);
-        document.getElementById('water-today').textContent = `${waterOz} oz`;
-        const weightLbs = data.current_weight ? Math.round(data.current_weight * 2.20462 * 10) / 10 : null;
-        document.getElementById('current-weight').textContent = weightLbs ? `${weightLbs} lbs` : '--';
-        document.getElementById('goal-weight').textContent = data.goal_weight || '--';
-        
-        // Load charts
-        loadWeightChart();
-        loadNutritionChart(data);
+        showDashboard(await apiRequest('/dashboard'));
     } catch (error) {
         showToast('Error loading dashboard', true);
     }
 }
 
-async function loadWeightChart() {
+function showDashboard(data, weightMetrics) {
+    data.loadedFor = todayISO();
+    dashboardData = data;
+    renderDashboardTiles(data);
+    
+    // Load charts
+    loadWeightChart(weightMetrics);
+    loadNutritionChart(data);
+}
+
+function renderDashboardTiles(data) {
+    document.getElementById('calories-today').textContent = Math.round(data.total_calories_today);
+    document.getElementById('calorie-target').textContent = data.calories_target || '--';
+    document.getElementById('workouts-week').textContent = data.workouts_this_week;
+    const waterOz = Math.round(data.total_water_today / 29.5735);
+    document.getElementById('water-today').textContent = `${waterOz} oz`;
+    const weightLbs = data.current_weight ? Math.round(data.current_weight * 2.20462 * 10) / 10 : null;
+    document.getElementById('current-weight').textContent = weightLbs ? `${weightLbs} lbs` : '--';
+    document.getElementById('goal-weight').textContent = data.goal_weight || '--';
+}
+
+// Reload the dashboard only when live updates aren't keeping it current
+function refreshDashboard() {
+    if (!isLive()) loadDashboard();
+}
+
+function todayISO() {
+    return new Date().toISOString().split('T')[0];
+}
+
+// ===== LIVE UPDATES (Server-Sent Events) =====
+function connectLiveUpdates() {
+    if (!window.EventSource || liveUpdates || !token) return;
+    let reconnecting = false;
+    liveUpdates = new EventSource(`/events/dashboard?token=${encodeURIComponent(token)}`);
+    liveUpdates.addEventListener('delta', (e) => applyDashboardDelta(JSON.parse(e.data)));
+    liveUpdates.addEventListener('resync', () => loadDashboard());
+    // Deltas sent while disconnected are lost, so reload once after reconnecting
+    liveUpdates.onopen = () => {
+        if (reconnecting) loadDashboard();
+        reconnecting = false;
+    };
+    liveUpdates.onerror = () => { reconnecting = true; };
+}
+
+function disconnectLiveUpdates() {
+    if (liveUpdates) liveUpdates.close();
+    liveUpdates = null;
+}
+
+function isLive() {
+    return liveUpdates !== null && liveUpdates.readyState === EventSource.OPEN;
+}
+
+function applyDashboardDelta(event) {
+    if (!dashboardData || dashboardData.loadedFor !== todayISO()) return;
+    const delta = event.delta;
+    const weekAgo = new Date(Date.now() - 7 * 86400000).toISOString().split('T')[0];
+    
+    if (event.date === dashboardData.loadedFor) {
+        dashboardData.total_calories_today += delta.calories || 0;
+        dashboardData.total_protein_today += delta.protein_g || 0;
+        dashboardData.total_carbs_today += delta.carbs_g || 0;
+        dashboardData.total_fats_today += delta.fats_g || 0;
+        dashboardData.total_water_today += delta.water_ml || 0;
+        if (delta.protein_g || delta.carbs_g || delta.fats_g) loadNutritionChart(dashboardData);
+    }
+    if (event.date >= weekAgo) {
+        dashboardData.workouts_this_week += delta.workouts || 0;
+    }
+    renderDashboardTiles(dashboardData);
+}
+
+async function loadWeightChart(metrics) {
     try {
-        const endDate = new Date().toISOString().split('T')[0];
-        const startDate = new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0];
-        
-        const metrics = await apiRequest(`/body-metrics?start_date=${startDate}&end_date=${endDate}`);
+        if (!metrics) {
+            const endDate = new Date().toISOString().split('T')[0];
+            const startDate = new Date(Date.now() - 30 * 24 * 60 * 60 * 1000).toISOString().split('T')[0];
+            metrics = await apiRequest(`/body-metrics?start_date=${startDate}&end_date=${endDate}`);
+        }
         
         const ctx = document.getElementById('weightChart');
         if (weightChart) weightChart.destroy();
@@ -433,7 +506,7 @@ async function submitQuickMeal(e) {
         
         showToast('Meal logged successfully!');
         closeModal();
-        loadDashboard();
+        refreshDashboard();
         if (typeof loadMeals === 'function') loadMeals();
     } catch (error) {
         console.error('Error logging meal:', error);
@@ -461,7 +534,7 @@ async function submitQuickWorkout(e) {
         
         showToast('Workout logged successfully!');
         closeModal();
-        loadDashboard();
+        refreshDashboard();
     } catch (error) {
         showToast('Error logging workout: ' + error.message, true);
     }
@@ -489,7 +562,7 @@ async function submitQuickWater(e) {
         
         showToast('Water intake logged!');
         closeModal();
-        loadDashboard();
+        refreshDashboard();
     } catch (error) {
         console.error('Water logging error:', error);
         const errorMsg = error.message || JSON.stringify(error);
@@ -595,7 +668,7 @@ async function loadMeals() {
     
     try {
         const today = new Date().toISOString().split('T')[0];
-        const meals = await apiRequest(`/meals?start_date=${today}&end_date=${today}`);
+        const meals = await apiRequest(`/meals?start_date=${today}&end_date=${today}&fields=meal_type,date,notes`);
         
         if (meals.length === 0) {
             container.innerHTML = '<p style="text-align: center; color: var(--text-muted);">No meals logged today. Use the AI parser or quick log to add meals!</p>';
@@ -631,7 +704,7 @@ async function deleteMeal(id) {
         await apiRequest(`/meals/${id}`, { method: 'DELETE' });
         showToast('Meal deleted');
         loadMeals();
-        loadDashboard();
+        refreshDashboard();
     } catch (error) {
         console.error('Delete meal error:', error);
         // Don't show error - reload to reflect actual state
@@ -646,7 +719,7 @@ async function loadWorkouts() {
     container.innerHTML = '<p class="loading">Loading workouts...</p>';
     
     try {
-        const workouts = await apiRequest('/workouts');
+        const workouts = await apiRequest('/workouts?fields=name,date,duration_minutes,total_calories_burned');
         
         if (workouts.length === 0) {
             container.innerHTML = '<p style="text-align: center; color: var(--text-muted);">No workouts yet. Use the AI parser or quick log to add workouts!</p>';
@@ -681,7 +754,7 @@ async function deleteWorkout(id) {
         await apiRequest(`/workouts/${id}`, { method: 'DELETE' });
         showToast('Workout deleted');
         loadWorkouts();
-        loadDashboard();
+        refreshDashboard();
     } catch (error) {
         console.error('Delete workout error:', error);
         // Don't show error - reload to reflect actual state
@@ -799,7 +872,13 @@ function showGoalForm() {
         <form onsubmit="submitGoal(event)">
             <div class="form-group">
                 <label>Goal Type</label>
-                <input type="text" id="goal-type" placeholder="e.g., Reach 75kg, Run 5k under 25min" required>
+                <input type="text" id="goal-type" list="goal-type-options" placeholder="e.g., weight_target, or Run 5k under 25min" required>
+                <datalist id="goal-type-options">
+                    <option value="weight_target">Reach a weight (kg), tracked from body metrics</option>
+                    <option value="weekly_workouts">Workouts per week, tracked automatically</option>
+                    <option value="daily_protein">Protein per day (g), tracked from meals</option>
+                    <option value="water_streak">Days in a row hitting a water amount</option>
+                </datalist>
             </div>
             <div class="form-group">
                 <label>Target Value</label>
@@ -809,6 +888,10 @@ function showGoalForm() {
                 <label>Current Value</label>
                 <input type="number" id="goal-current" step="0.1" value="0">
             </div>
+            <div class="form-group">
+                <label>Daily Water Amount in ml (water_streak only)</label>
+                <input type="number" id="goal-threshold" step="50" placeholder="2000">
+            </div>
             <div class="form-group">
                 <label>Target Date (Optional)</label>
                 <input type="date" id="goal-date">
@@ -828,6 +911,7 @@ async function submitGoal(e) {
     const targetValue = parseFloat(document.getElementById('goal-target').value);
     const currentValue = parseFloat(document.getElementById('goal-current').value);
     const targetDate = document.getElementById('goal-date').value;
+    const threshold = parseFloat(document.getElementById('goal-threshold').value);
     
     try {
         await apiRequest('/goals', {
@@ -837,7 +921,8 @@ async function submitGoal(e) {
                 target_value: targetValue,
                 current_value: currentValue,
                 start_date: new Date().toISOString().split('T')[0],
-                target_date: targetDate || null
+                target_date: targetDate || null,
+                threshold_value: threshold || null
             })
         });
         
@@ -1123,12 +1208,7 @@ async function loadWeeklySummary() {
             apiRequest(`/water?start_date=${startDate}&end_date=${endDate}`)
         ]);
         
-        let totalCalories = 0;
-        meals.forEach(meal => {
-            meal.foods.forEach(mf => {
-                totalCalories += mf.food.calories * mf.servings;
-            });
-        });
+        const totalCalories = meals.reduce((sum, meal) => sum + (meal.total_calories || 0), 0);
         
         const totalWorkouts = workouts.length;
         const totalWater = water.reduce((sum, w) => sum + w.amount_ml, 0);
@@ -1244,7 +1324,9 @@ async function loadSettings() {
     
     // Load profile data
     try {
-        const profile = await apiRequest('/profile');
+        const profile = bootstrapProfile !== undefined ? bootstrapProfile : await apiRequest('/profile');
+        bootstrapProfile = undefined;
+        if (!profile) throw new Error('No profile');
         
         if (profile.date_of_birth) document.getElementById('profile-dob').value = profile.date_of_birth;
         if (profile.height_cm) document.getElementById('profile-height').value = profile.height_cm;
@@ -1346,8 +1428,7 @@ async function exportData(type) {
 function convertMealsToCSV(meals) {
     let csv = 'Date,Meal Type,Notes,Total Calories\n';
     meals.forEach(meal => {
-        const totalCals = meal.foods.reduce((sum, mf) => sum + (mf.food.calories * mf.servings), 0);
-        csv += `${meal.date},${meal.meal_type},"${meal.notes || ''}",${totalCals}\n`;
+        csv += `${meal.date},${meal.meal_type},"${meal.notes || ''}",${Math.round(meal.total_calories || 0)}\n`;
     });
     return csv;
 }
@@ -0,0 +1,39 @@
+"""API tests using the transactional client fixtures."""
+from app.database import User
+
+
+def test_register_and_login(client, auth_headers):
+    """Test a registered user can authenticate."""
+    response = client.get("/users/me", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "testuser"
+
+
+def test_writes_are_rolled_back_between_tests(db):
+    """Test the user from the previous test is gone."""
+    assert db.query(User).filter(User.username == "testuser").count() == 0
+
+
+def test_meal_totals_are_cached(client, auth_headers):
+    """Test logging a meal stores per-meal totals."""
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Oats", "serving_size": 40, "serving_unit": "g", "calories": 150, "protein_g": 5
+    }).json()
+    response = client.post("/meals", headers=auth_headers, json={
+        "date": "2024-01-01", "meal_type": "breakfast",
+        "foods": [{"food_id": food["id"], "servings": 2}]
+    })
+    assert response.status_code == 201
+    assert response.json()["total_calories"] == 300
+    assert response.json()["total_protein_g"] == 10
+
+
+def test_missing_food_does_not_leave_a_meal(client, auth_headers, db):
+    """Test a failed request's partial writes are discarded."""
+    from app.database import MealLog
+
+    response = client.post("/meals", headers=auth_headers, json={
+        "date": "2024-01-01", "meal_type": "lunch", "foods": [{"food_id": 999999, "servings": 1}]
+    })
+    assert response.status_code == 404
+    assert db.query(MealLog).count() == 0
@@ -0,0 +1,52 @@
+"""Tests for the bootstrap endpoint."""
+import asyncio
+from datetime import date
+
+from app.bootstrap import load_bootstrap
+from app.database import BodyMetric, Goal, User
+
+
+def test_bootstrap_returns_all_sections(client, auth_headers):
+    """Test one request carries user, profile, dashboard, metrics and active goals."""
+    client.post("/water", headers=auth_headers, json={"date": date.today().isoformat(), "amount_ml": 750})
+    client.post("/body-metrics", headers=auth_headers, json={"date": date.today().isoformat(), "weight_kg": 80})
+    client.post("/goals", headers=auth_headers, json={
+        "goal_type": "lose_weight", "target_value": 75, "start_date": "2024-01-01"
+    })
+
+    data = client.get("/bootstrap", headers=auth_headers).json()
+    assert data["user"]["username"] == "testuser"
+    assert data["profile"] is None
+    assert data["dashboard"]["total_water_today"] == 750
+    assert [m["weight_kg"] for m in data["body_metrics"]] == [80]
+    assert [g["goal_type"] for g in data["goals"]] == ["lose_weight"]
+
+
+def test_bootstrap_field_selection(client, auth_headers):
+    """Test `fields` limits the payload and rejects unknown sections."""
+    data = client.get("/bootstrap", headers=auth_headers, params={"fields": "user,dashboard"}).json()
+    assert set(data) == {"user", "dashboard"}
+
+    response = client.get("/bootstrap", headers=auth_headers, params={"fields": "user,passwords"})
+    assert response.status_code == 400
+
+
+def test_sections_load_concurrently_on_separate_sessions(session_factory):
+    """Test the pooled path, where each section gets its own session."""
+    db = session_factory()
+    user = User(username="pooled", email="pooled@example.com", hashed_password="x")
+    db.add(user)
+    db.flush()
+    db.add_all([
+        BodyMetric(user_id=user.id, date=date.today(), weight_kg=70),
+        Goal(user_id=user.id, goal_type="maintain", target_value=70, start_date=date.today()),
+    ])
+    db.commit()
+
+    payload = asyncio.run(load_bootstrap(db, user, ["user", "dashboard", "body_metrics", "goals"]))
+    db.close()
+
+    assert payload["user"].username == "pooled"
+    assert payload["dashboard"]["workouts_this_week"] == 0
+    assert [m.weight_kg for m in payload["body_metrics"]] == [70]
+    assert [g.goal_type for g in payload["goals"]] == ["maintain"]
@@ -0,0 +1,74 @@
+"""Unit tests for bulk loading helpers (run against SQLite)."""
+from sqlalchemy import func, select
+
+import generate_data
+from app.bulk import BulkWriter, _copy_value
+from app.database import FoodDatabase, MealFood, MealLog, MealType
+
+
+def _food_rows(count):
+    for i in range(count):
+        yield {
+            "id": i + 1, "name": f"Food {i}", "brand": None, "serving_size": 100,
+            "serving_unit": "grams", "calories": 100 + i, "protein_g": 1.0,
+            "carbs_g": 2.0, "fats_g": 3.0, "fiber_g": 0.0, "is_custom": False,
+        }
+
+
+def test_bulk_writer_batches_rows(sqlite_engine):
+    """Test rows are written across several batches."""
+    flushes = []
+    with BulkWriter(sqlite_engine, batch_size=10, on_flush=flushes.append) as writer:
+        writer.add_table(FoodDatabase.__table__)
+        writer.add_many(FoodDatabase.__table__, _food_rows(25))
+
+    with sqlite_engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(FoodDatabase.__table__)) == 25
+    assert len(flushes) == 3
+    assert writer.counts["food_database"] == 25
+
+
+def test_bulk_writer_is_idempotent(sqlite_engine):
+    """Test loading the same rows twice does not duplicate them."""
+    for _ in range(2):
+        with BulkWriter(sqlite_engine, batch_size=7) as writer:
+            writer.add_table(FoodDatabase.__table__)
+            writer.add_many(FoodDatabase.__table__, _food_rows(20))
+
+    with sqlite_engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(FoodDatabase.__table__)) == 20
+
+
+def test_bulk_writer_upserts_update_columns(sqlite_engine):
+    """Test conflicting rows update the requested columns."""
+    with BulkWriter(sqlite_engine) as writer:
+        writer.add_table(FoodDatabase.__table__, conflict_columns=["id"], update_columns=["calories"])
+        writer.add_many(FoodDatabase.__table__, _food_rows(3))
+    with BulkWriter(sqlite_engine) as writer:
+        writer.add_table(FoodDatabase.__table__, conflict_columns=["id"], update_columns=["calories"])
+        writer.add_many(FoodDatabase.__table__, ({**row, "calories": 999} for row in _food_rows(3)))
+
+    with sqlite_engine.connect() as conn:
+        calories = conn.scalars(select(FoodDatabase.calories)).all()
+    assert calories == [999, 999, 999]
+
+
+def test_copy_value_conversion():
+    """Test values are converted to COPY text."""
+    assert _copy_value(None) == "\\N"
+    assert _copy_value(True) == "t"
+    assert _copy_value(MealType.LUNCH) == "LUNCH"
+
+
+def test_generated_meals_carry_nutrition(sqlite_engine, session_factory, monkeypatch):
+    """Test the generator fills entry snapshots and meal totals that COPY's skipped defaults would leave NULL."""
+    monkeypatch.setattr(generate_data, "engine", sqlite_engine)
+    monkeypatch.setattr(generate_data, "SessionLocal", session_factory)
+    generate_data.main(["--users", "2", "--foods", "20", "--exercises", "5", "--days", "3", "--id-offset", "1"])
+
+    with sqlite_engine.connect() as conn:
+        meals = conn.execute(select(MealLog.id, MealLog.total_calories)).all()
+        assert meals and all(total is not None for _, total in meals)
+        assert conn.execute(select(func.count()).where(MealFood.calories.is_(None))).scalar() == 0
+        sums = dict(conn.execute(select(MealFood.meal_id, func.sum(MealFood.calories)).group_by(MealFood.meal_id)).all())
+    assert all(abs(sums[meal_id] - total) < 0.05 for meal_id, total in meals)
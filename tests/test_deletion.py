@@ -0,0 +1,68 @@
+"""Tests for cascading and batched deletes."""
+from datetime import date
+
+from app.database import ExerciseCategory, ExerciseLibrary, ExerciseSet, MealFood, User, WorkoutExercise
+from app.deletion import delete_history
+
+
+def log_history(client, auth_headers, db, day):
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Toast", "serving_size": 30, "serving_unit": "g", "calories": 80
+    }).json()
+    exercise = ExerciseLibrary(name="Squat", category=ExerciseCategory.STRENGTH)
+    db.add(exercise)
+    db.flush()
+    meal = client.post("/meals", headers=auth_headers, json={
+        "date": day, "meal_type": "breakfast", "foods": [{"food_id": food["id"], "servings": 2}]
+    }).json()
+    workout = client.post("/workouts", headers=auth_headers, json={
+        "name": "Legs", "date": day,
+        "exercises": [{"exercise_id": exercise.id, "sets": [{"set_number": 1, "reps": 5}]}]
+    }).json()
+    client.post("/water", headers=auth_headers, json={"date": day, "amount_ml": 500})
+    return meal, workout
+
+
+def test_deleting_a_meal_or_workout_removes_its_children(client, auth_headers, db):
+    """Test single deletes succeed for meals with foods and workouts with sets."""
+    meal, workout = log_history(client, auth_headers, db, "2024-02-01")
+
+    assert client.delete(f"/meals/{meal['id']}", headers=auth_headers).status_code == 204
+    assert client.delete(f"/workouts/{workout['id']}", headers=auth_headers).status_code == 204
+    assert db.query(MealFood).count() == 0
+    assert (db.query(WorkoutExercise).count(), db.query(ExerciseSet).count()) == (0, 0)
+
+
+def test_history_range_delete_in_batches(client, auth_headers, db):
+    """Test a date-range delete removes only that range and leaves sync tombstones."""
+    for day in ("2024-02-01", "2024-02-02", "2024-03-01"):
+        kept_meal, _ = log_history(client, auth_headers, db, day)
+    token = client.get("/sync", headers=auth_headers).json()["next_token"]
+
+    response = client.delete("/history", headers=auth_headers,
+                             params={"start_date": "2024-02-01", "end_date": "2024-02-29"})
+    assert response.json() == {"meals": 2, "workouts": 2, "water": 2, "body_metrics": 0}
+    assert [m["id"] for m in client.get("/meals", headers=auth_headers).json()] == [kept_meal["id"]]
+    assert db.query(ExerciseSet).count() == 1
+
+    deleted = client.get("/sync", headers=auth_headers, params={"since": token}).json()["deleted"]
+    assert (len(deleted["meals"]), len(deleted["workouts"]), len(deleted["water"])) == (2, 2, 2)
+
+    user_id = kept_meal["user_id"]
+    assert delete_history(db, user_id, date(2024, 1, 1), date(2024, 12, 31), ["meals"], batch_size=1) == {"meals": 1}
+
+    bad = client.delete("/history", headers=auth_headers,
+                        params={"start_date": "2024-01-01", "end_date": "2024-01-02", "kinds": "meals,steps"})
+    assert bad.status_code == 400
+
+
+def test_account_deletion_removes_all_history(client, auth_headers, db):
+    """Test DELETE /users/me removes the user and every row they own."""
+    meal, _ = log_history(client, auth_headers, db, "2024-02-01")
+    client.post("/goals", headers=auth_headers, json={"goal_type": "weekly_workouts", "target_value": 3,
+                                                      "start_date": "2024-01-01"})
+
+    assert client.delete("/users/me", headers=auth_headers).status_code == 204
+    assert db.get(User, meal["user_id"]) is None
+    assert db.query(MealFood).count() == 0 and db.query(ExerciseSet).count() == 0
+    assert client.get("/users/me", headers=auth_headers).status_code == 401
@@ -0,0 +1,116 @@
+"""Tests for the email outbox worker against a local fake Mailgun sink."""
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs
+
+import pytest
+
+from app import email_outbox, email_service
+from app.database import EmailOutbox, OutboxStatus
+
+
+class FakeMailgun(BaseHTTPRequestHandler):
+    """Records POSTed messages; answers with the server's configured status."""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"])).decode()
+        self.server.requests.append(parse_qs(body))
+        self.send_response(self.server.status_code)
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def mail_sink(monkeypatch):
+    server = HTTPServer(("127.0.0.1", 0), FakeMailgun)
+    server.requests = []
+    server.status_code = 200
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(email_service, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(email_service, "EMAIL_PROVIDER", "mailgun")
+    monkeypatch.setattr(email_service, "MAILGUN_API_BASE", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+
+
+def test_verification_email_is_queued_not_sent(mail_sink, session_factory):
+    """Test registration emails go to the outbox without contacting the provider."""
+    db = session_factory()
+    assert email_service.send_verification_email("a@example.com", "alice", "tok", db=db)
+    assert db.query(EmailOutbox).count() == 1
+    assert mail_sink.requests == []
+    db.close()
+
+
+def test_drain_batches_identical_messages(mail_sink, session_factory):
+    """Test identical messages share one provider call and are marked sent."""
+    db = session_factory()
+    for i in range(3):
+        email_outbox.enqueue_email(db, f"user{i}@example.com", "Weekly summary", "<p>Hi</p>")
+    email_outbox.enqueue_email(db, "other@example.com", "Verify", "<p>Link</p>")
+    db.close()
+
+    assert email_outbox.drain_outbox(session_factory) == 4
+
+    assert len(mail_sink.requests) == 2
+    assert sorted(mail_sink.requests[0]["to"]) == ["user0@example.com", "user1@example.com", "user2@example.com"]
+    db = session_factory()
+    assert {m.status for m in db.query(EmailOutbox)} == {OutboxStatus.SENT}
+    db.close()
+
+
+def test_failed_sends_back_off_then_give_up(mail_sink, session_factory, monkeypatch):
+    """Test provider failures are retried later and eventually marked failed."""
+    mail_sink.status_code = 500
+    monkeypatch.setattr(email_outbox, "EMAIL_MAX_ATTEMPTS", 2)
+    db = session_factory()
+    email_outbox.enqueue_email(db, "a@example.com", "Verify", "<p>Link</p>")
+    db.close()
+
+    assert email_outbox.drain_outbox(session_factory) == 0
+    db = session_factory()
+    message = db.query(EmailOutbox).one()
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.next_attempt_at > datetime.utcnow()
+
+    # Not due yet, so nothing is retried
+    assert email_outbox.drain_outbox(session_factory) == 0
+    assert len(mail_sink.requests) == 1
+
+    message.next_attempt_at = datetime.utcnow()
+    db.commit()
+    db.close()
+    email_outbox.drain_outbox(session_factory)
+    db = session_factory()
+    assert db.query(EmailOutbox).one().status == OutboxStatus.FAILED
+    db.close()
+
+
+def test_claims_commit_before_the_provider_is_called(session_factory, monkeypatch):
+    """Test sends run outside the claim's transaction and leased messages aren't claimed twice."""
+    db = session_factory()
+    email_outbox.enqueue_email(db, "a@example.com", "Verify", "<p>Link</p>")
+    db.close()
+    seen = []
+
+    def slow_provider(recipients, subject, html_content, text_content=None):
+        # Another worker sees the committed lease and finds nothing due
+        other = session_factory()
+        message = other.query(EmailOutbox).one()
+        seen.append((message.attempts, message.next_attempt_at > datetime.utcnow()))
+        other.close()
+        assert email_outbox.drain_outbox(session_factory) == 0
+        return True
+
+    monkeypatch.setattr(email_service, "send_batch", slow_provider)
+    assert email_outbox.drain_outbox(session_factory) == 1
+    assert seen == [(1, True)]
+    db = session_factory()
+    assert db.query(EmailOutbox).one().status == OutboxStatus.SENT
+    db.close()
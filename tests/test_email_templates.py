@@ -0,0 +1,29 @@
+"""Tests for the precompiled email templates."""
+from app.email_templates import TEMPLATES, CompiledTemplate, render_email
+
+
+def test_compiled_template_fills_fields():
+    """Test placeholders are replaced in order, including repeats."""
+    template = CompiledTemplate("<a href='{{ url }}'>{{url}}</a> for {{ name }}")
+    assert template.fields == ["url", "url", "name"]
+    assert template.render({"url": "x", "name": "bob"}) == "<a href='x'>x</a> for bob"
+
+
+def test_render_produces_html_and_text_parts():
+    """Test both parts are rendered and only the HTML part is escaped."""
+    message = render_email("verification", username="<bob>", url="http://x/verify?token=a&b")
+    assert message.subject == "Verify your FitTrack account"
+    assert "&lt;bob&gt;" in message.html and "<bob>" not in message.html
+    assert "http://x/verify?token=a&amp;b" in message.html
+    assert message.text.startswith("Hi <bob>,")
+    assert "http://x/verify?token=a&b" in message.text
+    assert "<html>" not in message.text
+
+
+def test_no_unfilled_placeholders():
+    """Test every template renders without leftover markers."""
+    values = {"username": "u", "url": "u", "meals": 1, "calories": 2, "workouts": 3, "water_liters": 4}
+    for name in TEMPLATES:
+        message = render_email(name, **values)
+        for part in (message.html, message.text):
+            assert "{{" not in part and "[[" not in part
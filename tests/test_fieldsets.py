@@ -0,0 +1,38 @@
+"""Tests for sparse fieldsets and normalized meal/workout lists."""
+
+
+def log_meals(client, auth_headers, count=2):
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Rice", "serving_size": 100, "serving_unit": "g", "calories": 130
+    }).json()
+    for day in range(1, count + 1):
+        client.post("/meals", headers=auth_headers, json={
+            "date": f"2024-01-0{day}", "meal_type": "lunch",
+            "foods": [{"food_id": food["id"], "servings": 1}, {"food_id": food["id"], "servings": 2}]
+        })
+    return food
+
+
+def test_normalized_meals_list_each_food_once(client, auth_headers):
+    """Test entries carry food_id only and the food appears once in `included`."""
+    food = log_meals(client, auth_headers)
+
+    data = client.get("/meals", headers=auth_headers, params={"normalize": "true"}).json()
+    assert [f["id"] for f in data["included"]["foods"]] == [food["id"]]
+    entries = [entry for meal in data["data"] for entry in meal["foods"]]
+    assert len(entries) == 4
+    assert all("food" not in entry and entry["food_id"] == food["id"] for entry in entries)
+
+    full = client.get("/meals", headers=auth_headers).json()
+    assert full[0]["foods"][0]["food"]["name"] == "Rice"
+
+
+def test_sparse_fields(client, auth_headers):
+    """Test `fields` trims rows (keeping id) and rejects unknown names."""
+    log_meals(client, auth_headers, count=1)
+
+    rows = client.get("/meals", headers=auth_headers, params={"fields": "date,total_calories"}).json()
+    assert rows == [{"id": rows[0]["id"], "date": "2024-01-01", "total_calories": 390}]
+
+    response = client.get("/workouts", headers=auth_headers, params={"fields": "name,hashed_password"})
+    assert response.status_code == 400
@@ -0,0 +1,85 @@
+"""Unit tests for the food catalogue import pipeline."""
+import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import auth, main
+from app.database import FoodDatabase
+from app.food_import import (
+    import_foods, load_checkpoint, new_import_state, normalize_food, normalize_unit, save_checkpoint
+)
+
+
+def test_normalize_unit_converts_mass_and_volume():
+    """Test mass and volume units become grams and millilitres."""
+    assert normalize_unit(2, "oz") == (56.699, "g")
+    assert normalize_unit(1, "L") == (1000.0, "ml")
+    assert normalize_unit(100, "grams cooked") == (100, "g")
+    assert normalize_unit(1, "large egg") == (1, "large egg")
+
+
+def test_normalize_food_maps_source_columns():
+    """Test dataset column aliases and kJ energy are understood."""
+    row = normalize_food({"product_name": "  Oat   Milk ", "brands": "Oatly",
+                          "energy_kj": "418.4", "proteins_100g": "1.0"})
+    assert row["name"] == "Oat Milk"
+    assert row["calories"] == 100
+    assert row["serving_size"] == 100
+    assert row["serving_unit"] == "g"
+    assert row["dedupe_key"] == "oat milk|oatly|100|g"
+
+
+def test_normalize_food_rejects_bad_rows():
+    """Test rows without a name, energy or with negative values are rejected."""
+    assert normalize_food({"name": "Mystery"}) is None
+    assert normalize_food({"calories": "100"}) is None
+    assert normalize_food({"name": "Bad", "calories": "-5"}) is None
+
+
+def test_import_dedupes_and_resumes(sqlite_engine, tmp_path):
+    """Test duplicates collapse and a completed import is not repeated."""
+    source = tmp_path / "foods.jsonl"
+    records = [{"name": f"Food {i % 10}", "calories": 100 + i} for i in range(25)]
+    records.append({"name": "No energy"})
+    source.write_text("\n".join(json.dumps(r) for r in records))
+    checkpoint = str(tmp_path / "foods.checkpoint.json")
+
+    state = import_foods(sqlite_engine, str(source), checkpoint_path=checkpoint, batch_size=4)
+
+    assert state["status"] == "completed"
+    assert state["rows_read"] == 26
+    assert state["rows_rejected"] == 1
+    assert load_checkpoint(checkpoint)["status"] == "completed"
+    with sqlite_engine.connect() as conn:
+        assert conn.scalar(select(func.count()).select_from(FoodDatabase.__table__)) == 10
+        # Later rows win on conflict
+        assert conn.scalar(select(FoodDatabase.calories).where(FoodDatabase.name == "Food 0")) == 120
+
+    assert import_foods(sqlite_engine, str(source), checkpoint_path=checkpoint)["rows_read"] == 26
+
+
+def test_resume_refuses_an_import_that_is_still_running(client, auth_headers, tmp_path, monkeypatch):
+    """Test resuming a live import is a 409 and a stalled one is restarted once."""
+    monkeypatch.setattr(auth, "ADMIN_USERNAMES", {"testuser"})
+    monkeypatch.setattr(main, "FOOD_IMPORT_DIR", str(tmp_path))
+    runs = []
+    monkeypatch.setattr(main, "_run_food_import", runs.append)
+    checkpoint = str(tmp_path / "abc123.json")
+    save_checkpoint(checkpoint, new_import_state(str(tmp_path / "abc123.csv"), status="running"))
+
+    def resume():
+        return client.post("/admin/foods/import/abc123/resume", headers=auth_headers)
+
+    assert resume().status_code == 409
+
+    # No batch committed for longer than the stale limit: the worker is gone
+    state = load_checkpoint(checkpoint)
+    with open(checkpoint, "w") as handle:
+        stalled = (datetime.utcnow() - timedelta(hours=1)).isoformat()
+        json.dump({**state, "updated_at": stalled}, handle)
+    response = resume()
+    assert response.status_code == 202
+    assert response.json()["status"] == "queued"
+    assert resume().status_code == 409
+    assert runs == ["abc123"]
@@ -0,0 +1,73 @@
+"""Tests for tracked goal progress."""
+from datetime import date, timedelta
+
+from app.database import Goal
+from app.goals import goal_progress
+
+TODAY = date.today()
+
+
+def create_goal(client, auth_headers, goal_type, target, **extra):
+    return client.post("/goals", headers=auth_headers, json={
+        "goal_type": goal_type, "target_value": target, "start_date": "2020-01-01", **extra
+    }).json()
+
+
+def test_active_goals_list_filters_on_status(client, auth_headers):
+    """Test GET /goals works and lists manual goals with their entered value."""
+    create_goal(client, auth_headers, "Run a 5k", 1, current_value=0.5)
+
+    goals = client.get("/goals", headers=auth_headers).json()
+    assert [(g["goal_type"], g["current_value"], g["is_tracked"]) for g in goals] == [("Run a 5k", 0.5, False)]
+
+
+def test_weight_target_completes_from_body_metrics(client, auth_headers):
+    """Test a weight loss goal follows logged weights and completes at the target."""
+    client.post("/body-metrics", headers=auth_headers, json={"date": "2024-01-01", "weight_kg": 82})
+    goal = create_goal(client, auth_headers, "weight_target", 80)
+    assert (goal["baseline_value"], goal["current_value"], goal["is_achieved"]) == (82, 82, False)
+
+    client.post("/body-metrics", headers=auth_headers, json={"date": TODAY.isoformat(), "weight_kg": 79.5})
+    assert client.get("/goals", headers=auth_headers).json() == []
+    [done] = client.get("/goals", headers=auth_headers, params={"active_only": False}).json()
+    assert (done["status"], done["current_value"], done["is_achieved"]) == ("completed", 79.5, True)
+
+
+def test_recurring_goals_count_the_current_period(client, auth_headers):
+    """Test a weekly workouts goal only counts sessions from this week."""
+    workouts = create_goal(client, auth_headers, "weekly_workouts", 2)
+    for day in (TODAY, TODAY - timedelta(days=14)):
+        client.post("/workouts", headers=auth_headers, json={"name": "Lift", "date": day.isoformat(), "exercises": []})
+
+    [goal] = [g for g in client.get("/goals", headers=auth_headers).json() if g["id"] == workouts["id"]]
+    assert (goal["current_value"], goal["is_achieved"], goal["status"]) == (1, False, "active")
+
+
+def test_stale_period_reads_as_zero():
+    """Test a daily goal last updated yesterday shows no progress today."""
+    goal = Goal(user_id=1, goal_type="daily_protein", target_value=100, current_value=120,
+                start_date=TODAY, progress_period=TODAY - timedelta(days=1))
+    assert goal_progress(goal, TODAY)["current_value"] == 0
+
+
+def test_water_streak_counts_consecutive_qualifying_days(client, auth_headers):
+    """Test the streak ends today or yesterday and skips days under the threshold."""
+    for days_ago, amount in [(0, 1500), (1, 2000), (2, 2500), (3, 500), (4, 3000)]:
+        day = (TODAY - timedelta(days=days_ago)).isoformat()
+        client.post("/water", headers=auth_headers, json={"date": day, "amount_ml": amount})
+
+    goal = create_goal(client, auth_headers, "water_streak", 7, threshold_value=2000)
+    assert (goal["current_value"], goal["status"]) == (2, "active")
+
+
+def test_water_streak_lapses_after_a_missed_day(client, auth_headers, db):
+    """Test a streak nobody extends reads as zero once a full day is missed."""
+    for days_ago in (1, 0):
+        day = (TODAY - timedelta(days=days_ago)).isoformat()
+        client.post("/water", headers=auth_headers, json={"date": day, "amount_ml": 2500})
+    created = create_goal(client, auth_headers, "water_streak", 7)
+    assert created["current_value"] == 2
+
+    goal = db.get(Goal, created["id"])
+    assert goal_progress(goal, TODAY + timedelta(days=1))["current_value"] == 2
+    assert goal_progress(goal, TODAY + timedelta(days=2))["current_value"] == 0
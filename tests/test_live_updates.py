@@ -0,0 +1,62 @@
+"""Tests for live dashboard updates."""
+import asyncio
+import threading
+
+from app import live_updates
+from app.live_updates import RESYNC, LiveUpdateBroker, format_sse
+
+
+def test_broker_delivers_events_published_from_worker_threads():
+    """Test sync endpoints (run in a threadpool) can publish to async subscribers."""
+    async def scenario():
+        broker = LiveUpdateBroker()
+        queue = broker.subscribe(1)
+        other = broker.subscribe(2)
+        thread = threading.Thread(target=broker.publish, args=(1, {"type": "delta", "delta": {"water_ml": 250}}))
+        thread.start()
+        thread.join()
+        event = await asyncio.wait_for(queue.get(), 1)
+        broker.unsubscribe(1, queue)
+        return event, other.qsize(), broker.subscriber_count()
+
+    event, other_size, remaining = asyncio.run(scenario())
+    assert event["delta"] == {"water_ml": 250}
+    assert other_size == 0
+    assert remaining == 1
+
+
+def test_slow_subscriber_gets_resync_instead_of_growing_queue():
+    """Test a full queue is replaced by a single resync event."""
+    async def scenario():
+        broker = LiveUpdateBroker(queue_size=2)
+        queue = broker.subscribe(1)
+        for i in range(3):
+            broker.publish(1, {"type": "delta", "delta": {"workouts": 1}})
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(scenario()) == [RESYNC]
+
+
+def test_writes_publish_dashboard_deltas(client, auth_headers, monkeypatch):
+    """Test water, meal and workout writes publish signed deltas after commit."""
+    published = []
+    monkeypatch.setattr(live_updates.broker, "publish", lambda user_id, event: published.append(event))
+
+    client.post("/water", headers=auth_headers, json={"date": "2024-01-01", "amount_ml": 500})
+    workout = client.post("/workouts", headers=auth_headers, json={
+        "name": "Run", "date": "2024-01-01", "duration_minutes": 30, "exercises": []
+    }).json()
+    client.delete(f"/workouts/{workout['id']}", headers=auth_headers)
+
+    assert [(e["source"], e["date"], e["delta"]) for e in published] == [
+        ("water", "2024-01-01", {"water_ml": 500}),
+        ("workout", "2024-01-01", {"workouts": 1}),
+        ("workout", "2024-01-01", {"workouts": -1}),
+    ]
+    assert format_sse(published[0]).startswith("event: delta\ndata: {")
+
+
+def test_event_stream_requires_a_valid_token(client):
+    """Test the SSE endpoint rejects bad tokens before streaming."""
+    response = client.get("/events/dashboard", params={"token": "not-a-token"})
+    assert response.status_code == 401
@@ -0,0 +1,68 @@
+"""Tests that the migrations build the models' schema and the startup check."""
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine
+
+from app.database import Base
+from app.schema_version import SchemaVersionError, check_schema_revision, current_revision, head_revision
+import migrate
+from migrate import alembic_config, baseline_differences
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    config = alembic_config()
+    config.attributes["database_url"] = url
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, "head")
+    engine = create_engine(url)
+    yield engine, config
+    engine.dispose()
+
+
+def test_migrations_match_models(migrated_engine):
+    """Test upgrading to head produces exactly the models' schema."""
+    engine, _ = migrated_engine
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+
+
+def test_schema_check_accepts_head_and_rejects_older(migrated_engine):
+    """Test the startup check compares the stamped revision with the code's head."""
+    engine, config = migrated_engine
+    check_schema_revision(engine, mode="error")
+
+    command.downgrade(config, "0001")
+    with pytest.raises(SchemaVersionError):
+        check_schema_revision(engine, mode="error")
+    check_schema_revision(engine, mode="warn")
+
+
+def test_stamp_baseline_refuses_a_schema_that_differs(tmp_path, monkeypatch, sqlite_engine):
+    """Test only a database at the baseline schema can be stamped as the baseline."""
+    baseline_url = f"sqlite:///{tmp_path / 'baseline.db'}"
+    config = alembic_config()
+    config.attributes.update(database_url=baseline_url, configure_logger=False)
+    command.upgrade(config, "0001")
+    baseline_engine = create_engine(baseline_url)
+    assert baseline_differences(baseline_engine) == []
+    baseline_engine.dispose()
+
+    # create_all() from today's models has every later revision's columns too
+    differences = baseline_differences(sqlite_engine)
+    assert "unexpected column food_database.base_unit" in differences
+    monkeypatch.setattr(migrate, "engine", sqlite_engine)
+    monkeypatch.setattr(migrate, "DATABASE_URL", str(sqlite_engine.url))
+    monkeypatch.setattr("sys.argv", ["migrate.py", "--stamp-baseline"])
+    with pytest.raises(SystemExit):
+        migrate.main()
+    assert current_revision(sqlite_engine) is None
+
+
+def test_head_revision_matches_alembic():
+    """Test the regex-based head lookup agrees with alembic's own."""
+    assert head_revision() == ScriptDirectory.from_config(alembic_config()).get_current_head()
@@ -0,0 +1,53 @@
+"""Unit tests for meal nutrition snapshots."""
+from datetime import date
+
+from sqlalchemy import text
+
+from app.database import FoodDatabase, MealFood, MealLog, MealType, User
+from app.nutrition import backfill_nutrition, refresh_meal_totals, snapshot_nutrition
+
+
+def test_snapshot_scales_by_servings():
+    """Test snapshot values are the food's nutrition times servings."""
+    food = FoodDatabase(calories=200, protein_g=10, carbs_g=20, fats_g=5, fiber_g=1)
+    entry = MealFood(servings=1.5)
+    snapshot_nutrition(entry, food)
+
+    assert entry.calories == 300
+    assert entry.protein_g == 15
+    assert entry.fiber_g == 1.5
+
+
+def test_refresh_meal_totals_sums_entries():
+    """Test meal totals are the sum of entry snapshots."""
+    meal = MealLog()
+    entries = [MealFood(calories=100, protein_g=5), MealFood(calories=50.5, protein_g=None)]
+    refresh_meal_totals(meal, entries)
+
+    assert meal.total_calories == 150.5
+    assert meal.total_protein_g == 5
+
+
+def test_backfill_snapshots_existing_rows(sqlite_engine, session_factory):
+    """Test the batched backfill fills snapshots and totals for old rows."""
+    db = session_factory()
+    user = User(username="u", email="u@example.com", hashed_password="x")
+    food = FoodDatabase(name="Rice", serving_size=100, serving_unit="g", calories=130, protein_g=2.5)
+    db.add_all([user, food])
+    db.flush()
+    meals = [MealLog(user_id=user.id, date=date(2025, 1, 1), meal_type=MealType.LUNCH)
+             for _ in range(3)]
+    db.add_all(meals)
+    db.flush()
+    db.add_all([MealFood(meal_id=meal.id, food_id=food.id, servings=2) for meal in meals for _ in range(2)])
+    db.commit()
+    db.close()
+
+    counts = backfill_nutrition(sqlite_engine, batch_size=2)
+
+    assert counts["meal_foods"] == 6
+    with sqlite_engine.connect() as conn:
+        totals = conn.execute(text("SELECT total_calories, total_protein_g FROM meal_logs")).all()
+    assert totals == [(520.0, 10.0)] * 3
+    # Already snapshotted entries are left alone on re-run
+    assert backfill_nutrition(sqlite_engine, batch_size=2)["meal_foods"] == 0
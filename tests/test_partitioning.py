@@ -0,0 +1,58 @@
+"""Tests for history partition keys, archival and partition-pruned loading."""
+import zlib
+from datetime import date
+
+from app.database import HistoryArchive, MealFood, WaterIntake
+from app.partitioning import add_months, archive_old_months, partition_name, restore_month
+
+
+def log_meal(client, auth_headers, day):
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Oats", "serving_size": 40, "serving_unit": "g", "calories": 150
+    }).json()
+    return client.post("/meals", headers=auth_headers, json={
+        "date": day, "meal_type": "breakfast", "foods": [{"food_id": food["id"], "servings": 1}]
+    }).json()
+
+
+def test_month_helpers():
+    """Test month arithmetic across year boundaries and partition naming."""
+    assert add_months(date(2025, 11, 1), 3) == date(2026, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+    assert partition_name("water_intake", date(2026, 3, 1)) == "water_intake_y2026m03"
+
+
+def test_archive_and_restore_a_month(client, auth_headers, db):
+    """Test old months move to compressed archive rows and come back intact."""
+    meal = log_meal(client, auth_headers, "2024-03-10")
+    log_meal(client, auth_headers, "2024-05-02")
+    for amount in (250, 500):
+        client.post("/water", headers=auth_headers, json={"date": "2024-03-11", "amount_ml": amount})
+    entry = db.query(MealFood).filter(MealFood.meal_id == meal["id"]).one()
+    assert entry.date == date(2024, 3, 10)  # partition key copied from the meal
+
+    counts = archive_old_months(db, today=date(2025, 4, 15), after_months=12)
+    assert counts == {"meal_foods": 1, "exercise_sets": 0, "water_intake": 2}
+    assert db.query(WaterIntake).count() == 0
+    assert db.query(MealFood).count() == 1  # May 2024 is inside the window
+
+    archive = db.query(HistoryArchive).filter(HistoryArchive.table_name == "water_intake").one()
+    assert (archive.month, archive.row_count) == (date(2024, 3, 1), 2)
+    assert b"amount_ml" in zlib.decompress(archive.payload)
+
+    # The meal keeps its totals while its entries are archived
+    [cold] = client.get("/meals", headers=auth_headers, params={"end_date": "2024-03-31"}).json()
+    assert (cold["total_calories"], cold["foods"]) == (150, [])
+
+    assert restore_month(db, "water_intake", date(2024, 3, 1)) == 2
+    water = client.get("/water", headers=auth_headers).json()
+    assert sorted(w["amount_ml"] for w in water) == [250, 500]
+    assert db.query(HistoryArchive).filter(HistoryArchive.table_name == "water_intake").count() == 0
+
+
+def test_date_filtered_lists_keep_their_entries(client, auth_headers):
+    """Test the entry date bounds added for partition pruning don't drop entries."""
+    log_meal(client, auth_headers, "2024-06-01")
+    [meal] = client.get("/meals", headers=auth_headers,
+                        params={"start_date": "2024-06-01", "end_date": "2024-06-01"}).json()
+    assert len(meal["foods"]) == 1
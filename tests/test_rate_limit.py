@@ -0,0 +1,74 @@
+"""Tests for rate limiting."""
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from slowapi import _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
+from starlette.requests import Request
+
+from app import main
+from app.auth import create_access_token
+from app.rate_limit import AI_RATE_LIMIT, limiter, user_or_ip_key
+
+
+def _request(headers=None):
+    return Request({
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "client": ("203.0.113.7", 1234),
+    })
+
+
+def test_key_uses_username_for_authenticated_requests():
+    """Test authenticated requests are keyed per user."""
+    token = create_access_token({"sub": "alice"})
+    assert user_or_ip_key(_request({"Authorization": f"Bearer {token}"})) == "user:alice"
+
+
+def test_key_falls_back_to_client_ip():
+    """Test anonymous or invalid-token requests are keyed by IP."""
+    assert user_or_ip_key(_request()) == "203.0.113.7"
+    assert user_or_ip_key(_request({"Authorization": "Bearer not-a-jwt"})) == "203.0.113.7"
+
+
+def test_register_is_limited_per_minute(client):
+    """Test /register answers 429 once its per-minute budget is spent."""
+    statuses = [
+        client.post("/register", json={
+            "username": f"user{i}", "email": f"user{i}@example.com", "password": "testpass123"
+        }).status_code
+        for i in range(6)
+    ]
+    assert statuses == [201] * 5 + [429]
+
+
+def test_ai_endpoints_are_limited_per_user(client, auth_headers, monkeypatch):
+    """Test each authenticated user gets their own AI budget, even from one IP."""
+    monkeypatch.setattr(main, "get_meal_suggestions", lambda *args: ["Oatmeal"])
+    budget = int(AI_RATE_LIMIT.split("/")[0])
+    other = {"Authorization": f"Bearer {create_access_token({'sub': 'someone-else'})}"}
+    client.post("/register", json={"username": "someone-else", "email": "else@example.com",
+                                   "password": "testpass123"})
+
+    statuses = [client.get("/ai/meal-suggestions", headers=auth_headers).status_code for _ in range(budget + 1)]
+    assert statuses == [200] * budget + [429]
+    assert client.get("/ai/meal-suggestions", headers=other).status_code == 200
+
+
+def test_anonymous_requests_share_their_ip_budget():
+    """Test requests without a valid token from one IP count against one budget."""
+    demo = FastAPI()
+    demo.state.limiter = limiter
+    demo.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+    @demo.get("/ping")
+    @limiter.limit("2/minute", key_func=user_or_ip_key)
+    def ping(request: Request):
+        return {}
+
+    limiter.reset()
+    client = TestClient(demo)
+    assert client.get("/ping").status_code == 200
+    assert client.get("/ping", headers={"Authorization": "Bearer not-a-jwt"}).status_code == 200
+    assert client.get("/ping").status_code == 429
+    token = create_access_token({"sub": "alice"})
+    assert client.get("/ping", headers={"Authorization": f"Bearer {token}"}).status_code == 200
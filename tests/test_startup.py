@@ -0,0 +1,18 @@
+"""Start-up cost guards for app.main."""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_app_import_defers_optional_sdks():
+    code = (
+        "import sys, app.main; "
+        "print(','.join(m for m in ('openai', 'sendgrid') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    loaded = result.stdout.strip().splitlines()[-1] if result.stdout.strip() else ""
+    assert "openai" not in loaded
+    assert "sendgrid" not in loaded
@@ -0,0 +1,77 @@
+"""Tests for incremental streak and adherence state."""
+from datetime import date, timedelta
+
+from app.streaks import recompute_user, streak_summary
+
+TODAY = date.today()
+
+
+def day(days_ago):
+    return (TODAY - timedelta(days=days_ago)).isoformat()
+
+
+def log_workout(client, auth_headers, days_ago):
+    return client.post("/workouts", headers=auth_headers, json={
+        "name": "Run", "date": day(days_ago), "exercises": []
+    }).json()
+
+
+def test_streaks_grow_on_consecutive_days(client, auth_headers):
+    """Test logging and workout streaks count consecutive active days."""
+    for days_ago in (2, 1, 0):
+        log_workout(client, auth_headers, days_ago)
+    client.post("/water", headers=auth_headers, json={"date": day(3), "amount_ml": 500})
+
+    streaks = client.get("/streaks", headers=auth_headers).json()
+    assert (streaks["logging"]["current"], streaks["logging"]["longest"]) == (4, 4)
+    assert (streaks["workouts"]["current"], streaks["workouts"]["last_date"]) == (3, day(0))
+
+
+def test_backdated_and_deleted_days_match_a_full_recompute(client, auth_headers, db):
+    """Test writes that can't be applied incrementally leave the same state as a rebuild."""
+    log_workout(client, auth_headers, 0)
+    log_workout(client, auth_headers, 2)
+    middle = log_workout(client, auth_headers, 1)
+    assert client.get("/streaks", headers=auth_headers).json()["workouts"]["current"] == 3
+
+    client.delete(f"/workouts/{middle['id']}", headers=auth_headers)
+    streaks = client.get("/streaks", headers=auth_headers).json()
+    assert (streaks["workouts"]["current"], streaks["workouts"]["longest"]) == (1, 1)
+
+    incremental = streak_summary(db, middle["user_id"])
+    recompute_user(db, middle["user_id"])
+    assert streak_summary(db, middle["user_id"]) == incremental
+
+
+def test_adherence_counts_days_near_the_calorie_target(client, auth_headers):
+    """Test adherence is the share of logged days within tolerance of the target."""
+    client.post("/profile", headers=auth_headers, json={"daily_calorie_target": 2000})
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Pasta", "serving_size": 100, "serving_unit": "g", "calories": 1000
+    }).json()
+    for days_ago, servings in [(0, 2), (1, 1), (2, 2.1), (40, 2)]:
+        client.post("/meals", headers=auth_headers, json={
+            "date": day(days_ago), "meal_type": "dinner", "foods": [{"food_id": food["id"], "servings": servings}]
+        })
+
+    adherence = client.get("/streaks", headers=auth_headers).json()["adherence"]
+    assert (adherence["logged_days"], adherence["adherent_days"], adherence["percent"]) == (3, 2, 66.7)
+
+
+def test_adherence_follows_a_target_set_after_logging(client, auth_headers):
+    """Test creating or changing the calorie target re-checks days already logged."""
+    food = client.post("/foods", headers=auth_headers, json={
+        "name": "Pasta", "serving_size": 100, "serving_unit": "g", "calories": 1000
+    }).json()
+    for days_ago in (0, 1):
+        client.post("/meals", headers=auth_headers, json={
+            "date": day(days_ago), "meal_type": "dinner", "foods": [{"food_id": food["id"], "servings": 2}]
+        })
+
+    client.post("/profile", headers=auth_headers, json={"daily_calorie_target": 2000})
+    adherence = client.get("/streaks", headers=auth_headers).json()["adherence"]
+    assert (adherence["calorie_target"], adherence["adherent_days"], adherence["percent"]) == (2000, 2, 100.0)
+
+    client.put("/profile", headers=auth_headers, json={"daily_calorie_target": 3000})
+    adherence = client.get("/streaks", headers=auth_headers).json()["adherence"]
+    assert (adherence["calorie_target"], adherence["adherent_days"]) == (3000, 0)
@@ -0,0 +1,51 @@
+"""Tests for the delta sync API."""
+from app import sync
+
+
+def log_water(client, auth_headers, amount):
+    return client.post("/water", headers=auth_headers, json={"date": "2024-01-01", "amount_ml": amount}).json()
+
+
+def test_full_then_incremental_sync(client, auth_headers, monkeypatch):
+    """Test a token only returns rows changed or deleted after it was issued."""
+    monkeypatch.setattr(sync, "SYNC_OVERLAP_SECONDS", 0)
+    first = log_water(client, auth_headers, 250)
+
+    full = client.get("/sync", headers=auth_headers).json()
+    assert [row["id"] for row in full["changes"]["water"]] == [first["id"]]
+    assert full["has_more"] is False
+    assert "meals" not in full["changes"]
+
+    second = log_water(client, auth_headers, 500)
+    workout = client.post("/workouts", headers=auth_headers, json={
+        "name": "Run", "date": "2024-01-01", "exercises": []
+    }).json()
+    client.delete(f"/workouts/{workout['id']}", headers=auth_headers)
+
+    delta = client.get("/sync", headers=auth_headers, params={"since": full["next_token"]}).json()
+    assert [row["id"] for row in delta["changes"]["water"]] == [second["id"]]
+    assert "workouts" not in delta["changes"]
+    assert delta["deleted"] == {"workouts": [workout["id"]]}
+
+
+def test_sync_pages_through_a_round(client, auth_headers):
+    """Test small pages walk every row exactly once within a round."""
+    ids = [log_water(client, auth_headers, 100 + i)["id"] for i in range(5)]
+
+    seen, token, has_more = [], None, True
+    while has_more:
+        params = {"limit": 2, **({"since": token} if token else {})}
+        page = client.get("/sync", headers=auth_headers, params=params).json()
+        seen += [row["id"] for row in page["changes"].get("water", [])]
+        token, has_more = page["next_token"], page["has_more"]
+
+    assert seen == ids
+
+
+def test_sync_rejects_bad_tokens(client, auth_headers, monkeypatch):
+    """Test malformed tokens are 400 and tokens past tombstone retention are 410."""
+    assert client.get("/sync", headers=auth_headers, params={"since": "garbage"}).status_code == 400
+
+    token = client.get("/sync", headers=auth_headers).json()["next_token"]
+    monkeypatch.setattr(sync, "SYNC_TOMBSTONE_RETENTION_DAYS", -1)
+    assert client.get("/sync", headers=auth_headers, params={"since": token}).status_code == 410
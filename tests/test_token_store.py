@@ -0,0 +1,102 @@
+"""Tests for the verification token stores."""
+import re
+from datetime import timedelta
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app import email_service, token_store
+from app.database import EmailOutbox, VerificationToken
+from app.token_store import DatabaseTokenStore, MemoryTokenStore, SignedTokenStore, TokenStore
+
+
+def test_memory_store_is_single_use_and_bounded():
+    """Test tokens work once and the oldest are evicted when full."""
+    store = MemoryTokenStore(max_size=2)
+    first = store.issue("1")
+    second, third = store.issue("2"), store.issue("3")
+    assert len(store) == 2
+    assert store.consume(first) is None
+    assert store.consume(second) == "2"
+    assert store.consume(second) is None
+    assert store.consume(third) == "3"
+
+
+def test_memory_store_sweeps_expired():
+    """Test expired tokens are rejected and swept."""
+    store = MemoryTokenStore(ttl=timedelta(seconds=-1))
+    token = store.issue("1")
+    assert store.consume(token) is None
+    store.issue("2")
+    assert store.sweep() == 1
+    assert len(store) == 0
+
+
+def test_database_store_round_trip(session_factory):
+    """Test tokens are stored hashed, shared across instances and single use."""
+    token = DatabaseTokenStore(session_factory).issue("42")
+    db = session_factory()
+    assert db.query(VerificationToken).one().token_hash != token
+    db.close()
+
+    # A second worker's store sees the same token
+    other = DatabaseTokenStore(session_factory)
+    assert other.consume(token) == "42"
+    assert other.consume(token) is None
+
+
+def test_database_store_sweeps_expired(session_factory):
+    """Test expired rows are rejected and deleted by the sweep."""
+    store = DatabaseTokenStore(session_factory, ttl=timedelta(seconds=-1))
+    expired = store.issue("1")
+    store.issue("2")
+    assert store.consume(expired) is None
+    assert store.sweep() == 1
+    db = session_factory()
+    assert db.query(VerificationToken).count() == 0
+    db.close()
+
+
+def test_register_resend_and_verify_with_the_database_store(client, db, monkeypatch):
+    """Test the default store behind /register, /resend-verification and /verify."""
+    # Its sessions share the test's connection, so they see the new user and roll back with it
+    store_sessions = sessionmaker(bind=db.get_bind(), join_transaction_mode="create_savepoint")
+    monkeypatch.setattr(token_store, "_store", DatabaseTokenStore(store_sessions))
+    # Queue real messages (never sent here) so the links can be read back
+    monkeypatch.setattr(email_service, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(email_service, "EMAIL_PROVIDER", "sendgrid")
+
+    def sent_token():
+        html = db.query(EmailOutbox).order_by(EmailOutbox.id.desc()).first().html_content
+        return re.search(r"token=([\w-]+)", html).group(1)
+
+    client.post("/register", json={"username": "dana", "email": "dana@example.com", "password": "secret123"})
+    first = sent_token()
+    assert client.post("/resend-verification", params={"email": "dana@example.com"}).status_code == 200
+    second = sent_token()
+    assert db.query(VerificationToken).count() == 2
+
+    assert client.get("/verify", params={"token": second}).json()["verified"] is True
+    assert client.get("/verify", params={"token": second}).status_code == 400
+    assert db.query(VerificationToken).count() == 1
+    assert client.get("/verify", params={"token": first}).json()["message"] == "Email already verified"
+
+
+def test_signed_store_needs_no_storage():
+    """Test signed tokens verify statelessly and reject tampering."""
+    store = SignedTokenStore()
+    token = store.issue("7")
+    assert store.consume(token) == "7"
+    assert store.consume(token + "x") is None
+    expired = SignedTokenStore(ttl=timedelta(seconds=-1))
+    assert expired.consume(expired.issue("7")) is None
+
+
+def test_incomplete_store_fails_at_instantiation():
+    """Test a store missing issue/consume can't be created."""
+    class IssueOnly(TokenStore):
+        def issue(self, user_id: str) -> str:
+            return user_id
+
+    with pytest.raises(TypeError):
+        IssueOnly()
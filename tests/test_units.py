@@ -0,0 +1,76 @@
+"""Tests for serving unit normalization."""
+import pytest
+
+from app.database import FoodDatabase
+from app.food_import import normalize_food
+from app.units import parse_serving
+
+
+def test_parse_serving_finds_grams_and_millilitres():
+    """Test free-text servings resolve to a base unit and amount."""
+    assert parse_serving(100, "grams cooked") == ("g", 100.0)
+    assert parse_serving(28, "grams (1 oz)") == ("g", 28.0)
+    assert parse_serving(1, "scoop (30g)") == ("g", 30.0)
+    assert parse_serving(2, "slices (28 g)") == ("g", 56.0)
+    assert parse_serving(240, "ml (1 cup)") == ("ml", 240.0)
+    assert parse_serving(2, "tablespoons") == ("ml", 29.574)
+    assert parse_serving(1, "large egg") is None
+    assert parse_serving(1, "medium") is None
+
+
+def test_tiny_servings_have_no_base_unit(client, auth_headers):
+    """Test a serving that rounds to 0 g is count-only instead of failing the write or import."""
+    assert parse_serving(0.4, "mg") is None
+    row = normalize_food({"name": "Saffron", "calories": "0", "serving_size": "1", "serving_unit": "pinch (0.4 mg)"})
+    assert row["base_unit"] is None
+
+    response = client.post("/foods", headers=auth_headers, json={
+        "name": "Saffron", "serving_size": 0.4, "serving_unit": "mg", "calories": 0
+    })
+    assert response.status_code == 201
+    assert response.json()["base_unit"] is None
+
+
+def test_foods_store_per_unit_nutrients_on_write_and_import(db):
+    """Test inserted and imported foods carry their base unit and nutrient densities."""
+    shake = FoodDatabase(name="Shake", serving_size=1, serving_unit="scoop (30g)",
+                         calories=120, protein_g=24)
+    egg = FoodDatabase(name="Egg", serving_size=1, serving_unit="large egg", calories=70)
+    db.add_all([shake, egg])
+    db.flush()
+
+    assert (shake.base_unit, shake.base_amount) == ("g", 30.0)
+    assert shake.calories_per_unit == pytest.approx(4.0)
+    assert shake.protein_g_per_unit == pytest.approx(0.8)
+    assert (egg.base_unit, egg.calories_per_unit) == (None, None)
+
+    row = normalize_food({"name": "Oats", "energy-kcal_100g": "389", "proteins_100g": "16.9"})
+    assert (row["base_unit"], row["base_amount"]) == ("g", 100.0)
+    assert row["calories_per_unit"] == pytest.approx(3.89)
+
+
+def test_log_meal_by_amount(client, auth_headers):
+    """Test entries logged in grams are scaled by the per-gram vector; count foods need servings."""
+    rice = client.post("/foods", headers=auth_headers, json={
+        "name": "Rice", "serving_size": 100, "serving_unit": "grams cooked",
+        "calories": 130, "protein_g": 2.5, "carbs_g": 28
+    }).json()
+    egg = client.post("/foods", headers=auth_headers, json={
+        "name": "Egg", "serving_size": 1, "serving_unit": "large egg", "calories": 70, "protein_g": 6
+    }).json()
+    assert (rice["base_unit"], rice["base_amount"]) == ("g", 100.0)
+
+    meal = client.post("/meals", headers=auth_headers, json={
+        "date": "2024-05-01", "meal_type": "lunch",
+        "foods": [{"food_id": rice["id"], "amount": 150}, {"food_id": egg["id"], "servings": 2}]
+    }).json()
+    by_food = {entry["food_id"]: entry for entry in meal["foods"]}
+    assert (by_food[rice["id"]]["servings"], by_food[rice["id"]]["calories"]) == (1.5, 195)
+    assert (by_food[egg["id"]]["amount"], by_food[egg["id"]]["calories"]) == (None, 140)
+    assert meal["total_calories"] == 335
+    assert meal["total_protein_g"] == 15.75
+
+    response = client.post("/meals", headers=auth_headers, json={
+        "date": "2024-05-01", "meal_type": "dinner", "foods": [{"food_id": egg["id"], "amount": 50}]
+    })
+    assert response.status_code == 400